@@ -0,0 +1,28 @@
+import sys
+import argparse
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.entity.config_entity import ScoringServiceConfig
+from networksecurity.pipeline.scoring_service import ScoringService
+
+if __name__=="__main__":
+
+    try:
+        parser=argparse.ArgumentParser(description="Network security online scoring service")
+        parser.add_argument("--model-file-path",default=None)
+        parser.add_argument("--host",default=None)
+        parser.add_argument("--port",type=int,default=None)
+        parser.add_argument("--max-batch-size",type=int,default=None)
+        parser.add_argument("--max-wait-ms",type=float,default=None)
+        args=parser.parse_args()
+
+        scoring_service_config=ScoringServiceConfig(model_file_path=args.model_file_path,host=args.host,port=args.port)
+        if args.max_batch_size is not None:
+            scoring_service_config.max_batch_size=args.max_batch_size
+        if args.max_wait_ms is not None:
+            scoring_service_config.max_wait_ms=args.max_wait_ms
+        logging.info("Starting the scoring service")
+        ScoringService(scoring_service_config).run()
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
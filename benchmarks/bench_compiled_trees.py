@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import RandomForestClassifier,GradientBoostingClassifier,AdaBoostClassifier
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from networksecurity.constants.training_pipeline import TARGET_COLUMN
+from networksecurity.utils.ml_utils.models.compiled_trees import compile_tree_model
+
+DATA_FILE_PATH=os.path.join("Network_Data","phisingData.csv")
+
+
+def best_time(fn,repeats):
+
+    timings=[]
+    for _ in range(repeats):
+        start=time.perf_counter()
+        fn()
+        timings.append(time.perf_counter()-start)
+    return min(timings)
+
+
+def main():
+
+    parser=argparse.ArgumentParser(description="Latency of compiled tree models against sklearn predict")
+    parser.add_argument("--batch-sizes",type=int,nargs="+",default=[1,16,256,4096])
+    parser.add_argument("--repeats",type=int,default=20)
+    parser.add_argument("--lut-max-features",type=int,default=8)
+    parser.add_argument("--seed",type=int,default=42)
+    args=parser.parse_args()
+
+    df=pd.read_csv(DATA_FILE_PATH)
+    X=df.drop(columns=[TARGET_COLUMN]).to_numpy(dtype=np.float64)
+    y=df[TARGET_COLUMN].replace(-1,0).to_numpy()
+    models={
+        "Decision Tree":DecisionTreeClassifier(random_state=args.seed),
+        "Random Forest":RandomForestClassifier(n_estimators=128,random_state=args.seed),
+        "Gradient Boosting":GradientBoostingClassifier(n_estimators=128,random_state=args.seed),
+        "Adaboost":AdaBoostClassifier(n_estimators=128,random_state=args.seed),
+    }
+    rng=np.random.default_rng(args.seed)
+
+    print(f"{'model':>18} {'batch':>6} {'sklearn_ms':>11} {'compiled_ms':>12} {'lut_ms':>8} {'speedup':>8} {'identical':>9}")
+    for name,model in models.items():
+        model.fit(X,y)
+        compiled=compile_tree_model(model)
+        compiled_lut=compile_tree_model(model,ternary_lut_max_features=args.lut_max_features)
+        for batch_size in args.batch_sizes:
+            batch=X[rng.integers(0,len(X),size=batch_size)]
+            sklearn_s=best_time(lambda: model.predict(batch),args.repeats)
+            compiled_s=best_time(lambda: compiled.predict(batch),args.repeats)
+            lut_s=best_time(lambda: compiled_lut.predict(batch),args.repeats)
+            expected=model.predict(batch)
+            identical=np.array_equal(compiled.predict(batch),expected) and np.array_equal(compiled_lut.predict(batch),expected)
+            print(f"{name:>18} {batch_size:>6} {sklearn_s*1000:>11.3f} {compiled_s*1000:>12.3f} {lut_s*1000:>8.3f} "
+                  f"{sklearn_s/min(compiled_s,lut_s):>8.1f} {str(identical):>9}")
+
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+from sklearn.impute import KNNImputer
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from networksecurity.constants.training_pipeline import TARGET_COLUMN,DATA_TRANSFORMATION_IMPUTER_PARAMS
+from networksecurity.utils.ml_utils.models.ternary_imputer import TernaryKNNImputer
+
+DATA_FILE_PATH=os.path.join("Network_Data","phisingData.csv")
+
+
+def make_dataset(n_rows,missing_rate,flip_rate,seed):
+
+    features=pd.read_csv(DATA_FILE_PATH).drop(columns=[TARGET_COLUMN]).to_numpy(dtype=np.float64)
+    rng=np.random.default_rng(seed)
+    X=features[rng.integers(0,len(features),size=n_rows)]
+    # Random flips widen the set of distinct patterns beyond the source file.
+    flips=rng.random(X.shape)<flip_rate
+    X[flips]=rng.choice([-1.0,0.0,1.0],size=int(flips.sum()))
+    X[rng.random(X.shape)<missing_rate]=np.nan
+    return X
+
+
+def time_imputer(imputer,X):
+
+    start=time.perf_counter()
+    imputed=imputer.fit(X).transform(X)
+    return time.perf_counter()-start,imputed
+
+
+def main():
+
+    parser=argparse.ArgumentParser(description="Compare KNNImputer with TernaryKNNImputer")
+    parser.add_argument("--sizes",type=int,nargs="+",default=[10_000,100_000,1_000_000])
+    parser.add_argument("--missing-rate",type=float,default=0.01)
+    parser.add_argument("--flip-rate",type=float,default=0.02)
+    parser.add_argument("--max-knn-rows",type=int,default=100_000,
+                        help="skip KNNImputer above this size, its cost grows quadratically")
+    parser.add_argument("--n-jobs",type=int,default=-1)
+    parser.add_argument("--seed",type=int,default=42)
+    args=parser.parse_args()
+
+    print(f"{'rows':>10} {'knn_s':>10} {'ternary_s':>10} {'speedup':>8} {'agreement':>10}")
+    for n_rows in args.sizes:
+        X=make_dataset(n_rows,args.missing_rate,args.flip_rate,args.seed)
+        missing=np.isnan(X)
+
+        ternary_seconds,ternary_imputed=time_imputer(TernaryKNNImputer(n_jobs=args.n_jobs),X)
+        if n_rows<=args.max_knn_rows:
+            knn_seconds,knn_imputed=time_imputer(KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS),X)
+            agreement=np.mean(np.isclose(knn_imputed[missing],ternary_imputed[missing]))
+            print(f"{n_rows:>10} {knn_seconds:>10.2f} {ternary_seconds:>10.2f} {knn_seconds/ternary_seconds:>8.1f} {agreement:>10.3f}")
+        else:
+            print(f"{n_rows:>10} {'skipped':>10} {ternary_seconds:>10.2f} {'-':>8} {'-':>10}")
+
+
+if __name__=="__main__":
+    main()
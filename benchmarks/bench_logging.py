@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+
+import numpy as np
+
+ROOT_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT_DIR)
+
+from networksecurity.logging.logger import (configure_logging,shutdown_logging,get_hot_path_logger,
+                                            LazyRotatingFileHandler,LOG_TEXT_FORMAT)
+
+
+class SlowDiskMixin:
+
+    # Every write waits as a saturated or network disk would.
+    latency_seconds=0.
+
+    def emit(self,record):
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        super().emit(record)
+
+
+class SlowFileHandler(SlowDiskMixin,logging.FileHandler):
+    pass
+
+
+class SlowRotatingFileHandler(SlowDiskMixin,LazyRotatingFileHandler):
+    pass
+
+
+def setup_sync(log_file_path,latency_seconds):
+
+    # The previous backend: the caller formats and writes every record itself.
+    shutdown_logging()
+    root=logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler=SlowFileHandler(log_file_path,delay=True)
+    handler.latency_seconds=latency_seconds
+    handler.setFormatter(logging.Formatter(LOG_TEXT_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    return lambda: (root.removeHandler(handler),handler.close())
+
+
+def setup_queue(log_file_path,latency_seconds,json_format=True):
+
+    handler=SlowRotatingFileHandler(log_file_path,maxBytes=0,delay=True)
+    handler.latency_seconds=latency_seconds
+    configure_logging(json_format=json_format,file_handler=handler)
+    return shutdown_logging
+
+
+def run_scenario(name,setup,logger_name,n_records,log_dir,latency_seconds):
+
+    log_file_path=os.path.join(log_dir,f"{name}.log")
+    teardown=setup(log_file_path,latency_seconds)
+    logger=get_hot_path_logger(logger_name) if logger_name else logging.getLogger("bench")
+    latencies=np.empty(n_records,dtype=np.int64)
+    start=time.perf_counter()
+    for index in range(n_records):
+        call_start=time.perf_counter_ns()
+        logger.info("Scored request",extra={"method":"POST","path":"/predict","status":200,"latency_ms":.42})
+        latencies[index]=time.perf_counter_ns()-call_start
+    caller_seconds=time.perf_counter()-start
+    teardown()
+    # Teardown drains the queue, so this is when the last record hit the disk.
+    drained_seconds=time.perf_counter()-start
+    with open(log_file_path) as file_obj:
+        written=sum(1 for _ in file_obj)
+    return {"scenario":name,"records":n_records,"written":written,
+            "mean_us":latencies.mean()/1000,"p50_us":np.percentile(latencies,50)/1000,
+            "p99_us":np.percentile(latencies,99)/1000,"max_us":latencies.max()/1000,
+            "caller_s":caller_seconds,"drained_s":drained_seconds}
+
+
+def main():
+
+    parser=argparse.ArgumentParser(description="Caller-side cost of a log line: synchronous file handler vs the queue backend, "
+                                               "with and without hot-path sampling, on a fast and a slow disk")
+    parser.add_argument("--records",type=int,default=50_000)
+    parser.add_argument("--slow-records",type=int,default=2_000)
+    parser.add_argument("--disk-latency-ms",type=float,default=1.)
+    args=parser.parse_args()
+
+    scenarios=[("sync_text",setup_sync,None),
+               ("queue_text",lambda path,latency: setup_queue(path,latency,json_format=False),None),
+               ("queue_json",setup_queue,None),
+               ("queue_json_hot_path",setup_queue,"bench.hot_path")]
+    print(f"{'scenario':>20} {'disk_ms':>7} {'records':>8} {'written':>8} {'mean_us':>8} {'p50_us':>7} {'p99_us':>8} "
+          f"{'max_us':>9} {'caller_s':>8} {'drained_s':>9}")
+    with tempfile.TemporaryDirectory() as log_dir:
+        for latency_ms,n_records in ((0.,args.records),(args.disk_latency_ms,args.slow_records)):
+            for name,setup,logger_name in scenarios:
+                run=run_scenario(f"{name}_{latency_ms:g}ms",setup,logger_name,n_records,log_dir,latency_ms/1000)
+                print(f"{name:>20} {latency_ms:>7g} {run['records']:>8} {run['written']:>8} {run['mean_us']:>8.1f} "
+                      f"{run['p50_us']:>7.1f} {run['p99_us']:>8.1f} {run['max_us']:>9.1f} {run['caller_s']:>8.3f} {run['drained_s']:>9.3f}")
+
+
+if __name__=="__main__":
+    main()
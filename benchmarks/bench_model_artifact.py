@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import pickle
+import argparse
+import tempfile
+import subprocess
+
+import pandas as pd
+from sklearn.impute import KNNImputer
+from sklearn.pipeline import Pipeline
+from sklearn.ensemble import RandomForestClassifier
+
+ROOT_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT_DIR)
+
+from networksecurity.constants.training_pipeline import TARGET_COLUMN,DATA_TRANSFORMATION_IMPUTER_PARAMS
+from networksecurity.utils.ml_utils.models.estimator import NetworkModel
+from networksecurity.utils.ml_utils.models.compiled_trees import compile_tree_model
+from networksecurity.utils.main_utils.utils import save_obj
+
+DATA_FILE_PATH=os.path.join("Network_Data","phisingData.csv")
+
+# Run in a fresh interpreter per load so every measurement is a cold start.
+LOADER="""
+import sys,json,time
+sys.path.insert(0,sys.argv[1])
+from networksecurity.utils.main_utils.utils import load_obj
+start=time.perf_counter()
+model=load_obj(sys.argv[2],verify=sys.argv[3]=="1")
+load_seconds=time.perf_counter()-start
+memory={}
+with open("/proc/self/smaps_rollup") as file_obj:
+    for line in file_obj:
+        name,_,value=line.partition(":")
+        if name in ("Rss","Anonymous"):
+            memory[name]=int(value.split()[0])
+print(json.dumps({"load_ms":load_seconds*1000,**memory}))
+"""
+
+
+def measure(file_path,verify,repeats):
+
+    runs=[]
+    for _ in range(repeats):
+        output=subprocess.run([sys.executable,"-c",LOADER,ROOT_DIR,file_path,"1" if verify else "0"],
+                              capture_output=True,text=True,check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return min(runs,key=lambda run: run["load_ms"])
+
+
+def main():
+
+    parser=argparse.ArgumentParser(description="Cold-start load time and memory of pickled vs memory-mapped model artifacts")
+    parser.add_argument("--n-estimators",type=int,default=300)
+    parser.add_argument("--repeats",type=int,default=5)
+    args=parser.parse_args()
+
+    df=pd.read_csv(DATA_FILE_PATH)
+    features=df.drop(columns=[TARGET_COLUMN])
+    target=df[TARGET_COLUMN].replace(-1,0)
+    preprocessor=Pipeline([("imputer",KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS))]).fit(features)
+    model=RandomForestClassifier(n_estimators=args.n_estimators,random_state=42).fit(preprocessor.transform(features),target)
+    network_model=NetworkModel(preprocessor=preprocessor,model=model,compiled_model=compile_tree_model(model))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pickle_path=os.path.join(tmp_dir,"model_pickle.pkl")
+        artifact_path=os.path.join(tmp_dir,"model.pkl")
+        with open(pickle_path,"wb") as file_obj:
+            pickle.dump(network_model,file_obj)
+        save_obj(artifact_path,network_model)
+
+        # Anonymous memory is private to each process; the rest of the RSS is
+        # file-backed and shared by every process mapping the same artifact.
+        print(f"{'format':>18} {'size_mb':>8} {'load_ms':>8} {'rss_mb':>7} {'anonymous_mb':>12}")
+        for name,file_path,verify in [("pickle",pickle_path,False),
+                                      ("artifact+verify",artifact_path,True),
+                                      ("artifact",artifact_path,False)]:
+            run=measure(file_path,verify,args.repeats)
+            print(f"{name:>18} {os.path.getsize(file_path)/2**20:>8.1f} {run['load_ms']:>8.1f} "
+                  f"{run['Rss']/1024:>7.1f} {run['Anonymous']/1024:>12.1f}")
+
+
+if __name__=="__main__":
+    main()
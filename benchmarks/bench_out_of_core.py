@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import tempfile
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.impute import KNNImputer
+from sklearn.pipeline import Pipeline
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.linear_model import LogisticRegression
+
+ROOT_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT_DIR)
+
+from networksecurity.constants.training_pipeline import TARGET_COLUMN,SCHEMA_FILE_PATH,DATA_TRANSFORMATION_IMPUTER_PARAMS
+from networksecurity.entity.config_entity import TrainingPipelineConfig,ModelTrainerConfig
+from networksecurity.entity.artifact_entity import DataTransformationArtifact
+from networksecurity.components.model_trainer import ModelTrainer
+from networksecurity.utils.main_utils.utils import read_yaml_file,get_schema_dtypes,save_obj
+from networksecurity.utils.main_utils.stage_profiler import read_peak_rss_bytes
+from networksecurity.utils.ml_utils.synthetic.copula_generator import GaussianCopulaGenerator
+
+DATA_FILE_PATH=os.path.join("Network_Data","phisingData.csv")
+
+
+class InMemoryModelTrainer(ModelTrainer):
+
+    # The in-memory reference: a grid that still finishes at the larger sizes.
+    def get_model_grid(self):
+
+        models={"Logistic Regression":LogisticRegression(),"Decision Tree":DecisionTreeClassifier()}
+        params={"Logistic Regression":{},"Decision Tree":{"max_depth":[8,16]}}
+        return models,params
+
+
+def write_dataset(data_dir,n_rows,seed):
+
+    # Written chunk by chunk straight into .npy files shaped like the
+    # transformation stage's output, features followed by the 0/1 target.
+    schema_dtypes=get_schema_dtypes(read_yaml_file(SCHEMA_FILE_PATH))
+    source=pd.read_csv(DATA_FILE_PATH).astype(schema_dtypes)
+    generator=GaussianCopulaGenerator.from_dataframe(source,seed=seed)
+    n_test=n_rows//5
+    paths={}
+    for split,split_rows,split_seed in (("train",n_rows-n_test,seed),("test",n_test,seed+1)):
+        paths[split]=os.path.join(data_dir,f"{split}.npy")
+        array=np.lib.format.open_memmap(paths[split],mode="w+",dtype=np.float64,shape=(split_rows,source.shape[1]))
+        start=0
+        for chunk in generator.iter_chunks(split_rows,seed=split_seed):
+            features=chunk.drop(columns=[TARGET_COLUMN]).to_numpy(dtype=np.float64)
+            array[start:start+len(chunk)]=np.c_[features,chunk[TARGET_COLUMN].replace(-1,0).to_numpy(dtype=np.float64)]
+            start+=len(chunk)
+        array.flush()
+        del array
+    features=source.drop(columns=[TARGET_COLUMN])
+    paths["preprocessor"]=os.path.join(data_dir,"preprocessing.pkl")
+    save_obj(paths["preprocessor"],Pipeline([("imputer",KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS))]).fit(features))
+    return paths
+
+
+def read_anonymous_rss_bytes():
+
+    with open("/proc/self/status") as file_obj:
+        for line in file_obj:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1])*1024
+    return 0
+
+
+class AnonymousPeakSampler(threading.Thread):
+
+    # Mapped array pages are file-backed and count towards VmHWM although the
+    # kernel can drop them at any time; private memory is what has to fit.
+    def __init__(self,interval=.02):
+
+        super().__init__(daemon=True)
+        self.interval=interval
+        self.peak=0
+        self.stopped=threading.Event()
+
+    def run(self):
+
+        while not self.stopped.wait(self.interval):
+            self.peak=max(self.peak,read_anonymous_rss_bytes())
+
+
+def run_worker(mode,data_dir,chunk_rows):
+
+    # Runs in its own interpreter so the peak RSS belongs to this mode alone.
+    config=TrainingPipelineConfig(datetime.now())
+    config.artifact_dir=os.path.join(data_dir,f"artifacts_{mode}")
+    config.stage_cache_enabled=False
+    model_trainer_config=ModelTrainerConfig(config)
+    model_trainer_config.training_mode=mode
+    model_trainer_config.out_of_core_chunk_rows=chunk_rows
+    model_trainer_config.compile_tree_model=False
+    artifact=DataTransformationArtifact(transformed_object_file_path=os.path.join(data_dir,"preprocessing.pkl"),
+                                        transformed_train_file_path=os.path.join(data_dir,"train.npy"),
+                                        transformed_test_file_path=os.path.join(data_dir,"test.npy"))
+    trainer=InMemoryModelTrainer(model_trainer_config,artifact)
+    trainer.tracker.enabled=False
+    sampler=AnonymousPeakSampler()
+    sampler.start()
+    start=time.perf_counter()
+    model_trainer_artifact=trainer.initiate_model_trainer()
+    sampler.stopped.set()
+    print(json.dumps({"wall_seconds":time.perf_counter()-start,"peak_rss_bytes":read_peak_rss_bytes(),
+                      "peak_anonymous_bytes":sampler.peak,
+                      "model":type(model_trainer_artifact.trained_model.model).__name__,
+                      "test_f1":model_trainer_artifact.test_metric_artifact.f1_score}))
+
+
+def main():
+
+    parser=argparse.ArgumentParser(description="Peak memory and selected-model quality of in-memory vs out-of-core training")
+    parser.add_argument("--rows",type=int,nargs="+",default=[100_000,1_000_000])
+    parser.add_argument("--chunk-rows",type=int,default=65536)
+    parser.add_argument("--seed",type=int,default=42)
+    parser.add_argument("--worker",nargs=2,metavar=("MODE","DATA_DIR"),help=argparse.SUPPRESS)
+    args=parser.parse_args()
+
+    if args.worker:
+        run_worker(*args.worker,args.chunk_rows)
+        return
+
+    print(f"{'rows':>10} {'mode':>11} {'data_mb':>8} {'wall_s':>8} {'peak_rss_mb':>11} {'peak_anon_mb':>12} {'test_f1':>8} model")
+    for n_rows in args.rows:
+        with tempfile.TemporaryDirectory() as data_dir:
+            paths=write_dataset(data_dir,n_rows,args.seed)
+            data_mb=(os.path.getsize(paths["train"])+os.path.getsize(paths["test"]))/2**20
+            for mode in ("in_memory","out_of_core"):
+                output=subprocess.run([sys.executable,os.path.abspath(__file__),"--worker",mode,data_dir,"--chunk-rows",str(args.chunk_rows)],
+                                      capture_output=True,text=True,check=True).stdout
+                run=json.loads(output.strip().splitlines()[-1])
+                print(f"{n_rows:>10} {mode:>11} {data_mb:>8.0f} {run['wall_seconds']:>8.1f} "
+                      f"{run['peak_rss_bytes']/2**20:>11.0f} {run['peak_anonymous_bytes']/2**20:>12.0f} {run['test_f1']:>8.4f} {run['model']}")
+
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,112 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+import pandas as pd
+from sklearn.impute import KNNImputer
+from sklearn.pipeline import Pipeline
+from sklearn.ensemble import RandomForestClassifier
+
+ROOT_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT_DIR)
+
+from networksecurity.constants.training_pipeline import TARGET_COLUMN,DATA_TRANSFORMATION_IMPUTER_PARAMS
+from networksecurity.utils.ml_utils.models.estimator import NetworkModel
+from networksecurity.utils.main_utils.utils import save_obj
+
+DATA_FILE_PATH=os.path.join("Network_Data","phisingData.csv")
+
+
+def train_model(model_file_path):
+
+    df=pd.read_csv(DATA_FILE_PATH)
+    features=df.drop(columns=[TARGET_COLUMN])
+    target=df[TARGET_COLUMN].replace(-1,0)
+    preprocessor=Pipeline([("imputer",KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS))]).fit(features)
+    model=RandomForestClassifier(n_estimators=64,random_state=42).fit(preprocessor.transform(features),target)
+    save_obj(model_file_path,NetworkModel(preprocessor=preprocessor,model=model))
+    return features.to_dict("records")
+
+
+async def wait_until_ready(port,timeout=60):
+
+    deadline=time.monotonic()+timeout
+    while time.monotonic()<deadline:
+        try:
+            reader,writer=await asyncio.open_connection("127.0.0.1",port)
+            writer.write(b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            await reader.read()
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(.2)
+    raise RuntimeError("Scoring service did not start")
+
+
+async def client(port,records,n_requests,latencies):
+
+    reader,writer=await asyncio.open_connection("127.0.0.1",port)
+    rng=np.random.default_rng(len(latencies))
+    for index in rng.integers(0,len(records),size=n_requests):
+        body=json.dumps(records[index]).encode()
+        start=time.perf_counter()
+        writer.write(b"POST /predict HTTP/1.1\r\nContent-Type: application/json\r\n"
+                     +f"Content-Length: {len(body)}\r\n\r\n".encode()+body)
+        await writer.drain()
+        head=await reader.readuntil(b"\r\n\r\n")
+        length=int([line for line in head.split(b"\r\n") if line.lower().startswith(b"content-length")][0].split(b":")[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter()-start)
+    writer.close()
+
+
+async def run_load(port,records,concurrency,n_requests):
+
+    latencies=[]
+    start=time.perf_counter()
+    await asyncio.gather(*[client(port,records,n_requests,latencies) for _ in range(concurrency)])
+    elapsed=time.perf_counter()-start
+    latencies=np.array(latencies)*1000
+    return np.percentile(latencies,50),np.percentile(latencies,99),len(latencies)/elapsed
+
+
+def main():
+
+    parser=argparse.ArgumentParser(description="Load-test the scoring service with and without micro-batching")
+    parser.add_argument("--concurrency",type=int,nargs="+",default=[1,8,32,128])
+    parser.add_argument("--requests-per-client",type=int,default=100)
+    parser.add_argument("--max-batch-sizes",type=int,nargs="+",default=[1,64])
+    parser.add_argument("--max-wait-ms",type=float,default=2.0)
+    parser.add_argument("--port",type=int,default=8765)
+    args=parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_file_path=os.path.join(tmp_dir,"model.pkl")
+        records=train_model(model_file_path)
+
+        print(f"{'max_batch':>9} {'clients':>8} {'p50_ms':>8} {'p99_ms':>8} {'req/s':>8}")
+        for max_batch_size in args.max_batch_sizes:
+            # The service runs as its own process, as it would in production.
+            service=subprocess.Popen([sys.executable,os.path.join(ROOT_DIR,"app.py"),"--model-file-path",model_file_path,
+                                      "--host","127.0.0.1","--port",str(args.port),
+                                      "--max-batch-size",str(max_batch_size),"--max-wait-ms",str(args.max_wait_ms)],
+                                     cwd=os.getcwd())
+            try:
+                asyncio.run(wait_until_ready(args.port))
+                for concurrency in args.concurrency:
+                    p50,p99,throughput=asyncio.run(run_load(args.port,records,concurrency,args.requests_per_client))
+                    print(f"{max_batch_size:>9} {concurrency:>8} {p50:>8.2f} {p99:>8.2f} {throughput:>8.0f}")
+            finally:
+                service.terminate()
+                service.wait()
+
+
+if __name__=="__main__":
+    main()
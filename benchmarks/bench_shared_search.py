@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import RandomForestClassifier
+
+ROOT_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT_DIR)
+
+from networksecurity.constants.training_pipeline import TARGET_COLUMN,SCHEMA_FILE_PATH
+from networksecurity.utils.main_utils.utils import read_yaml_file,get_schema_dtypes
+from networksecurity.utils.ml_utils.search.parallel_search import ParallelSearchExecutor
+from networksecurity.utils.ml_utils.search.budgeted_search import BudgetedSearchExecutor
+from networksecurity.utils.ml_utils.synthetic.copula_generator import GaussianCopulaGenerator
+
+DATA_FILE_PATH=os.path.join("Network_Data","phisingData.csv")
+
+
+def descendants(pid):
+
+    children={}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as file_obj:
+                parent=int(file_obj.read().rsplit(")",1)[1].split()[1])
+        except (OSError,ValueError,IndexError):
+            continue
+        children.setdefault(parent,[]).append(int(entry))
+    found,stack=[],[pid]
+    while stack:
+        current=stack.pop()
+        found.append(current)
+        stack.extend(children.get(current,[]))
+    return found
+
+
+def read_pss_bytes(pid):
+
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as file_obj:
+            for line in file_obj:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1])*1024
+    except OSError:
+        pass
+    return 0
+
+
+class TreePssSampler(threading.Thread):
+
+    # PSS splits shared pages between the processes mapping them, so the sum
+    # over the process tree is the memory the search really occupies.
+    def __init__(self,interval=.05):
+
+        super().__init__(daemon=True)
+        self.interval=interval
+        self.peak=0
+        self.stopped=threading.Event()
+
+    def run(self):
+
+        while not self.stopped.wait(self.interval):
+            self.peak=max(self.peak,sum(read_pss_bytes(pid) for pid in descendants(os.getpid())))
+
+
+def make_dataset(n_rows,seed):
+
+    schema_dtypes=get_schema_dtypes(read_yaml_file(SCHEMA_FILE_PATH))
+    source=pd.read_csv(DATA_FILE_PATH).astype(schema_dtypes)
+    dataframe=GaussianCopulaGenerator.from_dataframe(source,seed=seed).sample(n_rows,seed=seed)
+    X=dataframe.drop(columns=[TARGET_COLUMN]).to_numpy(dtype=np.float64)
+    y=dataframe[TARGET_COLUMN].replace(-1,0).to_numpy(dtype=np.float64)
+    return X,y
+
+
+def run_worker(n_rows,n_jobs,mode,seed):
+
+    X,y=make_dataset(n_rows,seed)
+    models={"Decision Tree":DecisionTreeClassifier(random_state=0),"Random Forest":RandomForestClassifier(random_state=0)}
+    params={"Decision Tree":{"max_depth":[6,12],"criterion":["gini","entropy"]},
+            "Random Forest":{"n_estimators":[16],"max_depth":[8,12]}}
+    if mode=="budgeted":
+        params["Decision Tree"]["max_depth"]=[4,6,8,12]
+        executor=BudgetedSearchExecutor(n_jobs=n_jobs,cv=3,min_samples=1000)
+    else:
+        executor=ParallelSearchExecutor(n_jobs=n_jobs,cv=3)
+    sampler=TreePssSampler()
+    baseline=sum(read_pss_bytes(pid) for pid in descendants(os.getpid()))
+    sampler.start()
+    start=time.perf_counter()
+    best_models=executor.search(models,params,X,y)
+    sampler.stopped.set()
+    print(json.dumps({"wall_seconds":time.perf_counter()-start,"baseline_bytes":baseline,"peak_bytes":sampler.peak,
+                      "best_params":{name:{key:value for key,value in model.get_params().items() if key in ("max_depth","criterion")}
+                                     for name,model in best_models.items()}}))
+
+
+def main():
+
+    parser=argparse.ArgumentParser(description="Peak memory of the parallel model search as workers are added; "
+                                               "joblib memory-maps the training data for the workers")
+    parser.add_argument("--rows",type=int,default=300_000)
+    parser.add_argument("--n-jobs",type=int,nargs="+",default=[1,2,4])
+    parser.add_argument("--mode",choices=["exhaustive","budgeted"],nargs="+",default=["exhaustive","budgeted"])
+    parser.add_argument("--seed",type=int,default=42)
+    parser.add_argument("--worker",nargs=2,metavar=("N_JOBS","MODE"),help=argparse.SUPPRESS)
+    args=parser.parse_args()
+
+    if args.worker:
+        run_worker(args.rows,int(args.worker[0]),args.worker[1],args.seed)
+        return
+
+    data_mb=args.rows*(len(get_schema_dtypes(read_yaml_file(SCHEMA_FILE_PATH))))*8/2**20
+    print(f"training data: {data_mb:.0f} MB")
+    print(f"{'mode':>10} {'n_jobs':>6} {'wall_s':>7} {'peak_mb':>8} {'over_baseline_mb':>16} {'per_added_worker_mb':>19} best_params")
+    for mode in args.mode:
+        previous=None
+        for n_jobs in args.n_jobs:
+            output=subprocess.run([sys.executable,os.path.abspath(__file__),"--rows",str(args.rows),"--seed",str(args.seed),
+                                   "--worker",str(n_jobs),mode],capture_output=True,text=True,check=True).stdout
+            run=json.loads(output.strip().splitlines()[-1])
+            over_baseline=(run["peak_bytes"]-run["baseline_bytes"])/2**20
+            # A single job fits in the benchmark process itself; more start
+            # that many worker processes.
+            n_workers=0 if n_jobs==1 else n_jobs
+            per_worker=f"{(over_baseline-previous[1])/(n_workers-previous[0]):.0f}" if previous else "-"
+            previous=(n_workers,over_baseline)
+            print(f"{mode:>10} {n_jobs:>6} {run['wall_seconds']:>7.1f} {run['peak_bytes']/2**20:>8.0f} "
+                  f"{over_baseline:>16.0f} {per_worker:>19} {run['best_params']}")
+
+
+if __name__=="__main__":
+    main()
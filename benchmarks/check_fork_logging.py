@@ -0,0 +1,67 @@
+import os
+import sys
+import glob
+import time
+import logging
+import argparse
+import tempfile
+
+ROOT_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT_DIR)
+
+from networksecurity.logging.logger import configure_logging,shutdown_logging
+
+
+def run_check(log_dir,max_bytes,n_records):
+
+    # A forked child logs once before and once after the parent rotates the
+    # file; the second record has to land in the current log file, not in
+    # the rotated one the child had open.
+    log_file_path=os.path.join(log_dir,"fork.log")
+    configure_logging(log_file_path=log_file_path,max_bytes=max_bytes,backup_count=n_records,json_format=False)
+    logger=logging.getLogger("fork_check")
+    logger.info("parent started")
+    time.sleep(.2)
+    pid=os.fork()
+    if pid==0:
+        logger.info("child before rotation")
+        time.sleep(1.5)
+        logger.info("child after rotation")
+        shutdown_logging()
+        os._exit(0)
+    time.sleep(.5)
+    for index in range(n_records):
+        logger.info("parent record %d %s",index,"x"*40)
+    os.waitpid(pid,0)
+    shutdown_logging()
+
+    failures=[]
+    contents={os.path.basename(file_path):open(file_path).read() for file_path in glob.glob(log_file_path+"*")}
+    if len(contents)<2:
+        failures.append(f"parent did not rotate, found {sorted(contents)}")
+    found=[name for name,text in contents.items() if "child after rotation" in text]
+    if found!=[os.path.basename(log_file_path)]:
+        failures.append(f"child record written after rotation found in {found}")
+    if not any("child before rotation" in text for text in contents.values()):
+        failures.append("child record written before rotation is missing")
+    return failures
+
+
+def main():
+
+    parser=argparse.ArgumentParser(description="Check that forked workers follow the log file when the parent rotates it")
+    parser.add_argument("--max-bytes",type=int,default=20_000)
+    parser.add_argument("--records",type=int,default=400)
+    args=parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        failures=run_check(log_dir,args.max_bytes,args.records)
+
+    print(f"forked child writes to the current log file after rotation: {'FAIL' if failures else 'OK'}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,84 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+ROOT_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Scoring entry points and the cumulative import time each may take.
+DEFAULT_MODULES=["networksecurity.pipeline.inference",
+                 "networksecurity.pipeline.scoring_service",
+                 "networksecurity.pipeline.batch_prediction"]
+# Training-only dependencies a scoring process must never import. Unpickling
+# a model may still import whatever sklearn needs for its estimators.
+FORBIDDEN_PREFIXES=("mlflow","pymongo","dotenv","sklearn.model_selection","networksecurity.components")
+FORBIDDEN_AFTER_LOAD_PREFIXES=("mlflow","pymongo","dotenv","networksecurity.components")
+
+PROBE="""
+import sys,json
+sys.path.insert(0,sys.argv[1])
+__import__(sys.argv[2])
+imported=sorted(sys.modules)
+if sys.argv[3]:
+    from networksecurity.pipeline.inference import load_model
+    load_model(sys.argv[3])
+print(json.dumps([imported,sorted(sys.modules)]))
+"""
+
+
+def probe(module,model_file_path):
+
+    # A fresh interpreter in an empty directory, so nothing is cached and any
+    # file written as an import side effect shows up.
+    with tempfile.TemporaryDirectory() as work_dir:
+        result=subprocess.run([sys.executable,"-X","importtime","-c",PROBE,ROOT_DIR,module,model_file_path or ""],
+                              capture_output=True,text=True,cwd=work_dir)
+        if result.returncode!=0:
+            raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+        created=os.listdir(work_dir)
+    cumulative_us=None
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and line.count("|")==2:
+            _,cumulative,name=line.split("|")
+            if name.strip()==module:
+                cumulative_us=int(cumulative)
+    imported,loaded=json.loads(result.stdout.strip().splitlines()[-1])
+    return cumulative_us/1000,imported,loaded,created
+
+
+def main():
+
+    parser=argparse.ArgumentParser(description="Fail when the scoring import path gets slower or pulls in training dependencies")
+    parser.add_argument("--modules",nargs="+",default=DEFAULT_MODULES)
+    parser.add_argument("--budget-ms",type=float,default=900.0)
+    parser.add_argument("--repeats",type=int,default=3)
+    parser.add_argument("--model-file-path",default=None,help="Also load this model and check what unpickling imports")
+    args=parser.parse_args()
+
+    failures=[]
+    print(f"{'module':>42} {'import_ms':>10} {'budget_ms':>10}")
+    for module in args.modules:
+        runs=[probe(module,args.model_file_path) for _ in range(args.repeats)]
+        import_ms=min(run[0] for run in runs)
+        _,imported,loaded,created=runs[0]
+        print(f"{module:>42} {import_ms:>10.1f} {args.budget_ms:>10.1f}")
+        if import_ms>args.budget_ms:
+            failures.append(f"{module} took {import_ms:.0f} ms to import, budget is {args.budget_ms:.0f} ms")
+        forbidden=[name for name in imported if name.startswith(FORBIDDEN_PREFIXES)]
+        if forbidden:
+            failures.append(f"{module} imported training-only modules: {', '.join(forbidden[:10])}")
+        forbidden=[name for name in loaded if name.startswith(FORBIDDEN_AFTER_LOAD_PREFIXES)]
+        if args.model_file_path and forbidden:
+            failures.append(f"Loading {args.model_file_path} imported training-only modules: {', '.join(forbidden[:10])}")
+        if created:
+            failures.append(f"{module} created {created} in the working directory on import")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import argparse
+import tempfile
+
+import numpy as np
+from sklearn.tree import DecisionTreeClassifier
+
+ROOT_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT_DIR)
+
+from networksecurity.utils.ml_utils.tracking.mlflow_tracker import MlflowTracker,MAX_BATCH_METRICS,MAX_BATCH_PARAMS
+
+
+def run_checks(tracking_uri,n_children):
+
+    # Logs through the tracker the way model training does, then reads the
+    # runs back with a plain MLflow client.
+    from mlflow.tracking import MlflowClient
+
+    failures=[]
+    tracker=MlflowTracker(tracking_uri=tracking_uri,experiment_name="tracker check")
+    parent=tracker.start_run(run_name="model_trainer",tags={"check":"1"})
+    # More metrics and params than one log_batch call accepts.
+    n_metrics,n_params=MAX_BATCH_METRICS+250,MAX_BATCH_PARAMS+30
+    tracker.log_params(parent,{f"param_{index}":index for index in range(n_params)})
+    tracker.log_metrics(parent,{f"metric_{index}":index/10 for index in range(n_metrics)})
+    model=DecisionTreeClassifier(max_depth=2).fit(np.arange(20).reshape(-1,1),np.arange(20)%2)
+    tracker.log_model(parent,model)
+    for index in range(n_children):
+        child=tracker.start_run(run_name=f"candidate_{index}",parent=parent)
+        tracker.log_params(child,{"max_depth":index})
+        tracker.log_metrics(child,{"mean_test_score":index/n_children})
+        tracker.end_run(child)
+    tracker.end_run(parent)
+    tracker.close()
+    if tracker.errors:
+        failures.append(f"tracker reported {tracker.errors} failed events")
+
+    client=MlflowClient(tracking_uri=tracking_uri)
+    experiment=client.get_experiment_by_name("tracker check")
+    runs=client.search_runs([experiment.experiment_id],max_results=1000)
+    parents=[run for run in runs if run.data.tags.get("mlflow.runName")=="model_trainer"]
+    if len(parents)!=1:
+        return failures+[f"expected one parent run, found {len(parents)}"]
+    parent_run=parents[0]
+    children=[run for run in runs if run.data.tags.get("mlflow.parentRunId")==parent_run.info.run_id]
+    if len(children)!=n_children:
+        failures.append(f"expected {n_children} child runs, found {len(children)}")
+    if any(run.info.status!="FINISHED" for run in [parent_run,*children]):
+        failures.append("not every run was ended as FINISHED")
+    if len(parent_run.data.metrics)!=n_metrics or parent_run.data.metrics.get(f"metric_{n_metrics-1}")!=(n_metrics-1)/10:
+        failures.append(f"split log_batch stored {len(parent_run.data.metrics)} of {n_metrics} metrics")
+    if len(parent_run.data.params)!=n_params:
+        failures.append(f"split log_batch stored {len(parent_run.data.params)} of {n_params} params")
+    if any("max_depth" not in run.data.params or "mean_test_score" not in run.data.metrics for run in children):
+        failures.append("child runs are missing their params or metrics")
+    artifacts=[artifact.path for artifact in client.list_artifacts(parent_run.info.run_id,"model")]
+    if "model/MLmodel" not in artifacts:
+        failures.append(f"logged model is missing its MLmodel file, found {artifacts}")
+    else:
+        import mlflow.sklearn
+        with tempfile.TemporaryDirectory() as download_dir:
+            loaded=mlflow.sklearn.load_model(client.download_artifacts(parent_run.info.run_id,"model",download_dir))
+        if not np.array_equal(loaded.predict(np.arange(20).reshape(-1,1)),model.predict(np.arange(20).reshape(-1,1))):
+            failures.append("logged model predicts differently from the original")
+    return failures
+
+
+def main():
+
+    parser=argparse.ArgumentParser(description="Check the background MLflow tracker against a local file-based tracking store")
+    parser.add_argument("--children",type=int,default=5)
+    args=parser.parse_args()
+
+    # Recent MLflow releases only open a file store when explicitly allowed.
+    os.environ.setdefault("MLFLOW_ALLOW_FILE_STORE","true")
+    with tempfile.TemporaryDirectory() as store_dir:
+        tracking_uri=f"file:{os.path.join(store_dir,'mlruns')}"
+        failures=run_checks(tracking_uri,args.children)
+
+    print(f"parent/child runs, split log_batch and logged model: {'FAIL' if failures else 'OK'}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__=="__main__":
+    main()
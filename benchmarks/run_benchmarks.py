@@ -0,0 +1,276 @@
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier
+
+ROOT_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,ROOT_DIR)
+
+from networksecurity.constants.training_pipeline import (SCHEMA_FILE_PATH,PROFILING_DIR_NAME,PROFILING_REPORT_FILE_NAME,
+                                                         DATA_INGESTION_DATABASE_NAME,DATA_INGESTION_COLLECTION_NAME)
+from networksecurity.entity.config_entity import TrainingPipelineConfig
+from networksecurity.components.model_trainer import ModelTrainer
+from networksecurity.pipeline.training_pipeline import TrainingPipeline
+from networksecurity.pipeline.inference import load_model,get_feature_columns,records_to_features
+from networksecurity.utils.main_utils.utils import read_yaml_file,get_schema_dtypes
+from networksecurity.utils.ml_utils.synthetic.copula_generator import GaussianCopulaGenerator,fidelity_report
+
+DATA_FILE_PATH=os.path.join("Network_Data","phisingData.csv")
+RESULTS_FILE_PATH=os.path.join(ROOT_DIR,"benchmarks","results","history.jsonl")
+# Metrics compared against the previous run; lower is better for all of them.
+COMPARED_METRICS=("wall_seconds","p50_ms","p99_ms")
+FIDELITY_SAMPLE_ROWS: int = 1_000_000
+
+
+class SyntheticCursor:
+
+    def __init__(self,dataframe,batch_size):
+
+        self.dataframe=dataframe
+        self.batch_size=batch_size
+        self.rows=len(dataframe)
+
+    def limit(self,rows):
+
+        if rows:
+            self.rows=min(self.rows,rows)
+        return self
+
+    def __iter__(self):
+
+        # Documents are built a batch at a time, like a driver decoding BSON,
+        # so even the largest scale never holds them all.
+        for start in range(0,self.rows,self.batch_size):
+            yield from self.dataframe.iloc[start:min(start+self.batch_size,self.rows)].to_dict("records")
+
+
+class SyntheticCollection:
+
+    # Stands in for the Mongo collection, so ingestion runs without a server.
+    def __init__(self,dataframe,name=DATA_INGESTION_COLLECTION_NAME):
+
+        self.dataframe=dataframe
+        self.name=name
+
+    def count_documents(self,query):
+
+        return len(self.dataframe)
+
+    def find(self,query=None,projection=None,batch_size=10000):
+
+        return SyntheticCursor(self.dataframe,batch_size)
+
+
+class BenchmarkModelTrainer(ModelTrainer):
+
+    # A grid that finishes at every scale; --grid full keeps the trainer's own.
+    def get_model_grid(self):
+
+        models={"Logistic Regression":LogisticRegression(),
+                "Decision Tree":DecisionTreeClassifier(),
+                "Random Forest":RandomForestClassifier()}
+        params={"Logistic Regression":{},
+                "Decision Tree":{"criterion":["gini","entropy"],"max_depth":[8,16]},
+                "Random Forest":{"n_estimators":[32],"max_depth":[12]}}
+        return models,params
+
+
+def git_revision():
+
+    try:
+        commit=subprocess.run(["git","rev-parse","HEAD"],capture_output=True,text=True,check=True,cwd=ROOT_DIR).stdout.strip()
+        status=subprocess.run(["git","status","--porcelain","--untracked-files=no"],capture_output=True,text=True,check=True,cwd=ROOT_DIR).stdout
+        return commit,bool(status.strip())
+    except (OSError,subprocess.CalledProcessError):
+        return None,None
+
+
+def make_pipeline_config(artifact_root):
+
+    config=TrainingPipelineConfig(datetime.now())
+    config.artifact_name=artifact_root
+    config.artifact_dir=os.path.join(artifact_root,config.timestamp)
+    config.stage_cache_dir=os.path.join(artifact_root,"stage_cache")
+    config.stage_cache_enabled=False
+    config.tracking_enabled=False
+    config.profiling_enabled=True
+    config.profiling_dir=os.path.join(config.artifact_dir,PROFILING_DIR_NAME)
+    config.stage_metrics_file_path=os.path.join(config.profiling_dir,PROFILING_REPORT_FILE_NAME)
+    return config
+
+
+def time_calls(fn,n_calls):
+
+    latencies=[]
+    for _ in range(n_calls):
+        start=time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter()-start)*1000)
+    return {"p50_ms":float(np.percentile(latencies,50)),"p99_ms":float(np.percentile(latencies,99)),"calls":n_calls}
+
+
+def benchmark_scoring(profiler,model_file_path,dataframe,bulk_rows,n_calls):
+
+    feature_columns=get_feature_columns()
+    features=dataframe[feature_columns]
+    records=features.iloc[:256].to_dict("records")
+
+    with profiler.profile("scoring.load"):
+        model=load_model(model_file_path)
+    # Single requests and micro-batches go through the same record conversion
+    # as the scoring service.
+    for stage_name,batch in (("scoring.single_record",records[:1]),("scoring.micro_batch",records)):
+        with profiler.profile(stage_name) as record:
+            record.update(time_calls(lambda: model.predict(records_to_features(batch,feature_columns)),n_calls))
+            record["rows_in"]=len(batch)*n_calls
+    bulk=features.iloc[:bulk_rows].astype(np.float64)
+    with profiler.profile("scoring.bulk") as record:
+        start=time.perf_counter()
+        model.predict(bulk)
+        record["rows_in"]=len(bulk)
+        record["rows_per_second"]=len(bulk)/(time.perf_counter()-start)
+
+
+def summarize_stages(records):
+
+    stages={}
+    for record in records:
+        if record["stage"]=="model_trainer.candidate":
+            summary=stages.setdefault("model_trainer.candidates",{"count":0,"cpu_seconds":0.0})
+            summary["count"]+=1
+            summary["cpu_seconds"]+=record.get("cpu_seconds") or 0.0
+            continue
+        stages[record["stage"]]={key:value for key,value in record.items()
+                                 if key not in ("stage","started_at") and not key.endswith("file_path")}
+    return stages
+
+
+def run_scale(generator,source,scale,args):
+
+    n_rows=len(source)*scale
+    start=time.perf_counter()
+    dataframe=generator.sample(n_rows,seed=args.seed+scale)
+    generation_seconds=time.perf_counter()-start
+    fidelity=fidelity_report(source,dataframe.iloc[:FIDELITY_SAMPLE_ROWS])
+
+    with tempfile.TemporaryDirectory() as artifact_root:
+        config=make_pipeline_config(artifact_root)
+        mongo_client={DATA_INGESTION_DATABASE_NAME:{DATA_INGESTION_COLLECTION_NAME:SyntheticCollection(dataframe)}}
+        pipeline=TrainingPipeline(config,mongo_client=mongo_client)
+        if args.grid=="small":
+            pipeline.model_trainer_class=BenchmarkModelTrainer
+        model_trainer_artifact=pipeline.run_pipeline()
+        benchmark_scoring(pipeline.profiler,model_trainer_artifact.trained_model_file_path,dataframe,
+                          min(n_rows,args.bulk_rows),args.scoring_calls)
+
+    return {"scale":scale,"rows":n_rows,"grid":args.grid,"generation_seconds":generation_seconds,
+            "fidelity":fidelity,"stages":summarize_stages(pipeline.profiler.records)}
+
+
+def load_history(file_path):
+
+    if not os.path.exists(file_path):
+        return []
+    with open(file_path) as file_obj:
+        return [json.loads(line) for line in file_obj if line.strip()]
+
+
+def find_baseline(history,result):
+
+    # The latest earlier run of the same size, grid and machine.
+    for previous in reversed(history):
+        if (previous["scale"],previous["grid"],previous["host"])==(result["scale"],result["grid"],result["host"]):
+            return previous
+    return None
+
+
+def compare(result,baseline,threshold,min_seconds):
+
+    regressions=[]
+    rows=[]
+    for stage_name,metrics in result["stages"].items():
+        previous=(baseline or {}).get("stages",{}).get(stage_name,{})
+        for metric in COMPARED_METRICS:
+            value=metrics.get(metric)
+            if value is None:
+                continue
+            before=previous.get(metric)
+            ratio=value/before if before else None
+            rows.append((stage_name,metric,value,before,ratio))
+            if ratio is None:
+                continue
+            # Tiny stages are noisy; they only count once the absolute change
+            # is also noticeable.
+            delta_seconds=(value-before)/1000 if metric.endswith("_ms") else value-before
+            if ratio>1+threshold and delta_seconds>min_seconds:
+                regressions.append(f"scale {result['scale']}x {stage_name} {metric}: {before:.3f} -> {value:.3f} ({ratio:.2f}x)")
+    return rows,regressions
+
+
+def main():
+
+    parser=argparse.ArgumentParser(description="Benchmark every training stage and the scoring path on synthetic data at several sizes")
+    parser.add_argument("--scales",type=int,nargs="+",default=[1,10,100,1000],
+                        help="dataset sizes as multiples of the source file")
+    parser.add_argument("--grid",choices=["small","full"],default="small")
+    parser.add_argument("--bulk-rows",type=int,default=100_000)
+    parser.add_argument("--scoring-calls",type=int,default=200)
+    parser.add_argument("--seed",type=int,default=42)
+    parser.add_argument("--results-file",default=RESULTS_FILE_PATH)
+    parser.add_argument("--regression-threshold",type=float,default=.25,
+                        help="relative slowdown against the previous run that counts as a regression")
+    parser.add_argument("--min-seconds",type=float,default=.05)
+    parser.add_argument("--fail-on-regression",action="store_true")
+    parser.add_argument("--no-save",action="store_true")
+    args=parser.parse_args()
+
+    schema_dtypes=get_schema_dtypes(read_yaml_file(SCHEMA_FILE_PATH))
+    source=pd.read_csv(DATA_FILE_PATH).astype(schema_dtypes)
+    generator=GaussianCopulaGenerator.from_dataframe(source,seed=args.seed)
+
+    commit,dirty=git_revision()
+    history=load_history(args.results_file)
+    failures=[]
+    for scale in args.scales:
+        result=run_scale(generator,source,scale,args)
+        result.update({"commit":commit,"dirty":dirty,"created_at":datetime.now().isoformat(),
+                       "host":socket.gethostname(),"python":platform.python_version(),"cpu_count":os.cpu_count()})
+        baseline=find_baseline(history,result)
+        rows,regressions=compare(result,baseline,args.regression_threshold,args.min_seconds)
+        failures.extend(regressions)
+
+        fidelity=result["fidelity"]
+        print(f"\nscale {scale}x: {result['rows']} rows, generated in {result['generation_seconds']:.1f}s, "
+              f"max marginal error {fidelity['max_marginal_error']:.4f}, mean correlation error {fidelity['mean_correlation_error']:.4f}"
+              +(f", compared with {baseline['commit'][:10] if baseline['commit'] else 'unknown'}" if baseline else ""))
+        print(f"{'stage':>26} {'metric':>13} {'value':>10} {'previous':>10} {'ratio':>6}")
+        for stage_name,metric,value,before,ratio in rows:
+            before=f"{before:.3f}" if before is not None else "-"
+            ratio=f"{ratio:.2f}" if ratio is not None else "-"
+            print(f"{stage_name:>26} {metric:>13} {value:>10.3f} {before:>10} {ratio:>6}")
+
+        if not args.no_save:
+            os.makedirs(os.path.dirname(args.results_file),exist_ok=True)
+            with open(args.results_file,"a") as file_obj:
+                file_obj.write(json.dumps(result,default=str)+"\n")
+            history.append(result)
+
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    sys.exit(1 if failures and args.fail_on_regression else 0)
+
+
+if __name__=="__main__":
+    main()
@@ -10,6 +10,14 @@ from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
 from networksecurity.entity.config_entity import DataIngestionConfig
 from networksecurity.entity.artifact_entity import DataIngestionArtifact
+from networksecurity.constants.training_pipeline import SCHEMA_FILE_PATH,SAMPLE_WEIGHT_COLUMN
+from networksecurity.utils.main_utils.utils import read_yaml_file,get_schema_dtypes,hash_file,hash_dataframe
+from networksecurity.utils.main_utils.stage_cache import StageCache,config_fingerprint
+from networksecurity.utils.main_utils.feature_store import write_feature_store,cast_to_schema_dtypes
+from networksecurity.utils.main_utils.artifact_writer import ArtifactWriter
+from networksecurity.utils.main_utils.incremental_state import IncrementalState,overlap_start
+from networksecurity.utils.main_utils.deduplication import deduplicate_rows,split_by_row,get_sample_weight
+from networksecurity.utils.ml_utils.drift.discrete_drift import DriftBaseline
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -18,25 +26,39 @@ MONGO_DB_URL=os.getenv("MONGO_DB_URL")
 
 class DataIngestion:
 
-    def __init__(self,data_ingestion_config:DataIngestionConfig):
+    def __init__(self,data_ingestion_config:DataIngestionConfig,mongo_client=None,artifact_writer:ArtifactWriter=None,
+                 incremental_state:IncrementalState=None):
 
         try:
             self.data_ingestion_config=data_ingestion_config
+            self.mongo_client=mongo_client
+            self.artifact_writer=artifact_writer or ArtifactWriter()
+            self.incremental_state=incremental_state
+            self.schema_dtypes=get_schema_dtypes(read_yaml_file(SCHEMA_FILE_PATH))
         except Exception as e:
             raise NetworkSecurityException(e,sys)
-        
-    def export_collection_dataframe(self):
+
+    def get_collection(self):
 
         try:
+            if self.mongo_client is None:
+                self.mongo_client=pymongo.MongoClient(MONGO_DB_URL)
             database_name=self.data_ingestion_config.database_name
             collection_name=self.data_ingestion_config.collection_name
-            self.mongo_client=pymongo.MongoClient(MONGO_DB_URL)
-            collection=self.mongo_client[database_name][collection_name]
+            return self.mongo_client[database_name][collection_name]
 
-            df=pd.DataFrame(list(collection.find()))
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+        
+    def export_collection_dataframe(self,query:dict=None):
+
+        try:
+            collection=self.get_collection()
+
+            df=pd.DataFrame(list(collection.find(query or {})))
 
             if "_id" in df.columns.to_list():
-                df=df.drop(columns=["_id"],axis=1)
+                df=df.drop(columns=["_id"])
                 df.replace({"na":np.nan},inplace=True)
             
             return df
@@ -44,13 +66,264 @@ class DataIngestion:
         except Exception as e:
             raise NetworkSecurityException(e,sys)
         
+    @staticmethod
+    def records_to_array(records:List[dict],columns:List[str],dtype):
+
+        try:
+            frame=pd.DataFrame.from_records(records,columns=columns)
+            values=frame.apply(pd.to_numeric,errors="coerce").to_numpy(dtype=np.float64,na_value=np.nan)
+            missing=np.isnan(values)
+            values[missing]=0
+            return values.astype(dtype),missing
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def iter_collection_chunks(self,collection=None,query:dict=None,limit:int=0):
+
+        try:
+            if collection is None:
+                collection=self.get_collection()
+            columns=list(self.schema_dtypes.keys())
+            dtype=np.result_type(*self.schema_dtypes.values())
+            batch_size=self.data_ingestion_config.export_batch_size
+
+            projection={"_id":0}
+            projection.update({column:1 for column in columns})
+            cursor=collection.find(query or {},projection=projection,batch_size=batch_size)
+            if limit:
+                cursor=cursor.limit(limit)
+
+            records=[]
+            for document in cursor:
+                records.append(document)
+                if len(records)==batch_size:
+                    yield DataIngestion.records_to_array(records,columns,dtype)
+                    records=[]
+            if records:
+                yield DataIngestion.records_to_array(records,columns,dtype)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def export_collection_array(self,query:dict=None):
+
+        try:
+            collection=self.get_collection()
+            columns=list(self.schema_dtypes.keys())
+            dtype=np.result_type(*self.schema_dtypes.values())
+            total_rows=collection.count_documents(query or {})
+            shape=(total_rows,len(columns))
+
+            if self.data_ingestion_config.export_to_disk:
+                array_file_path=self.data_ingestion_config.export_array_file_path
+                os.makedirs(os.path.dirname(array_file_path),exist_ok=True)
+                values=np.lib.format.open_memmap(array_file_path,mode="w+",dtype=dtype,shape=shape)
+            else:
+                values=np.empty(shape,dtype=dtype)
+
+            # Missing cells are rare, so they are kept as sparse (row, column) pairs
+            # instead of a dense mask the size of the data.
+            missing_rows,missing_columns=[],[]
+            start=0
+            for chunk,missing in self.iter_collection_chunks(collection=collection,query=query,limit=total_rows):
+                stop=start+len(chunk)
+                values[start:stop]=chunk
+                rows,cols=np.nonzero(missing)
+                missing_rows.append(rows+start)
+                missing_columns.append(cols)
+                start=stop
+            logging.info(f"Exported {start} documents from {collection.name} in batches of {self.data_ingestion_config.export_batch_size}")
+
+            if isinstance(values,np.memmap):
+                values.flush()
+            missing_rows=np.concatenate(missing_rows) if missing_rows else np.empty(0,dtype=np.int64)
+            missing_columns=np.concatenate(missing_columns) if missing_columns else np.empty(0,dtype=np.int64)
+            return values[:start],missing_rows,missing_columns
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def export_collection_dataframe_streaming(self,query:dict=None):
+
+        try:
+            columns=list(self.schema_dtypes.keys())
+            values,missing_rows,missing_columns=self.export_collection_array(query=query)
+
+            df=pd.DataFrame(values,columns=columns,copy=False)
+            for column_index in np.unique(missing_columns):
+                mask=np.zeros(len(values),dtype=bool)
+                mask[missing_rows[missing_columns==column_index]]=True
+                column_values=np.ascontiguousarray(values[:,column_index])
+                df[columns[column_index]]=pd.arrays.IntegerArray(column_values,mask)
+
+            return df
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+        
+    def export_dataframe(self,query:dict=None) -> pd.DataFrame:
+
+        try:
+            if self.data_ingestion_config.streaming_export:
+                dataframe=self.export_collection_dataframe_streaming(query=query)
+            else:
+                dataframe=self.export_collection_dataframe(query=query)
+            dataframe=cast_to_schema_dtypes(dataframe,self.schema_dtypes)
+            if self.data_ingestion_config.deduplicate:
+                dataframe=self.deduplicate(dataframe)
+            return dataframe
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def deduplicate(self,dataframe:pd.DataFrame) -> pd.DataFrame:
+
+        try:
+            # Every later stage, from imputation to the search, then works per
+            # distinct row and reads the duplicates back as sample weights.
+            unique=deduplicate_rows(dataframe,SAMPLE_WEIGHT_COLUMN)
+            logging.info(f"Deduplicated {len(dataframe)} rows into {len(unique)} distinct rows")
+            return unique
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def get_high_watermark(self,collection=None):
+
+        try:
+            # Read before exporting and used as the upper bound of the export,
+            # so documents inserted meanwhile are left for the next run.
+            if collection is None:
+                collection=self.get_collection()
+            field=self.data_ingestion_config.watermark_field
+            for document in collection.find({},projection={field:1}).sort(field,-1).limit(1):
+                return document.get(field)
+            return None
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def get_recent_ids(self,collection,high_watermark) -> list:
+
+        try:
+            # Read before exporting, like the high watermark.
+            config=self.data_ingestion_config
+            start=overlap_start(high_watermark,config.watermark_overlap_seconds)
+            cursor=collection.find({config.watermark_field:{"$gt":start,"$lte":high_watermark}},projection={"_id":1})
+            recent_ids=[document["_id"] for document in cursor.limit(config.watermark_max_recent_ids+1)]
+            if len(recent_ids)>config.watermark_max_recent_ids:
+                logging.warning(f"More than {config.watermark_max_recent_ids} documents in the {config.watermark_overlap_seconds}s "
+                                f"below watermark {high_watermark}; the next run will not re-read that window")
+                return None
+            return recent_ids
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def get_export_query(self,high_watermark,recent_ids:list,low_watermark=None,seen_ids:list=None) -> dict:
+
+        try:
+            # Everything below the overlap window plus recent_ids inside it; at
+            # the low end, the previous window minus the seen_ids it ingested.
+            field=self.data_ingestion_config.watermark_field
+            overlap_seconds=self.data_ingestion_config.watermark_overlap_seconds
+            bounds={"$lte":high_watermark if recent_ids is None else overlap_start(high_watermark,overlap_seconds)}
+            if low_watermark is not None:
+                bounds["$gt"]=low_watermark if seen_ids is None else overlap_start(low_watermark,overlap_seconds)
+            query={field:bounds}
+            if recent_ids:
+                query={"$or":[query,{"_id":{"$in":recent_ids}}]}
+            if seen_ids:
+                query={"$and":[query,{"_id":{"$nin":seen_ids}}]}
+            return query
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def detect_delta_drift(self,delta:pd.DataFrame,baseline:DriftBaseline) -> bool:
+
+        try:
+            # The chi-square p-value flags almost any shift once the stored
+            # counts are large, so new rows are judged by their PSI instead.
+            if baseline is None:
+                return True
+            _,report=baseline.compare(delta,weights=get_sample_weight(delta,SAMPLE_WEIGHT_COLUMN))
+            max_psi=max(column_report["psi"] for column_report in report.values())
+            logging.info(f"Largest PSI of the {len(delta)} new rows against the training baseline: {max_psi:.4f}")
+            return max_psi>self.data_ingestion_config.drift_psi_threshold
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def split_rows(self,dataframe:pd.DataFrame):
+
+        try:
+            if self.data_ingestion_config.deduplicate:
+                return split_by_row(dataframe,self.data_ingestion_config.train_test_split_ratio,SAMPLE_WEIGHT_COLUMN)
+            if len(dataframe)<2:
+                return dataframe,dataframe.iloc[:0]
+            return train_test_split(dataframe,test_size=self.data_ingestion_config.train_test_split_ratio)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def ingest_incremental(self):
+
+        try:
+            state=self.incremental_state
+            config=self.data_ingestion_config
+            collection=self.get_collection()
+            high_watermark=self.get_high_watermark(collection)
+            recent_ids=None if high_watermark is None else self.get_recent_ids(collection,high_watermark)
+
+            if state.needs_full_refresh(config.full_refresh_days):
+                state.start_full_refresh()
+                dataframe=self.export_dataframe(self.get_export_query(high_watermark,recent_ids) if high_watermark is not None else None)
+                state.add_parts(*self.split_rows(dataframe),schema_dtypes=self.schema_dtypes)
+                logging.info(f"Full refresh of the incremental store with {len(dataframe)} documents")
+            else:
+                # New documents are split on their own and appended to the stored
+                # splits, so rows never move between train and test.
+                state.start_incremental()
+                low_watermark=state.watermark
+                delta=None
+                # An unchanged watermark still re-reads the overlap window for
+                # documents that committed late.
+                if high_watermark is not None and high_watermark>=low_watermark:
+                    delta=self.export_dataframe(self.get_export_query(high_watermark,recent_ids,low_watermark,state.recent_ids))
+                if delta is not None and len(delta)>0:
+                    state.full_retrain=self.detect_delta_drift(delta,state.load_baseline())
+                    state.add_parts(*self.split_rows(delta),schema_dtypes=self.schema_dtypes)
+                else:
+                    state.full_retrain=False
+                logging.info(f"Pulled {0 if delta is None else len(delta)} new documents past watermark {low_watermark}, "
+                             f"full retrain: {state.full_retrain}")
+            state.set_watermark(high_watermark,recent_ids)
+
+            train_set=cast_to_schema_dtypes(state.read_parts("train",list(self.schema_dtypes)),self.schema_dtypes)
+            test_set=cast_to_schema_dtypes(state.read_parts("test",list(self.schema_dtypes)),self.schema_dtypes)
+            if config.deduplicate:
+                # Rows repeated across increments are merged again; the split
+                # by row keeps every copy in the same split.
+                train_set=deduplicate_rows(train_set,SAMPLE_WEIGHT_COLUMN)
+                test_set=deduplicate_rows(test_set,SAMPLE_WEIGHT_COLUMN)
+            if state.full_retrain:
+                # New baseline for drift checks of later increments: the rows
+                # this full retrain learns from.
+                dataframe=pd.concat([train_set,test_set],ignore_index=True)
+                state.stage_baseline(DriftBaseline.from_dataframe(dataframe[list(self.schema_dtypes)],
+                                                                  weights=get_sample_weight(dataframe,SAMPLE_WEIGHT_COLUMN)))
+            return train_set,test_set
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
     def export_data_into_feature_store(self,dataframe:pd.DataFrame):
 
         try:
             feature_store_filepath=self.data_ingestion_config.feature_store_file_path
-            dir_path=os.path.dirname(feature_store_filepath)
-            os.makedirs(dir_path,exist_ok=True)
-            dataframe.to_csv(feature_store_filepath,index=False,header=True)
+            self.artifact_writer.submit(write_feature_store,feature_store_filepath,dataframe,schema_dtypes=self.schema_dtypes)
             return dataframe
         
         except Exception as e:
@@ -59,15 +332,21 @@ class DataIngestion:
     def split_data(self,dataframe:pd.DataFrame):
 
         try:
-            train_set,test_set=train_test_split(dataframe,test_size=self.data_ingestion_config.train_test_split_ratio)
+            train_set,test_set=self.split_rows(dataframe)
             logging.info("Peformed Train Test Split")
+            self.export_splits(train_set,test_set)
+            return train_set,test_set
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def export_splits(self,train_set:pd.DataFrame,test_set:pd.DataFrame):
 
-            dir_path=os.path.dirname(self.data_ingestion_config.training_file_path)
-            os.makedirs(dir_path,exist_ok=True)
+        try:
             logging.info("Exporting the filepaths")
 
-            train_set.to_csv(self.data_ingestion_config.training_file_path,index=False,header=True)
-            test_set.to_csv(self.data_ingestion_config.testing_file_path,index=False,header=True)
+            self.artifact_writer.submit(write_feature_store,self.data_ingestion_config.training_file_path,train_set,schema_dtypes=self.schema_dtypes)
+            self.artifact_writer.submit(write_feature_store,self.data_ingestion_config.testing_file_path,test_set,schema_dtypes=self.schema_dtypes)
             logging.info("Exported the filepaths")
 
         except Exception as e:
@@ -76,12 +355,35 @@ class DataIngestion:
     def initiate_data_ingestion(self):
 
         try:
-            dataframe=self.export_collection_dataframe()
-            dataframe=self.export_data_into_feature_store(dataframe)
-            self.split_data(dataframe)
+            incremental=self.data_ingestion_config.ingestion_mode=="incremental" and self.incremental_state is not None
+            if incremental:
+                train_set,test_set=self.ingest_incremental()
+                data_fingerprint=StageCache.fingerprint(train=hash_dataframe(train_set),test=hash_dataframe(test_set))
+            else:
+                dataframe=self.export_dataframe()
+                data_fingerprint=hash_dataframe(dataframe)
+
+            stage_cache=StageCache(self.data_ingestion_config.stage_cache_dir,self.data_ingestion_config.stage_cache_enabled)
+            fingerprint=StageCache.fingerprint(data=data_fingerprint,
+                                               config=config_fingerprint(self.data_ingestion_config),
+                                               schema=hash_file(SCHEMA_FILE_PATH))
+            cached_artifact=stage_cache.get("data_ingestion",fingerprint)
+            if cached_artifact is not None:
+                return cached_artifact
+
+            if incremental:
+                self.export_data_into_feature_store(pd.concat([train_set,test_set],ignore_index=True))
+                self.export_splits(train_set,test_set)
+            else:
+                dataframe=self.export_data_into_feature_store(dataframe)
+                train_set,test_set=self.split_data(dataframe)
 
-            dataingestionartifact=DataIngestionArtifact(trained_file_path=self.data_ingestion_config.training_file_path,
-                                                        test_file_path=self.data_ingestion_config.testing_file_path)
+            persisted=self.artifact_writer.enabled
+            dataingestionartifact=DataIngestionArtifact(trained_file_path=self.data_ingestion_config.training_file_path if persisted else None,
+                                                        test_file_path=self.data_ingestion_config.testing_file_path if persisted else None,
+                                                        fingerprint=StageCache.fingerprint(train=hash_dataframe(train_set),test=hash_dataframe(test_set)),
+                                                        train_dataframe=train_set,test_dataframe=test_set)
+            self.artifact_writer.on_flush(stage_cache.put,"data_ingestion",fingerprint,dataingestionartifact)
             
             return dataingestionartifact
 
@@ -1,79 +1,168 @@
 import sys,os
+import copy
 import numpy as np
 import pandas as pd
 from sklearn.impute import KNNImputer
 from sklearn.pipeline import Pipeline
+from sklearn.utils.validation import has_fit_parameter
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
-from networksecurity.constants.training_pipeline import TARGET_COLUMN,DATA_TRANSFORMATION_IMPUTER_PARAMS
+from networksecurity.constants.training_pipeline import TARGET_COLUMN,SAMPLE_WEIGHT_COLUMN,DATA_TRANSFORMATION_IMPUTER_PARAMS,DATA_TRANSFORMATION_TERNARY_IMPUTER_PARAMS,SCHEMA_FILE_PATH
 from networksecurity.entity.artifact_entity import DataTransformationArtifact,DataValidationArtifact
 from networksecurity.entity.config_entity import DataTransformationConfig
-from networksecurity.utils.main_utils.utils import save_numpy_array,save_obj
+from networksecurity.utils.main_utils.utils import save_numpy_array,save_obj,load_obj,read_yaml_file,get_schema_dtypes,hash_file,hash_dataframe
+from networksecurity.utils.main_utils.artifact_writer import ArtifactWriter
+from networksecurity.utils.main_utils.stage_cache import StageCache,config_fingerprint
+from networksecurity.utils.main_utils.feature_store import read_feature_store,read_feature_store_columns
+from networksecurity.utils.main_utils.deduplication import get_sample_weight
+from networksecurity.utils.main_utils.incremental_state import IncrementalState
+from networksecurity.utils.ml_utils.models.ternary_imputer import TernaryKNNImputer
 
 class DataTransformation:
 
     def __init__(self,data_validation_artifact:DataValidationArtifact,
-                 data_transformation_config:DataTransformationConfig):
+                 data_transformation_config:DataTransformationConfig,
+                 artifact_writer:ArtifactWriter=None,
+                 incremental_state:IncrementalState=None):
         
         try:
             self.data_validation_artifact: DataValidationArtifact = data_validation_artifact
             self.data_tranformation_config: DataTransformationConfig = data_transformation_config
+            self.artifact_writer: ArtifactWriter = artifact_writer or ArtifactWriter()
+            self.incremental_state: IncrementalState = incremental_state
+            self.schema_dtypes=get_schema_dtypes(read_yaml_file(SCHEMA_FILE_PATH))
 
         except Exception as e:
             raise NetworkSecurityException(e,sys)
     
-    @staticmethod
-    def read_data(file_path) -> pd.DataFrame:
+    def read_data(self,file_path) -> pd.DataFrame:
 
         try:
-            return pd.read_csv(file_path)
+            columns=list(self.schema_dtypes)
+            if SAMPLE_WEIGHT_COLUMN in read_feature_store_columns(file_path):
+                columns.append(SAMPLE_WEIGHT_COLUMN)
+            return read_feature_store(file_path,columns=columns,schema_dtypes=self.schema_dtypes)
         
         except Exception as e:
             raise NetworkSecurityException(e,sys)
         
-    def get_data_transformer_object(cls) -> Pipeline:
+    def get_data_transformer_object(self) -> Pipeline:
 
         try:
-            imputer = KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS)
-            logging.info(f"Initialised KNN imputer with {DATA_TRANSFORMATION_IMPUTER_PARAMS}")
+            if self.data_tranformation_config.imputer_engine=="ternary":
+                imputer = TernaryKNNImputer(**DATA_TRANSFORMATION_TERNARY_IMPUTER_PARAMS)
+                logging.info(f"Initialised ternary KNN imputer with {DATA_TRANSFORMATION_TERNARY_IMPUTER_PARAMS}")
+            else:
+                imputer = KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS)
+                logging.info(f"Initialised KNN imputer with {DATA_TRANSFORMATION_IMPUTER_PARAMS}")
             processor: Pipeline = Pipeline([("imputer",imputer)])
             return processor
         
         except Exception as e:
             raise NetworkSecurityException(e,sys)
 
+    def fit_preprocessor(self,input_features_traindf:pd.DataFrame,sample_weight=None) -> Pipeline:
+
+        try:
+            # A warm-started run updates the previous imputer with the new rows
+            # when it can learn incrementally. KNNImputer cannot, but its fit
+            # only stores the rows, so refitting it on all of them is cheap.
+            state=self.incremental_state
+            if state is not None and state.warm_start and state.content.get("imputer_engine")==self.data_tranformation_config.imputer_engine:
+                previous=state.load_object("preprocessor")
+                if previous is not None and hasattr(previous.named_steps["imputer"],"partial_fit"):
+                    preprocessor=copy.deepcopy(previous)
+                    if state.new_train_set is not None and len(state.new_train_set):
+                        preprocessor.named_steps["imputer"].partial_fit(state.new_train_set[input_features_traindf.columns],
+                                                                        sample_weight=get_sample_weight(state.new_train_set,SAMPLE_WEIGHT_COLUMN))
+                    logging.info(f"Updated the previous preprocessor with {state.new_train_rows} new rows")
+                    return preprocessor
+            # Imputers that accept sample weights see deduplicated rows as the
+            # raw rows they stand for; KNNImputer uses each distinct row once.
+            preprocessor=self.get_data_transformer_object()
+            if sample_weight is not None and has_fit_parameter(preprocessor.named_steps["imputer"],"sample_weight"):
+                return preprocessor.fit(input_features_traindf,imputer__sample_weight=sample_weight)
+            return preprocessor.fit(input_features_traindf)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
     def initiate_data_tranformation(self) -> DataTransformationArtifact:
 
         try:
             logging.info("Starting Data Transformation")
-            train_df=DataTransformation.read_data(self.data_validation_artifact.valid_train_file_path)
-            test_df=DataTransformation.read_data(self.data_validation_artifact.valid_test_file_path)
+            train_df=self.data_validation_artifact.valid_train_dataframe
+            test_df=self.data_validation_artifact.valid_test_dataframe
+            in_memory=train_df is not None and test_df is not None
+
+            stage_cache=StageCache(self.data_tranformation_config.stage_cache_dir,self.data_tranformation_config.stage_cache_enabled)
+            # Warm-started results also depend on the state they started from.
+            state=self.incremental_state
+            data_fingerprint=self.data_validation_artifact.fingerprint
+            if data_fingerprint is None:
+                data_fingerprint=StageCache.fingerprint(train=hash_dataframe(train_df) if in_memory else hash_file(self.data_validation_artifact.valid_train_file_path),
+                                                        test=hash_dataframe(test_df) if in_memory else hash_file(self.data_validation_artifact.valid_test_file_path))
+            fingerprint=StageCache.fingerprint(data=data_fingerprint,
+                                               config=config_fingerprint(self.data_tranformation_config),
+                                               imputer=DATA_TRANSFORMATION_IMPUTER_PARAMS,
+                                               ternary_imputer=DATA_TRANSFORMATION_TERNARY_IMPUTER_PARAMS,
+                                               schema=hash_file(SCHEMA_FILE_PATH),
+                                               warm_start=state.generation if state is not None and state.warm_start else None)
+            cached_artifact=stage_cache.get("data_transformation",fingerprint)
+            if cached_artifact is not None:
+                if state is not None:
+                    state.stage_object("preprocessor",load_obj(cached_artifact.transformed_object_file_path),
+                                       imputer_engine=self.data_tranformation_config.imputer_engine)
+                return cached_artifact
 
-            input_features_traindf=train_df.drop(columns=[TARGET_COLUMN],axis=1)
+            if not in_memory:
+                train_df=self.read_data(self.data_validation_artifact.valid_train_file_path)
+                test_df=self.read_data(self.data_validation_artifact.valid_test_file_path)
+            train_weight=get_sample_weight(train_df,SAMPLE_WEIGHT_COLUMN)
+            test_weight=get_sample_weight(test_df,SAMPLE_WEIGHT_COLUMN)
+            train_df=train_df[list(self.schema_dtypes)]
+            test_df=test_df[list(self.schema_dtypes)]
+
+            input_features_traindf=train_df.drop(columns=[TARGET_COLUMN])
             target_feature_traindf=train_df[TARGET_COLUMN]
             target_feature_traindf= target_feature_traindf.replace(-1,0)
 
-            input_features_testdf=test_df.drop(columns=[TARGET_COLUMN],axis=1)
+            input_features_testdf=test_df.drop(columns=[TARGET_COLUMN])
             target_feature_testdf=test_df[TARGET_COLUMN]
             target_feature_testdf= target_feature_testdf.replace(-1,0)
 
-            preprocessor=self.get_data_transformer_object()
-            preprocessor_obj=preprocessor.fit(input_features_traindf)
+            preprocessor_obj=self.fit_preprocessor(input_features_traindf,sample_weight=train_weight)
+            if state is not None:
+                state.stage_object("preprocessor",preprocessor_obj,imputer_engine=self.data_tranformation_config.imputer_engine)
             transformed_input_train_feature=preprocessor_obj.transform(input_features_traindf)
             transformed_input_test_feature=preprocessor_obj.transform(input_features_testdf)
 
             train_arr = np.c_[transformed_input_train_feature,np.array(target_feature_traindf)]
             test_arr = np.c_[transformed_input_test_feature,np.array(target_feature_testdf)]
 
-            save_numpy_array(self.data_tranformation_config.transformed_train_file_path,array=train_arr)
-            save_numpy_array(self.data_tranformation_config.transformed_test_file_path,array=test_arr)
-            save_obj(self.data_tranformation_config.transformed_object_file_path,preprocessor_obj)
+            self.artifact_writer.submit(save_numpy_array,self.data_tranformation_config.transformed_train_file_path,array=train_arr)
+            self.artifact_writer.submit(save_numpy_array,self.data_tranformation_config.transformed_test_file_path,array=test_arr)
+            self.artifact_writer.submit(save_obj,self.data_tranformation_config.transformed_object_file_path,preprocessor_obj)
+            weighted=train_weight is not None and test_weight is not None
+            if weighted:
+                self.artifact_writer.submit(save_numpy_array,self.data_tranformation_config.transformed_train_weight_file_path,array=train_weight)
+                self.artifact_writer.submit(save_numpy_array,self.data_tranformation_config.transformed_test_weight_file_path,array=test_weight)
 
+            persisted=self.artifact_writer.enabled
             data_transformation_artifact=DataTransformationArtifact(
-                transformed_object_file_path=self.data_tranformation_config.transformed_object_file_path,
-                transformed_train_file_path=self.data_tranformation_config.transformed_train_file_path,
-                transformed_test_file_path=self.data_tranformation_config.transformed_test_file_path,
+                transformed_object_file_path=self.data_tranformation_config.transformed_object_file_path if persisted else None,
+                transformed_train_file_path=self.data_tranformation_config.transformed_train_file_path if persisted else None,
+                transformed_test_file_path=self.data_tranformation_config.transformed_test_file_path if persisted else None,
+                fingerprint=fingerprint,
+                transformed_train_weight_file_path=self.data_tranformation_config.transformed_train_weight_file_path if persisted and weighted else None,
+                transformed_test_weight_file_path=self.data_tranformation_config.transformed_test_weight_file_path if persisted and weighted else None,
+                transformed_object=preprocessor_obj,
+                transformed_train_array=train_arr,
+                transformed_test_array=test_arr,
+                transformed_train_weight=train_weight if weighted else None,
+                transformed_test_weight=test_weight if weighted else None
             )
+            self.artifact_writer.on_flush(stage_cache.put,"data_transformation",fingerprint,data_transformation_artifact)
             
             return data_transformation_artifact
         
@@ -3,9 +3,13 @@ from networksecurity.entity.artifact_entity import DataValidationArtifact
 from networksecurity.entity.config_entity import DataValidationConfig
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
-from networksecurity.constants.training_pipeline import SCHEMA_FILE_PATH
-from networksecurity.utils.main_utils.utils import read_yaml_file,write_yaml_file
-from scipy.stats import ks_2samp
+from networksecurity.constants.training_pipeline import SCHEMA_FILE_PATH,SAMPLE_WEIGHT_COLUMN
+from networksecurity.utils.main_utils.utils import read_yaml_file,write_yaml_file,get_schema_dtypes,hash_file,hash_dataframe
+from networksecurity.utils.main_utils.artifact_writer import ArtifactWriter
+from networksecurity.utils.main_utils.stage_cache import StageCache,config_fingerprint
+from networksecurity.utils.main_utils.feature_store import read_feature_store,read_feature_store_columns,write_feature_store
+from networksecurity.utils.main_utils.deduplication import get_sample_weight
+from networksecurity.utils.ml_utils.drift.discrete_drift import DriftBaseline
 import pandas as pd
 import os
 import sys
@@ -13,98 +17,143 @@ import sys
 class DataValidation:
 
     def __init__(self,data_ingestion_artifact:DataIngestionArtifact,
-                 data_validation_config:DataValidationConfig):
+                 data_validation_config:DataValidationConfig,
+                 artifact_writer:ArtifactWriter=None):
         
         try:
             self.data_ingestion_artifact=data_ingestion_artifact
             self.data_validation_config=data_validation_config
+            self.artifact_writer=artifact_writer or ArtifactWriter()
             self.schema_config=read_yaml_file(SCHEMA_FILE_PATH)
+            self.schema_dtypes=get_schema_dtypes(self.schema_config)
+            self.stage_cache=StageCache(data_validation_config.stage_cache_dir,data_validation_config.stage_cache_enabled)
+            # Set by lookup_cache.
+            self.fingerprint=None
+            self.cached_artifact=None
 
         except Exception as e:
             raise NetworkSecurityException(e,sys)
         
-    @staticmethod
-    def read_data(file_path) -> pd.DataFrame:
+    def read_data(self,file_path,columns=None,filters=None) -> pd.DataFrame:
 
         try:
-            return pd.read_csv(file_path)
+            return read_feature_store(file_path,columns=columns,filters=filters,schema_dtypes=self.schema_dtypes)
         
         except Exception as e:
             raise NetworkSecurityException(e,sys)
         
-    def validate_number_of_columns(self,dataframe:pd.DataFrame) -> bool:
+    def validate_number_of_columns(self,dataframe:pd.DataFrame=None,file_path:str=None) -> bool:
 
         try:
-            number_of_columns=len(self.schema_config)
+            # The column check only needs the file metadata, not the rows.
+            columns=dataframe.columns if dataframe is not None else read_feature_store_columns(file_path)
+            # The sample weight of deduplicated rows is not a schema column.
+            columns=[column for column in columns if column!=SAMPLE_WEIGHT_COLUMN]
+            number_of_columns=len(self.schema_dtypes)
             logging.info(f"Required number of columns: {number_of_columns}")
-            logging.info(f"Dataframe has {len(dataframe.columns)} columns")
-            if number_of_columns==len(dataframe.columns):
+            logging.info(f"Dataframe has {len(columns)} columns")
+            if number_of_columns==len(columns):
                 return True
             return False
         
         except Exception as e:
             raise NetworkSecurityException(e,sys)
         
-    def detect_dataset_drift(self,base_df,current_df,threshold=.05) -> bool:
+    def detect_dataset_drift(self,base_df=None,current_df=None,threshold=.05,baseline:DriftBaseline=None) -> bool:
 
         try:
-            status=True
-            report={}
-            for column in base_df.columns:
-                d1=base_df[column]
-                d2=current_df[column]
-                is_same_dist=ks_2samp(d1,d2)
-                if threshold<=is_same_dist.pvalue:
-                    is_found=False
-                else:
-                    is_found+True
-                    status=False
-                report.update({column:{"p_value":float(is_same_dist.pvalue),"drift_status":is_found}})
+            # Value counts for every column are computed in one vectorized pass;
+            # a precomputed baseline means the training rows are not scanned again.
+            # Deduplicated rows are counted with their weights, so the
+            # distributions are those of the raw rows.
+            if baseline is None:
+                baseline=DriftBaseline.from_dataframe(base_df.drop(columns=[SAMPLE_WEIGHT_COLUMN],errors="ignore"),
+                                                      weights=get_sample_weight(base_df,SAMPLE_WEIGHT_COLUMN))
+            status,report=baseline.compare(current_df,threshold=threshold,weights=get_sample_weight(current_df,SAMPLE_WEIGHT_COLUMN))
 
             drift_report_filepath= self.data_validation_config.drift_report_file_path
-            dir_path=os.path.dirname(drift_report_filepath)
-            os.makedirs(dir_path,exist_ok=True)
-
-            write_yaml_file(file_path=drift_report_filepath,content=report)
+            self.artifact_writer.submit(write_yaml_file,file_path=drift_report_filepath,content=report)
+            self.artifact_writer.submit(baseline.save,self.data_validation_config.drift_baseline_file_path)
+            return status
 
         except Exception as e:
             raise NetworkSecurityException(e,sys)
         
-    def initiate_data_validation(self)-> DataValidationArtifact:
+    def lookup_cache(self) -> DataValidationArtifact:
 
         try:
+            train_dataframe=self.data_ingestion_artifact.train_dataframe
+            test_dataframe=self.data_ingestion_artifact.test_dataframe
+            in_memory=train_dataframe is not None and test_dataframe is not None
+
+            data_fingerprint=self.data_ingestion_artifact.fingerprint
+            if data_fingerprint is None:
+                data_fingerprint=StageCache.fingerprint(train=hash_dataframe(train_dataframe) if in_memory else hash_file(self.data_ingestion_artifact.trained_file_path),
+                                                        test=hash_dataframe(test_dataframe) if in_memory else hash_file(self.data_ingestion_artifact.test_file_path))
+            self.fingerprint=StageCache.fingerprint(data=data_fingerprint,
+                                                    config=config_fingerprint(self.data_validation_config),
+                                                    schema=hash_file(SCHEMA_FILE_PATH))
+            self.cached_artifact=self.stage_cache.get("data_validation",self.fingerprint)
+            return self.cached_artifact
 
-            train_file_path=self.data_ingestion_artifact.trained_file_path
-            test_file_path=self.data_ingestion_artifact.test_file_path
-            train_dataframe=DataValidation.read_data(train_file_path)
-            test_dataframe=DataValidation.read_data(test_file_path)
-            
-            status=self.validate_number_of_columns(dataframe=train_dataframe)
-            if not status:
-                error_message=f"Train dataframe does not contain all columns \n"
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def validate_split(self,split:str) -> pd.DataFrame:
 
-            status=self.validate_number_of_columns(dataframe=test_dataframe)
+        try:
+            # Each split is checked and loaded on its own, so the pipeline can
+            # validate train and test side by side.
+            if split=="train":
+                dataframe,file_path=self.data_ingestion_artifact.train_dataframe,self.data_ingestion_artifact.trained_file_path
+            else:
+                dataframe,file_path=self.data_ingestion_artifact.test_dataframe,self.data_ingestion_artifact.test_file_path
+            status=self.validate_number_of_columns(dataframe=dataframe,file_path=file_path)
             if not status:
-                error_message=f"Test dataframe does not contain all columns \n"
+                logging.info(f"{split.capitalize()} dataframe does not contain all columns")
+            return dataframe if dataframe is not None else self.read_data(file_path)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def build_data_validation_artifact(self,train_dataframe:pd.DataFrame,test_dataframe:pd.DataFrame) -> DataValidationArtifact:
 
+        try:
             status=self.detect_dataset_drift(base_df=train_dataframe,current_df=test_dataframe)
-            dir_path=os.path.dirname(self.data_validation_config.valid_train_file_path)
-            os.makedirs(dir_path,exist_ok=True)
 
-            train_dataframe.to_csv(self.data_validation_config.valid_train_file_path,index=False,header=True)
-            test_dataframe.to_csv(self.data_validation_config.valid_test_file_path,index=False,header=True)
+            self.artifact_writer.submit(write_feature_store,self.data_validation_config.valid_train_file_path,train_dataframe,schema_dtypes=self.schema_dtypes)
+            self.artifact_writer.submit(write_feature_store,self.data_validation_config.valid_test_file_path,test_dataframe,schema_dtypes=self.schema_dtypes)
             
+            persisted=self.artifact_writer.enabled
             data_validation_artifact = DataValidationArtifact(
                 validation_status=status,
-                valid_train_file_path=self.data_ingestion_artifact.trained_file_path,
-                valid_test_file_path=self.data_ingestion_artifact.test_file_path,
+                valid_train_file_path=self.data_validation_config.valid_train_file_path if persisted else None,
+                valid_test_file_path=self.data_validation_config.valid_test_file_path if persisted else None,
                 invalid_train_file_path=None,
                 invalid_test_file_path=None,
-                drift_report_file_path= self.data_validation_config.drift_report_file_path
+                drift_report_file_path= self.data_validation_config.drift_report_file_path if persisted else None,
+                drift_baseline_file_path=self.data_validation_config.drift_baseline_file_path if persisted else None,
+                fingerprint=self.fingerprint,
+                valid_train_dataframe=train_dataframe,
+                valid_test_dataframe=test_dataframe
             )
+            self.artifact_writer.on_flush(self.stage_cache.put,"data_validation",self.fingerprint,data_validation_artifact)
 
             return data_validation_artifact
         
         except Exception as e:
             raise NetworkSecurityException(e,sys)
 
+    def initiate_data_validation(self)-> DataValidationArtifact:
+
+        try:
+            cached_artifact=self.lookup_cache()
+            if cached_artifact is not None:
+                return cached_artifact
+
+            train_dataframe=self.validate_split("train")
+            test_dataframe=self.validate_split("test")
+            return self.build_data_validation_artifact(train_dataframe,test_dataframe)
+        
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
@@ -1,4 +1,6 @@
 import os,sys
+import copy
+import numpy as np
 
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
@@ -6,47 +8,67 @@ from networksecurity.entity.artifact_entity import DataTransformationArtifact,Mo
 from networksecurity.entity.config_entity import ModelTrainerConfig
 
 from networksecurity.utils.ml_utils.models.estimator import NetworkModel
-from networksecurity.utils.main_utils.utils import save_obj,load_obj,load_numpy_array,evaluate_models
+from networksecurity.utils.ml_utils.models.compiled_trees import compile_tree_model
+from networksecurity.utils.main_utils.utils import save_obj,load_obj,load_numpy_array,evaluate_models,hash_file,hash_array,hash_obj
+from networksecurity.utils.main_utils.artifact_writer import ArtifactWriter
+from networksecurity.utils.main_utils.stage_cache import StageCache,config_fingerprint
+from networksecurity.utils.main_utils.incremental_state import IncrementalState
 from networksecurity.utils.ml_utils.metrics.classification_metric import get_classification_score
-
-from sklearn.linear_model import LogisticRegression
+from networksecurity.utils.ml_utils.search.parallel_search import ParallelSearchExecutor,fit_weighted
+from networksecurity.utils.ml_utils.search.budgeted_search import BudgetedSearchExecutor
+from networksecurity.utils.ml_utils.tracking.mlflow_tracker import MlflowTracker
+from networksecurity.utils.main_utils.stage_profiler import StageProfiler,resource_snapshot,resource_usage
+from networksecurity.utils.ml_utils.models.out_of_core import ChunkedHistGradientBoostingClassifier,fit_incremental,predict_in_chunks,iter_array_chunks
+
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid
+from sklearn.linear_model import LogisticRegression,SGDClassifier
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.ensemble import RandomForestClassifier,AdaBoostClassifier,GradientBoostingClassifier
-from sklearn.metrics import r2_score
-
-import mlflow
+from sklearn.metrics import r2_score,accuracy_score
 
 class ModelTrainer:
 
     def __init__(self,model_trainer_config:ModelTrainerConfig,
-                 data_transformation_artifact:DataTransformationArtifact):
+                 data_transformation_artifact:DataTransformationArtifact,
+                 artifact_writer:ArtifactWriter=None,
+                 tracker:MlflowTracker=None,
+                 profiler:StageProfiler=None,
+                 incremental_state:IncrementalState=None):
         
         try:
             self.model_trainer_config=model_trainer_config
             self.data_transformation_artifact=data_transformation_artifact
+            self.artifact_writer=artifact_writer or ArtifactWriter()
+            self.tracker=tracker or MlflowTracker()
+            self.profiler=profiler
+            self.incremental_state=incremental_state
+            self.tracking_run=None
 
         except Exception as e:
             raise NetworkSecurityException(e,sys)
         
-    def track_mlflow(self,best_model,classification_metric):
+    def track_mlflow(self,best_model_name,best_model,classification_train_metric,classification_test_metric):
 
         try:
-            with mlflow.start_run():
-                f1_score=classification_metric.f1_score
-                precision_score=classification_metric.precision_score
-                recall_score=classification_metric.recall_score
-
-                mlflow.log_metric("f1 score",f1_score)
-                mlflow.log_metric("precision score",precision_score)
-                mlflow.log_metric("recall score",recall_score)
-                mlflow.sklearn.log_model(best_model,"model")
+            # One run per training with both metric sets and a single copy of
+            # the model; the tracker logs it in the background.
+            metrics={}
+            for split,classification_metric in (("train",classification_train_metric),("test",classification_test_metric)):
+                metrics[f"{split} f1 score"]=classification_metric.f1_score
+                metrics[f"{split} precision score"]=classification_metric.precision_score
+                metrics[f"{split} recall score"]=classification_metric.recall_score
+
+            self.tracker.log_params(self.tracking_run,{"model":best_model_name,**best_model.get_params()})
+            self.tracker.log_metrics(self.tracking_run,metrics)
+            self.tracker.log_model(self.tracking_run,best_model,"model")
 
         except Exception as e:
             raise NetworkSecurityException(e,sys)
 
         
-    def train_model(self,x_train,y_train,x_test,y_test):
+    def get_model_grid(self):
 
         try:
 
@@ -84,8 +106,76 @@ class ModelTrainer:
                     }   
             }
 
+            return models,params
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def get_out_of_core_model_grid(self):
+
+        try:
+            # Learners that never need the whole training set in memory.
+            models={
+                "SGD Logistic Regression": SGDClassifier(loss="log_loss"),
+                "Histogram Boosting": ChunkedHistGradientBoostingClassifier()
+            }
+            params={
+                "SGD Logistic Regression":{
+                    'alpha':[1e-4,1e-5]
+                    },
+                "Histogram Boosting":{
+                    'max_depth':[3,5],
+                    'n_estimators':[50,100]
+                    }
+            }
+            return models,params
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def get_search_executor(self):
+
+        try:
+            config=self.model_trainer_config
+            if config.search_mode=="exhaustive":
+                return ParallelSearchExecutor(n_jobs=config.search_n_jobs,cv=config.search_cv,on_result=self.log_search_result)
+            if config.search_mode=="budgeted":
+                return BudgetedSearchExecutor(n_jobs=config.search_n_jobs,cv=config.search_cv,on_result=self.log_search_result,
+                                              factor=config.halving_factor,min_samples=config.halving_min_samples,
+                                              time_budget=config.family_time_budget,dominance_margin=config.dominance_margin)
+            raise ValueError(f"Unknown search mode: {config.search_mode}")
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def log_search_result(self,result:dict):
+
+        try:
+            logging.info(f"{result['model']} {result['params']}: mean score {result['mean_test_score']:.4f} "
+                         f"(std {result['std_test_score']:.4f}, fit {result['mean_fit_time']:.2f}s)")
+            if self.profiler is not None:
+                self.profiler.add_record("model_trainer.candidate",**result)
+            if self.tracking_run is not None and self.model_trainer_config.track_candidates:
+                # Each candidate becomes a child run of the training run.
+                child_run=self.tracker.start_run(run_name=result["model"],parent=self.tracking_run)
+                self.tracker.log_params(child_run,{"model":result["model"],**result["params"]})
+                self.tracker.log_metrics(child_run,{key:value for key,value in result.items()
+                                                    if isinstance(value,(int,float)) and not isinstance(value,bool)})
+                self.tracker.end_run(child_run)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def train_model(self,x_train,y_train,x_test,y_test,train_weight=None,test_weight=None):
+
+        try:
+
+            self.tracking_run=self.tracker.start_run(run_name="model_trainer")
+            models,params=self.get_model_grid()
             models_report: dict = evaluate_models(X_train=x_train,y_train=y_train,X_test=x_test,y_test=y_test,
-                                                  models=models,param=params)
+                                                  models=models,param=params,
+                                                  executor=self.get_search_executor(),
+                                                  sample_weight=train_weight,test_sample_weight=test_weight)
 
             best_model_score=max(sorted(models_report.values()))
             best_model_name=list(models_report.keys())[list(models_report.values()).index(best_model_score)]
@@ -93,26 +183,150 @@ class ModelTrainer:
             best_model=models[best_model_name]
             y_train_pred=best_model.predict(x_train)
             
-            classification_train_metric=get_classification_score(y_true=y_train,y_pred=y_train_pred)
-
-            self.track_mlflow(best_model,classification_train_metric)
+            classification_train_metric=get_classification_score(y_true=y_train,y_pred=y_train_pred,sample_weight=train_weight)
 
             y_test_pred=best_model.predict(x_test)
-            classification_test_metric=get_classification_score(y_true=y_test,y_pred=y_test_pred)
+            classification_test_metric=get_classification_score(y_true=y_test,y_pred=y_test_pred,sample_weight=test_weight)
 
-            self.track_mlflow(best_model,classification_test_metric)
+            return self.build_model_trainer_artifact(best_model_name,best_model,classification_train_metric,classification_test_metric)
 
-            preprocessor=load_obj(file_path=self.data_transformation_artifact.transformed_object_file_path)
+        except Exception as e:
+            if self.tracking_run is not None:
+                self.tracker.end_run(self.tracking_run,"FAILED")
+            raise NetworkSecurityException(e,sys)
 
-            model_dir_path=os.path.dirname(self.model_trainer_config.trained_model_file_path)
-            os.makedirs(model_dir_path,exist_ok=True)
+    def warm_start_model(self,model,x_train,y_train,train_weight=None):
 
-            Network_Model=NetworkModel(preprocessor=preprocessor,model=best_model)
-            save_obj(self.model_trainer_config.trained_model_file_path,obj=NetworkModel)
+        try:
+            params=model.get_params()
+            if "warm_start" not in params:
+                # Refitted with the parameters the last full search chose; only
+                # the search is skipped.
+                return fit_weighted(clone(model),x_train,y_train,train_weight)
+            # Ensembles keep their trees and add new ones fitted on all rows;
+            # linear models start the solver from the previous coefficients.
+            model=copy.deepcopy(model)
+            updates={"warm_start":True}
+            if "n_estimators" in params:
+                n_estimators=params["n_estimators"]
+                updates["n_estimators"]=n_estimators+max(1,round(n_estimators*self.model_trainer_config.warm_start_estimators_fraction))
+            model.set_params(**updates)
+            return fit_weighted(model,x_train,y_train,train_weight)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def train_model_warm_start(self,previous_model,x_train,y_train,x_test,y_test,train_weight=None,test_weight=None):
+
+        try:
+            state=self.incremental_state
+            self.tracking_run=self.tracker.start_run(run_name="model_trainer")
+            best_model_name=state.content.get("model_name") or type(previous_model.model).__name__
+            best_model=previous_model.model
+            if state.new_train_rows:
+                best_model=self.warm_start_model(best_model,x_train,y_train,train_weight)
+            logging.info(f"Warm started {best_model_name} with {state.new_train_rows} new training rows")
+
+            classification_train_metric=get_classification_score(y_true=y_train,y_pred=best_model.predict(x_train),sample_weight=train_weight)
+            classification_test_metric=get_classification_score(y_true=y_test,y_pred=best_model.predict(x_test),sample_weight=test_weight)
+
+            return self.build_model_trainer_artifact(best_model_name,best_model,classification_train_metric,classification_test_metric)
+
+        except Exception as e:
+            if self.tracking_run is not None:
+                self.tracker.end_run(self.tracking_run,"FAILED")
+            raise NetworkSecurityException(e,sys)
+
+    def fit_out_of_core(self,model,x_train,y_train,stop:int,classes,train_weight=None):
+
+        try:
+            config=self.model_trainer_config
+            if hasattr(model,"partial_fit"):
+                return fit_incremental(model,x_train,y_train,chunk_rows=config.out_of_core_chunk_rows,
+                                       epochs=config.out_of_core_epochs,classes=classes,stop=stop,sample_weight=train_weight)
+            # Row slices of a memory-mapped array are views, nothing is copied.
+            model.set_params(chunk_rows=config.out_of_core_chunk_rows)
+            return model.fit(x_train[:stop],y_train[:stop],sample_weight=None if train_weight is None else train_weight[:stop])
 
-            model_trainer_artifact=ModelTrainerArtifact(trained_model_file_path=self.model_trainer_config.trained_model_file_path,
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def train_model_out_of_core(self,x_train,y_train,x_test,y_test,train_weight=None,test_weight=None):
+
+        try:
+            config=self.model_trainer_config
+            chunk_rows=config.out_of_core_chunk_rows
+            self.tracking_run=self.tracker.start_run(run_name="model_trainer")
+            models,params=self.get_out_of_core_model_grid()
+            classes=np.unique(np.concatenate([np.unique(chunk) for _,chunk in iter_array_chunks(y_train,chunk_rows)]))
+
+            # Candidates train on the leading rows and are scored by accuracy on
+            # the held-out tail (rows were shuffled by the split), the same
+            # metric the in-memory search cross-validates; families are then
+            # compared on the test set as evaluate_models does.
+            n_fit=int(len(x_train)*(1-config.out_of_core_validation_fraction))
+            y_validation=np.asarray(y_train[n_fit:])
+            validation_weight=None if train_weight is None else np.asarray(train_weight[n_fit:])
+            models_report={}
+            for name,model in models.items():
+                best_score=None
+                for candidate_params in ParameterGrid(params[name]):
+                    candidate=clone(model).set_params(**candidate_params)
+                    start=resource_snapshot(reset_peak=False)
+                    self.fit_out_of_core(candidate,x_train,y_train,n_fit,classes,train_weight)
+                    usage=resource_usage(start)
+                    score=accuracy_score(y_validation,predict_in_chunks(candidate,x_train,chunk_rows,start=n_fit),sample_weight=validation_weight)
+                    self.log_search_result({"model":name,"params":candidate_params,"mean_test_score":float(score),
+                                            "std_test_score":0.0,"mean_fit_time":usage["wall_seconds"],
+                                            "cpu_seconds":usage["cpu_seconds"],"rows_in":n_fit,"rows_out":len(y_validation),
+                                            "read_bytes":usage["read_bytes"],"write_bytes":usage["write_bytes"],
+                                            "peak_rss_bytes":usage["peak_rss_bytes"]})
+                    if best_score is None or score>best_score:
+                        best_score,models[name]=score,candidate
+                models_report[name]=r2_score(np.asarray(y_test),predict_in_chunks(models[name],x_test,chunk_rows),sample_weight=test_weight)
+
+            best_model_name=max(models_report,key=models_report.get)
+            best_model=models[best_model_name]
+            logging.info(f"Out-of-core model report: {models_report}")
+
+            classification_train_metric=get_classification_score(y_true=np.asarray(y_train),y_pred=predict_in_chunks(best_model,x_train,chunk_rows),
+                                                                 sample_weight=train_weight)
+            classification_test_metric=get_classification_score(y_true=np.asarray(y_test),y_pred=predict_in_chunks(best_model,x_test,chunk_rows),
+                                                                sample_weight=test_weight)
+
+            return self.build_model_trainer_artifact(best_model_name,best_model,classification_train_metric,classification_test_metric)
+
+        except Exception as e:
+            if self.tracking_run is not None:
+                self.tracker.end_run(self.tracking_run,"FAILED")
+            raise NetworkSecurityException(e,sys)
+
+    def build_model_trainer_artifact(self,best_model_name,best_model,classification_train_metric,classification_test_metric):
+
+        try:
+            self.track_mlflow(best_model_name,best_model,classification_train_metric,classification_test_metric)
+            self.tracker.end_run(self.tracking_run)
+
+            preprocessor=self.data_transformation_artifact.transformed_object
+            if preprocessor is None:
+                preprocessor=load_obj(file_path=self.data_transformation_artifact.transformed_object_file_path)
+
+            compiled_model=None
+            if self.model_trainer_config.compile_tree_model:
+                compiled_model=compile_tree_model(best_model,ternary_lut_max_features=self.model_trainer_config.ternary_lut_max_features)
+                logging.info(f"Compiled {best_model_name} for flat-array inference: {compiled_model is not None}")
+
+            Network_Model=NetworkModel(preprocessor=preprocessor,model=best_model,compiled_model=compiled_model,
+                                       compiled_max_batch_rows=self.model_trainer_config.compiled_max_batch_rows)
+            self.artifact_writer.submit(save_obj,self.model_trainer_config.trained_model_file_path,obj=Network_Model)
+            if self.incremental_state is not None:
+                self.incremental_state.stage_object("model",Network_Model,model_name=best_model_name)
+
+            persisted=self.artifact_writer.enabled
+            model_trainer_artifact=ModelTrainerArtifact(trained_model_file_path=self.model_trainer_config.trained_model_file_path if persisted else None,
                                  train_metric_artifact=classification_train_metric,
-                                 test_metric_artifact=classification_test_metric)
+                                 test_metric_artifact=classification_test_metric,
+                                 trained_model=Network_Model)
 
             logging.info(f"Model Trainer Artifact: {model_trainer_artifact}")
             return model_trainer_artifact
@@ -126,9 +340,57 @@ class ModelTrainer:
 
             train_file_path= self.data_transformation_artifact.transformed_train_file_path
             test_file_path= self.data_transformation_artifact.transformed_test_file_path
-
-            train_arr=load_numpy_array(train_file_path)
-            test_arr=load_numpy_array(test_file_path)
+            train_arr=self.data_transformation_artifact.transformed_train_array
+            test_arr=self.data_transformation_artifact.transformed_test_array
+            train_weight=self.data_transformation_artifact.transformed_train_weight
+            test_weight=self.data_transformation_artifact.transformed_test_weight
+            train_weight_file_path=self.data_transformation_artifact.transformed_train_weight_file_path
+            test_weight_file_path=self.data_transformation_artifact.transformed_test_weight_file_path
+            preprocessor=self.data_transformation_artifact.transformed_object
+            in_memory=train_arr is not None and test_arr is not None and preprocessor is not None
+            out_of_core=self.model_trainer_config.training_mode=="out_of_core"
+
+            # Incremental runs without drift continue from the previous model
+            # instead of searching again; out-of-core training always searches.
+            state=self.incremental_state
+            previous_model=state.load_object("model") if state is not None and state.warm_start and not out_of_core else None
+            warm_start=previous_model is not None
+
+            models,params=self.get_out_of_core_model_grid() if out_of_core else self.get_model_grid()
+            stage_cache=StageCache(self.model_trainer_config.stage_cache_dir,self.model_trainer_config.stage_cache_enabled)
+            data_fingerprint=self.data_transformation_artifact.fingerprint
+            if data_fingerprint is None:
+                data_fingerprint=StageCache.fingerprint(train=hash_array(train_arr) if in_memory else hash_file(train_file_path),
+                                                        test=hash_array(test_arr) if in_memory else hash_file(test_file_path),
+                                                        preprocessor=hash_obj(preprocessor) if in_memory else hash_file(self.data_transformation_artifact.transformed_object_file_path),
+                                                        weights=[hash_array(train_weight),hash_array(test_weight)] if train_weight is not None
+                                                                else [hash_file(train_weight_file_path),hash_file(test_weight_file_path)] if train_weight_file_path else None)
+            fingerprint=StageCache.fingerprint(data=data_fingerprint,
+                                               config=config_fingerprint(self.model_trainer_config),
+                                               models={name:repr(model) for name,model in models.items()},
+                                               params=params,
+                                               warm_start=state.generation if warm_start else None)
+            cached_artifact=stage_cache.get("model_trainer",fingerprint)
+            if cached_artifact is not None:
+                if state is not None:
+                    state.stage_object("model",load_obj(cached_artifact.trained_model_file_path),model_name=state.content.get("model_name"))
+                return cached_artifact
+
+            if out_of_core and train_file_path is not None and test_file_path is not None:
+                # The transformed arrays are mapped rather than loaded, once any
+                # background writes of them have finished.
+                self.artifact_writer.flush()
+                train_arr=load_numpy_array(train_file_path,mmap_mode="r")
+                test_arr=load_numpy_array(test_file_path,mmap_mode="r")
+                if train_weight_file_path is not None:
+                    train_weight=load_numpy_array(train_weight_file_path,mmap_mode="r")
+                    test_weight=load_numpy_array(test_weight_file_path,mmap_mode="r")
+            elif not in_memory:
+                train_arr=load_numpy_array(train_file_path)
+                test_arr=load_numpy_array(test_file_path)
+                if train_weight_file_path is not None:
+                    train_weight=load_numpy_array(train_weight_file_path)
+                    test_weight=load_numpy_array(test_weight_file_path)
 
             x_train,y_train,x_test,y_test = (
                 train_arr[:,:-1],
@@ -137,7 +399,14 @@ class ModelTrainer:
                 test_arr[:,-1]
             )
 
-            model=self.train_model(x_train,y_train,x_test,y_test)
+            if warm_start:
+                model_trainer_artifact=self.train_model_warm_start(previous_model,x_train,y_train,x_test,y_test,train_weight,test_weight)
+            elif out_of_core:
+                model_trainer_artifact=self.train_model_out_of_core(x_train,y_train,x_test,y_test,train_weight,test_weight)
+            else:
+                model_trainer_artifact=self.train_model(x_train,y_train,x_test,y_test,train_weight,test_weight)
+            self.artifact_writer.on_flush(stage_cache.put,"model_trainer",fingerprint,model_trainer_artifact)
+            return model_trainer_artifact
 
         except Exception as e:
             raise NetworkSecurityException(e,sys)
\ No newline at end of file
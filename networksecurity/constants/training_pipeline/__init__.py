@@ -4,16 +4,40 @@ import numpy as np
 import pandas as pd
 
 TARGET_COLUMN= "Result"
+# Rows each deduplicated row stands for; not a feature.
+SAMPLE_WEIGHT_COLUMN: str = "sample_weight"
 PIPELINE_NAME : str = "Network Security"
 ARTIFACT_DIR: str = "Artifacts"
 FILE_NAME: str = "phisingData.csv"
 
 TRAIN_FILE_NAME: str = "train.csv"
 TEST_FILE_NAME: str = "test.csv"
+TRAIN_WEIGHT_FILE_NAME: str = "train_weight.npy"
+TEST_WEIGHT_FILE_NAME: str = "test_weight.npy"
+DATA_STORE_FORMAT: str = "parquet"
+STAGE_CACHE_DIR_NAME: str = "stage_cache"
+STAGE_CACHE_ENABLED: bool = True
+INCREMENTAL_STATE_DIR_NAME: str = "incremental_state"
+PERSIST_ARTIFACTS: bool = True
+ASYNC_ARTIFACT_PERSISTENCE: bool = True
+TRACKING_ENABLED: bool = True
+TRACKING_URI: str = None
+TRACKING_EXPERIMENT_NAME: str = "Network Security"
+PROFILING_ENABLED: bool = True
+PROFILING_CPROFILE: bool = False
+PROFILING_TRACEMALLOC: bool = False
+PROFILING_DIR_NAME: str = "profiling"
+PROFILING_REPORT_FILE_NAME: str = "stage_metrics.json"
+PIPELINE_EXECUTOR: str = "dag"
+PIPELINE_DAG_MAX_WORKERS: int = 2
+PIPELINE_DAG_MAX_RETRIES: int = 3
+PIPELINE_DAG_RETRY_BACKOFF_SECONDS: float = 2.
+PIPELINE_DAG_TIMELINE_FILE_NAME: str = "dag_timeline.json"
 
 SCHEMA_FILE_PATH = os.path.join("data_schema","schema.yaml")
 SAVED_MODEL_DIR= os.path.join("saved_models")
 MODEL_FILE_NAME ="model.pkl"
+PREDICTION_CACHE_SIZE: int = 100000
 
 DATA_INGESTION_COLLECTION_NAME: str = "Network_Data"
 DATA_INGESTION_DATABASE_NAME: str = "Whyrachit"
@@ -21,25 +45,72 @@ DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO: float = .2
+DATA_INGESTION_STREAMING_EXPORT: bool = True
+DATA_INGESTION_EXPORT_BATCH_SIZE: int = 10000
+DATA_INGESTION_EXPORT_TO_DISK: bool = False
+DATA_INGESTION_EXPORT_ARRAY_FILE_NAME: str = "phisingData.npy"
+DATA_INGESTION_DEDUPLICATE: bool = True
+DATA_INGESTION_MODE: str = "full"
+DATA_INGESTION_WATERMARK_FIELD: str = "_id"
+DATA_INGESTION_WATERMARK_OVERLAP_SECONDS: float = 60.0
+DATA_INGESTION_WATERMARK_MAX_RECENT_IDS: int = 10000
+DATA_INGESTION_FULL_REFRESH_DAYS: float = 7.0
+DATA_INGESTION_DRIFT_PSI_THRESHOLD: float = .1
 
 DATA_VALIDATION_DIR_NAME: str = "data_validation"
 DATA_VALIDATION_VALID_DIR: str = "validated"
 DATA_VALIDATION_INVALID_DIR: str = "invalid"
 DATA_VALIDATION_DRIFT_REPORT_DIR: str = "drift_report"
 DATA_VALIDATION_DRIFT_REPORT_FILE_NAME: str = "report.yaml"
+DATA_VALIDATION_DRIFT_BASELINE_FILE_NAME: str = "baseline.yaml"
 
 DATA_TRANSFORMATION_DIR_NAME: str = "data_transformation"
 DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR: str = "transformed"
 DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR:str = "transformed_object"
 PREPROCESSING_OBJECT_FILE_NAME:str = "preprocessing.pkl"
+DATA_TRANSFORMATION_IMPUTER_ENGINE: str = "knn"
 DATA_TRANSFORMATION_IMPUTER_PARAMS: dict = {
     'missing_values': np.nan,
     'n_neighbors': 3,
     "weights": 'uniform'
 }
+DATA_TRANSFORMATION_TERNARY_IMPUTER_PARAMS: dict = {
+    'missing_values': np.nan,
+    'n_neighbors': 3,
+    'n_jobs': -1
+}
 
 MODEL_TRAINER_DIR_NAME: str = "model_trainer"
 MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_model"
 MODEL_TRAINER_TRAINED_MODEL_NAME: str = "model.pkl"
 MODEL_TRAINER_EXPECTED_SCORE: float = 0.6
 MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD: float = 0.05
+MODEL_TRAINER_SEARCH_N_JOBS: int = -1
+MODEL_TRAINER_SEARCH_CV: int = 3
+MODEL_TRAINER_SEARCH_MODE: str = "exhaustive"
+MODEL_TRAINER_HALVING_FACTOR: int = 3
+MODEL_TRAINER_HALVING_MIN_SAMPLES: int = 1000
+MODEL_TRAINER_FAMILY_TIME_BUDGET: float = 600.0
+MODEL_TRAINER_DOMINANCE_MARGIN: float = 0.02
+MODEL_TRAINER_COMPILE_TREE_MODEL: bool = True
+MODEL_TRAINER_TERNARY_LUT_MAX_FEATURES: int = 8
+MODEL_TRAINER_COMPILED_MAX_BATCH_ROWS: int = 256
+MODEL_TRAINER_TRAINING_MODE: str = "in_memory"
+MODEL_TRAINER_OUT_OF_CORE_CHUNK_ROWS: int = 65536
+MODEL_TRAINER_OUT_OF_CORE_EPOCHS: int = 5
+MODEL_TRAINER_OUT_OF_CORE_VALIDATION_FRACTION: float = .1
+MODEL_TRAINER_TRACK_CANDIDATES: bool = True
+MODEL_TRAINER_WARM_START_ESTIMATORS_FRACTION: float = .25
+
+BATCH_PREDICTION_DIR_NAME: str = "prediction_output"
+BATCH_PREDICTION_OUTPUT_FILE_NAME: str = "output.csv"
+BATCH_PREDICTION_COLUMN_NAME: str = "predicted_column"
+BATCH_PREDICTION_CHUNK_SIZE: int = 100000
+BATCH_PREDICTION_N_WORKERS: int = -1
+BATCH_PREDICTION_INCLUDE_FEATURES: bool = True
+
+SCORING_SERVICE_HOST: str = "0.0.0.0"
+SCORING_SERVICE_PORT: int = 8000
+SCORING_SERVICE_MAX_BATCH_SIZE: int = 64
+SCORING_SERVICE_MAX_WAIT_MS: float = 2.0
+SCORING_SERVICE_MAX_BODY_BYTES: int = 8*2**20
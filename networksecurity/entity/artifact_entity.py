@@ -1,24 +1,48 @@
-from dataclasses import dataclass
+from dataclasses import dataclass,field
+from typing import Any,Optional
+
+# The fingerprint identifies the content an artifact points to, so downstream
+# stage caches do not need to rehash it. Live handles let the in-memory
+# pipeline pass data between stages without a write/read round trip; they are
+# never persisted or printed.
+def live_handle():
+    return field(default=None,repr=False,compare=False,metadata={"live_handle":True})
 
 @dataclass
 class DataIngestionArtifact:
-    trained_file_path:str
-    test_file_path:str
+    trained_file_path:Optional[str]
+    test_file_path:Optional[str]
+    fingerprint:Optional[str]=None
+    train_dataframe:Any=live_handle()
+    test_dataframe:Any=live_handle()
 
 @dataclass
 class DataValidationArtifact:
     validation_status: bool
-    valid_train_file_path: str
-    valid_test_file_path: str
+    valid_train_file_path: Optional[str]
+    valid_test_file_path: Optional[str]
     invalid_train_file_path: str
     invalid_test_file_path: str
     drift_report_file_path: str
+    drift_baseline_file_path: Optional[str]=None
+    fingerprint: Optional[str]=None
+    valid_train_dataframe: Any=live_handle()
+    valid_test_dataframe: Any=live_handle()
 
 @dataclass
 class DataTransformationArtifact:
-    transformed_object_file_path: str
-    transformed_train_file_path: str
-    transformed_test_file_path: str
+    transformed_object_file_path: Optional[str]
+    transformed_train_file_path: Optional[str]
+    transformed_test_file_path: Optional[str]
+    fingerprint: Optional[str]=None
+    # Present when rows were deduplicated; one weight per transformed row.
+    transformed_train_weight_file_path: Optional[str]=None
+    transformed_test_weight_file_path: Optional[str]=None
+    transformed_object: Any=live_handle()
+    transformed_train_array: Any=live_handle()
+    transformed_test_array: Any=live_handle()
+    transformed_train_weight: Any=live_handle()
+    transformed_test_weight: Any=live_handle()
 
 @dataclass
 class ClassificationMetricArtifact:
@@ -28,6 +52,14 @@ class ClassificationMetricArtifact:
 
 @dataclass
 class ModelTrainerArtifact:
-    trained_model_file_path: str
+    trained_model_file_path: Optional[str]
     train_metric_artifact: ClassificationMetricArtifact
-    test_metric_artifact: ClassificationMetricArtifact
\ No newline at end of file
+    test_metric_artifact: ClassificationMetricArtifact
+    trained_model: Any=live_handle()
+
+@dataclass
+class BatchPredictionArtifact:
+    prediction_file_path: str
+    n_rows: int
+    elapsed_seconds: float
+    rows_per_sec: float
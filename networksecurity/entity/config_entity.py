@@ -2,6 +2,9 @@ from datetime import datetime
 import os
 from networksecurity.constants import training_pipeline
 
+def with_data_store_format(file_name:str,data_store_format:str) -> str:
+    return f"{os.path.splitext(file_name)[0]}.{data_store_format}"
+
 class TrainingPipelineConfig:
 
     def __init__(self,timestamp=datetime.now()):
@@ -11,57 +14,125 @@ class TrainingPipelineConfig:
         self.artifact_name=training_pipeline.ARTIFACT_DIR
         self.artifact_dir=os.path.join(self.artifact_name,timestamp)
         self.timestamp: str=timestamp
+        self.stage_cache_dir: str=os.path.join(self.artifact_name,training_pipeline.STAGE_CACHE_DIR_NAME)
+        self.stage_cache_enabled: bool=training_pipeline.STAGE_CACHE_ENABLED
+        # "incremental" pulls only documents past the stored watermark and warm
+        # starts from the state kept in incremental_state_dir across runs.
+        self.ingestion_mode: str=training_pipeline.DATA_INGESTION_MODE
+        self.incremental_state_dir: str=os.path.join(self.artifact_name,training_pipeline.INCREMENTAL_STATE_DIR_NAME)
+        self.persist_artifacts: bool=training_pipeline.PERSIST_ARTIFACTS
+        self.async_artifact_persistence: bool=training_pipeline.ASYNC_ARTIFACT_PERSISTENCE
+        # None leaves the tracking store to MLflow (MLFLOW_TRACKING_URI).
+        self.tracking_enabled: bool=training_pipeline.TRACKING_ENABLED
+        self.tracking_uri: str=training_pipeline.TRACKING_URI
+        self.tracking_experiment_name: str=training_pipeline.TRACKING_EXPERIMENT_NAME
+        # cProfile and tracemalloc slow every stage down, so only the cheap
+        # resource counters are on by default.
+        self.profiling_enabled: bool=training_pipeline.PROFILING_ENABLED
+        self.profile_with_cprofile: bool=training_pipeline.PROFILING_CPROFILE
+        self.profile_with_tracemalloc: bool=training_pipeline.PROFILING_TRACEMALLOC
+        self.profiling_dir: str=os.path.join(self.artifact_dir,training_pipeline.PROFILING_DIR_NAME)
+        self.stage_metrics_file_path: str=os.path.join(self.profiling_dir,training_pipeline.PROFILING_REPORT_FILE_NAME)
+        # "dag" runs independent stages side by side and retries transient
+        # failures such as Mongo timeouts; "sequential" runs one stage after another.
+        self.pipeline_executor: str=training_pipeline.PIPELINE_EXECUTOR
+        self.dag_max_workers: int=training_pipeline.PIPELINE_DAG_MAX_WORKERS
+        self.dag_max_retries: int=training_pipeline.PIPELINE_DAG_MAX_RETRIES
+        self.dag_retry_backoff_seconds: float=training_pipeline.PIPELINE_DAG_RETRY_BACKOFF_SECONDS
+        self.dag_timeline_file_path: str=os.path.join(self.profiling_dir,training_pipeline.PIPELINE_DAG_TIMELINE_FILE_NAME)
 
 class DataIngestionConfig:
 
     def __init__(self,training_pipeline_config:TrainingPipelineConfig):
         
         self.data_ingestion_dir:str=os.path.join(training_pipeline_config.artifact_dir,training_pipeline.DATA_INGESTION_DIR_NAME)
+        self.stage_cache_dir: str = training_pipeline_config.stage_cache_dir
+        self.stage_cache_enabled: bool = training_pipeline_config.stage_cache_enabled
+        self.data_store_format: str = training_pipeline.DATA_STORE_FORMAT
 
-        self.feature_store_file_path: str = os.path.join(self.data_ingestion_dir, training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR, training_pipeline.FILE_NAME)
+        self.feature_store_file_path: str = os.path.join(self.data_ingestion_dir, training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR,
+            with_data_store_format(training_pipeline.FILE_NAME,self.data_store_format))
         
-        self.training_file_path: str = os.path.join(self.data_ingestion_dir, training_pipeline.DATA_INGESTION_INGESTED_DIR, training_pipeline.TRAIN_FILE_NAME)
+        self.training_file_path: str = os.path.join(self.data_ingestion_dir, training_pipeline.DATA_INGESTION_INGESTED_DIR,
+            with_data_store_format(training_pipeline.TRAIN_FILE_NAME,self.data_store_format))
         
-        self.testing_file_path: str = os.path.join(self.data_ingestion_dir, training_pipeline.DATA_INGESTION_INGESTED_DIR, training_pipeline.TEST_FILE_NAME)
+        self.testing_file_path: str = os.path.join(self.data_ingestion_dir, training_pipeline.DATA_INGESTION_INGESTED_DIR,
+            with_data_store_format(training_pipeline.TEST_FILE_NAME,self.data_store_format))
         
         self.train_test_split_ratio: float = training_pipeline.DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO
         self.collection_name: str = training_pipeline.DATA_INGESTION_COLLECTION_NAME
         self.database_name: str = training_pipeline.DATA_INGESTION_DATABASE_NAME
 
+        self.streaming_export: bool = training_pipeline.DATA_INGESTION_STREAMING_EXPORT
+        self.export_batch_size: int = training_pipeline.DATA_INGESTION_EXPORT_BATCH_SIZE
+        self.export_to_disk: bool = training_pipeline.DATA_INGESTION_EXPORT_TO_DISK
+        self.export_array_file_path: str = os.path.join(self.data_ingestion_dir, training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR, training_pipeline.DATA_INGESTION_EXPORT_ARRAY_FILE_NAME)
+
+        # Identical rows are collapsed into one row with a sample weight, and
+        # the split is decided per distinct row so duplicates never straddle it.
+        self.deduplicate: bool = training_pipeline.DATA_INGESTION_DEDUPLICATE
+        self.ingestion_mode: str = training_pipeline_config.ingestion_mode
+        self.watermark_field: str = training_pipeline.DATA_INGESTION_WATERMARK_FIELD
+        # With concurrent writers a document can commit after others with a
+        # higher watermark value; each run re-reads this window below the
+        # watermark and skips the documents it already ingested. Their ids are
+        # kept in the state, up to a limit beyond which the window is skipped.
+        self.watermark_overlap_seconds: float = training_pipeline.DATA_INGESTION_WATERMARK_OVERLAP_SECONDS
+        self.watermark_max_recent_ids: int = training_pipeline.DATA_INGESTION_WATERMARK_MAX_RECENT_IDS
+        # Incremental runs re-export everything and retrain from scratch on this
+        # schedule, or earlier when the new rows drift from the training data.
+        self.full_refresh_days: float = training_pipeline.DATA_INGESTION_FULL_REFRESH_DAYS
+        self.drift_psi_threshold: float = training_pipeline.DATA_INGESTION_DRIFT_PSI_THRESHOLD
+
 class DataValidationConfig:
 
     def __init__(self,training_pipeline_config:TrainingPipelineConfig):
 
         self.data_validation_dir: str = os.path.join( training_pipeline_config.artifact_dir, training_pipeline.DATA_VALIDATION_DIR_NAME)
+        self.stage_cache_dir: str = training_pipeline_config.stage_cache_dir
+        self.stage_cache_enabled: bool = training_pipeline_config.stage_cache_enabled
+        self.data_store_format: str = training_pipeline.DATA_STORE_FORMAT
 
         self.valid_data_dir: str = os.path.join(self.data_validation_dir, training_pipeline.DATA_VALIDATION_VALID_DIR)
         self.invalid_data_dir: str = os.path.join(self.data_validation_dir, training_pipeline.DATA_VALIDATION_INVALID_DIR)
         
-        self.valid_train_file_path: str = os.path.join(self.valid_data_dir, training_pipeline.TRAIN_FILE_NAME)
-        self.valid_test_file_path: str = os.path.join(self.valid_data_dir, training_pipeline.TEST_FILE_NAME)
+        self.valid_train_file_path: str = os.path.join(self.valid_data_dir, with_data_store_format(training_pipeline.TRAIN_FILE_NAME,self.data_store_format))
+        self.valid_test_file_path: str = os.path.join(self.valid_data_dir, with_data_store_format(training_pipeline.TEST_FILE_NAME,self.data_store_format))
         
-        self.invalid_train_file_path: str = os.path.join(self.invalid_data_dir, training_pipeline.TRAIN_FILE_NAME)
-        self.invalid_test_file_path: str = os.path.join(self.invalid_data_dir, training_pipeline.TEST_FILE_NAME)
+        self.invalid_train_file_path: str = os.path.join(self.invalid_data_dir, with_data_store_format(training_pipeline.TRAIN_FILE_NAME,self.data_store_format))
+        self.invalid_test_file_path: str = os.path.join(self.invalid_data_dir, with_data_store_format(training_pipeline.TEST_FILE_NAME,self.data_store_format))
         
         self.drift_report_file_path: str = os.path.join(
             self.data_validation_dir,
             training_pipeline.DATA_VALIDATION_DRIFT_REPORT_DIR,
             training_pipeline.DATA_VALIDATION_DRIFT_REPORT_FILE_NAME,
         )
+        self.drift_baseline_file_path: str = os.path.join(
+            self.data_validation_dir,
+            training_pipeline.DATA_VALIDATION_DRIFT_REPORT_DIR,
+            training_pipeline.DATA_VALIDATION_DRIFT_BASELINE_FILE_NAME,
+        )
 
 class DataTransformationConfig:
      
      def __init__(self,training_pipeline_config:TrainingPipelineConfig):
 
         self.data_transformation_dir: str = os.path.join( training_pipeline_config.artifact_dir,training_pipeline.DATA_TRANSFORMATION_DIR_NAME)
+        self.stage_cache_dir: str = training_pipeline_config.stage_cache_dir
+        self.stage_cache_enabled: bool = training_pipeline_config.stage_cache_enabled
 
         self.transformed_train_file_path: str = os.path.join( self.data_transformation_dir,training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
             training_pipeline.TRAIN_FILE_NAME.replace("csv", "npy"))
         self.transformed_test_file_path: str = os.path.join(self.data_transformation_dir,  training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
             training_pipeline.TEST_FILE_NAME.replace("csv", "npy"))
+        self.transformed_train_weight_file_path: str = os.path.join(self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+            training_pipeline.TRAIN_WEIGHT_FILE_NAME)
+        self.transformed_test_weight_file_path: str = os.path.join(self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+            training_pipeline.TEST_WEIGHT_FILE_NAME)
         
         self.transformed_object_file_path: str = os.path.join( self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR,
             training_pipeline.PREPROCESSING_OBJECT_FILE_NAME)
+        self.imputer_engine: str = training_pipeline.DATA_TRANSFORMATION_IMPUTER_ENGINE
 
 
 class ModelTrainerConfig:
@@ -69,6 +140,62 @@ class ModelTrainerConfig:
     def __init__(self,training_pipeline_config:TrainingPipelineConfig):
 
         self.model_trainer_dir: str = os.path.join(training_pipeline_config.artifact_dir, training_pipeline.MODEL_TRAINER_DIR_NAME)
+        self.stage_cache_dir: str = training_pipeline_config.stage_cache_dir
+        self.stage_cache_enabled: bool = training_pipeline_config.stage_cache_enabled
         self.trained_model_file_path: str = os.path.join(self.model_trainer_dir, training_pipeline.MODEL_TRAINER_TRAINED_MODEL_DIR, training_pipeline.MODEL_FILE_NAME)
         self.expected_accuracy: float = training_pipeline.MODEL_TRAINER_EXPECTED_SCORE
-        self.overfitting_underfitting_threshold = training_pipeline.MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD
\ No newline at end of file
+        self.overfitting_underfitting_threshold = training_pipeline.MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD
+        self.search_n_jobs: int = training_pipeline.MODEL_TRAINER_SEARCH_N_JOBS
+        self.search_cv: int = training_pipeline.MODEL_TRAINER_SEARCH_CV
+        self.search_mode: str = training_pipeline.MODEL_TRAINER_SEARCH_MODE
+        self.halving_factor: int = training_pipeline.MODEL_TRAINER_HALVING_FACTOR
+        self.halving_min_samples: int = training_pipeline.MODEL_TRAINER_HALVING_MIN_SAMPLES
+        self.family_time_budget: float = training_pipeline.MODEL_TRAINER_FAMILY_TIME_BUDGET
+        self.dominance_margin: float = training_pipeline.MODEL_TRAINER_DOMINANCE_MARGIN
+        self.compile_tree_model: bool = training_pipeline.MODEL_TRAINER_COMPILE_TREE_MODEL
+        self.ternary_lut_max_features: int = training_pipeline.MODEL_TRAINER_TERNARY_LUT_MAX_FEATURES
+        self.compiled_max_batch_rows: int = training_pipeline.MODEL_TRAINER_COMPILED_MAX_BATCH_ROWS
+        self.track_candidates: bool = training_pipeline.MODEL_TRAINER_TRACK_CANDIDATES
+        # "out_of_core" trains from memory-mapped arrays in chunks with
+        # incremental learners; candidates are scored on a held-out tail of the
+        # training rows instead of cross-validation.
+        self.training_mode: str = training_pipeline.MODEL_TRAINER_TRAINING_MODE
+        self.out_of_core_chunk_rows: int = training_pipeline.MODEL_TRAINER_OUT_OF_CORE_CHUNK_ROWS
+        self.out_of_core_epochs: int = training_pipeline.MODEL_TRAINER_OUT_OF_CORE_EPOCHS
+        self.out_of_core_validation_fraction: float = training_pipeline.MODEL_TRAINER_OUT_OF_CORE_VALIDATION_FRACTION
+        # Warm-started ensembles grow by this share of their trees per run.
+        self.warm_start_estimators_fraction: float = training_pipeline.MODEL_TRAINER_WARM_START_ESTIMATORS_FRACTION
+
+
+class BatchPredictionConfig:
+
+    def __init__(self,input_file_path:str=None,input_source:str=None,model_file_path:str=None,timestamp=datetime.now()):
+
+        timestamp=timestamp.strftime("%d_%m_%Y_%H_%M_%S")
+        # Input is a CSV or .npy file, or the ingestion Mongo collection when
+        # no file is given.
+        self.input_file_path: str = input_file_path
+        self.input_source: str = input_source or (os.path.splitext(input_file_path)[1].lstrip(".") if input_file_path else "mongo")
+        self.collection_name: str = training_pipeline.DATA_INGESTION_COLLECTION_NAME
+        self.database_name: str = training_pipeline.DATA_INGESTION_DATABASE_NAME
+        self.model_file_path: str = model_file_path or os.path.join(training_pipeline.SAVED_MODEL_DIR, training_pipeline.MODEL_FILE_NAME)
+        self.batch_prediction_dir: str = os.path.join(training_pipeline.BATCH_PREDICTION_DIR_NAME, timestamp)
+        self.prediction_file_path: str = os.path.join(self.batch_prediction_dir, training_pipeline.BATCH_PREDICTION_OUTPUT_FILE_NAME)
+        self.prediction_column: str = training_pipeline.BATCH_PREDICTION_COLUMN_NAME
+        self.chunk_size: int = training_pipeline.BATCH_PREDICTION_CHUNK_SIZE
+        self.n_workers: int = training_pipeline.BATCH_PREDICTION_N_WORKERS
+        self.include_features: bool = training_pipeline.BATCH_PREDICTION_INCLUDE_FEATURES
+        self.prediction_cache_size: int = training_pipeline.PREDICTION_CACHE_SIZE
+
+
+class ScoringServiceConfig:
+
+    def __init__(self,model_file_path:str=None,host:str=None,port:int=None):
+
+        self.model_file_path: str = model_file_path or os.path.join(training_pipeline.SAVED_MODEL_DIR, training_pipeline.MODEL_FILE_NAME)
+        self.host: str = host or training_pipeline.SCORING_SERVICE_HOST
+        self.port: int = training_pipeline.SCORING_SERVICE_PORT if port is None else port
+        self.max_batch_size: int = training_pipeline.SCORING_SERVICE_MAX_BATCH_SIZE
+        self.max_wait_ms: float = training_pipeline.SCORING_SERVICE_MAX_WAIT_MS
+        self.max_body_bytes: int = training_pipeline.SCORING_SERVICE_MAX_BODY_BYTES
+        self.prediction_cache_size: int = training_pipeline.PREDICTION_CACHE_SIZE
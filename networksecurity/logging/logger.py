@@ -1,15 +1,238 @@
 import logging
+import logging.handlers
 import os
+import copy
+import json
+import queue
+import atexit
+import threading
+import itertools
+import sys
+import time
 from datetime import datetime
 
 LOG_FILE=f"{datetime.now().strftime('%d_%m_%Y_%H_%M_%S')}.log"
-logs_path=os.path.join(os.getcwd(),"logs",LOG_FILE)
-os.makedirs(logs_path,exist_ok=True)
+LOGS_DIR=os.path.join(os.getcwd(),"logs")
+LOGS_FILE_PATH=os.path.join(LOGS_DIR,LOG_FILE)
 
-LOGS_FILE_PATH=os.path.join(logs_path,LOG_FILE)
+LOG_LEVEL: int = logging.INFO
+LOG_JSON: bool = True
+LOG_TEXT_FORMAT: str = "[%(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s"
+LOG_MAX_BYTES: int = 50*2**20
+LOG_BACKUP_COUNT: int = 5
+# Records waiting for the writer thread; beyond this they are dropped and
+# counted rather than making the caller wait.
+LOG_QUEUE_SIZE: int = 100000
+# Defaults for per-request and per-batch loggers.
+LOG_HOT_PATH_SAMPLE_RATE: float = .01
+LOG_HOT_PATH_MAX_PER_SECOND: float = 10.
 
-logging.basicConfig(
-    filename=LOGS_FILE_PATH,
-    format="[%(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO
-)
\ No newline at end of file
+# Attributes every LogRecord has; anything else came in through extra= and
+# becomes a field of the JSON record.
+RECORD_ATTRIBUTES=set(vars(logging.LogRecord("",0,"",0,"",(),None)))|{"message","asctime","taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+
+    def format(self,record:logging.LogRecord) -> str:
+
+        entry={"time":datetime.fromtimestamp(record.created).isoformat(timespec="microseconds"),
+               "level":record.levelname,"logger":record.name,"module":record.module,"line":record.lineno,
+               "process":record.process,"thread":record.threadName,"message":record.getMessage()}
+        entry.update((key,value) for key,value in vars(record).items() if key not in RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry["exception"]=self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"]=record.exc_text
+        return json.dumps(entry,default=str)
+
+
+class LazyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+
+    # The log directory and file are only created when the first record is
+    # written, so importing the package has no filesystem side effects.
+    # A handler that follows the path leaves rotation to another process and
+    # reopens the file whenever the path no longer names the open one.
+    follow_path=False
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename),exist_ok=True)
+        return super()._open()
+
+    def shouldRollover(self,record:logging.LogRecord) -> bool:
+
+        if self.follow_path and self.stream is not None:
+            try:
+                path_stat=os.stat(self.baseFilename)
+            except FileNotFoundError:
+                path_stat=None
+            stream_stat=os.fstat(self.stream.fileno())
+            if path_stat is None or (path_stat.st_dev,path_stat.st_ino)!=(stream_stat.st_dev,stream_stat.st_ino):
+                self.stream.close()
+                self.stream=self._open()
+        return super().shouldRollover(record)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+
+    def __init__(self,log_queue:queue.Queue):
+
+        super().__init__(log_queue)
+        self.dropped=0
+
+    def prepare(self,record:logging.LogRecord) -> logging.LogRecord:
+
+        # Only the message and any traceback are rendered on the caller's
+        # thread, since arguments may change after the call; extra fields
+        # travel on the record and formatting happens on the writer thread.
+        record=copy.copy(record)
+        record.message=record.getMessage()
+        record.msg,record.args=record.message,None
+        if record.exc_info:
+            record.exc_text=record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info=None
+        if self.dropped:
+            record.dropped_records,self.dropped=self.dropped,0
+        return record
+
+    def enqueue(self,record:logging.LogRecord):
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped+=1
+
+
+class SamplingFilter(logging.Filter):
+
+    def __init__(self,sample_rate:float):
+
+        # Every n-th record per call site below WARNING is kept; warnings and
+        # errors always pass. The rate travels on the record so counts can be
+        # scaled back up.
+        super().__init__()
+        self.sample_rate=sample_rate
+        self.every=max(1,round(1/sample_rate)) if sample_rate>0 else 0
+        self.counters={}
+
+    def filter(self,record:logging.LogRecord) -> bool:
+
+        if record.levelno>=logging.WARNING or self.every==1:
+            return True
+        if not self.every:
+            return False
+        key=(record.pathname,record.lineno)
+        counter=self.counters.get(key)
+        if counter is None:
+            counter=self.counters.setdefault(key,itertools.count())
+        if next(counter)%self.every:
+            return False
+        record.sample_rate=self.sample_rate
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+
+    def __init__(self,max_per_second:float,burst:int=None):
+
+        # A token bucket per call site, so an error repeated on every request
+        # is written a few times a second, with the number suppressed since
+        # the last record that got through.
+        super().__init__()
+        self.max_per_second=max_per_second
+        self.burst=burst or max(1,int(max_per_second))
+        self.buckets={}
+        self.lock=threading.Lock()
+
+    def filter(self,record:logging.LogRecord) -> bool:
+
+        key=(record.pathname,record.lineno)
+        now=time.monotonic()
+        with self.lock:
+            tokens,updated,suppressed=self.buckets.get(key,(self.burst,now,0))
+            tokens=min(self.burst,tokens+(now-updated)*self.max_per_second)
+            if tokens<1:
+                self.buckets[key]=(tokens,now,suppressed+1)
+                return False
+            self.buckets[key]=(tokens-1,now,0)
+        if suppressed:
+            record.suppressed=suppressed
+        return True
+
+
+_backend={"listener":None,"handler":None,"file_handler":None}
+
+
+def configure_logging(log_file_path:str=LOGS_FILE_PATH,level:int=LOG_LEVEL,json_format:bool=LOG_JSON,
+                      max_bytes:int=LOG_MAX_BYTES,backup_count:int=LOG_BACKUP_COUNT,queue_size:int=LOG_QUEUE_SIZE,
+                      file_handler:logging.Handler=None):
+
+    # Callers only put records on a queue; a listener thread formats them and
+    # does the file I/O, including size-based rotation, so neither scoring nor
+    # training ever waits on the disk for a log line.
+    # file_handler replaces the rotating log file, e.g. in benchmarks.
+    shutdown_logging()
+    if file_handler is None:
+        file_handler=LazyRotatingFileHandler(log_file_path,maxBytes=max_bytes,backupCount=backup_count,delay=True)
+    file_handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(LOG_TEXT_FORMAT))
+    handler=NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    listener=logging.handlers.QueueListener(handler.queue,file_handler,respect_handler_level=True)
+    root=logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(level)
+    listener.start()
+    _backend.update(listener=listener,handler=handler,file_handler=file_handler)
+    return listener
+
+
+def shutdown_logging():
+
+    # Writes out whatever is still queued.
+    listener,handler,file_handler=_backend["listener"],_backend["handler"],_backend["file_handler"]
+    if listener is not None:
+        listener.stop()
+        logging.getLogger().removeHandler(handler)
+        file_handler.close()
+    _backend.update(listener=None,handler=None,file_handler=None)
+
+
+def get_hot_path_logger(name:str,sample_rate:float=LOG_HOT_PATH_SAMPLE_RATE,
+                        max_per_second:float=LOG_HOT_PATH_MAX_PER_SECOND) -> logging.Logger:
+
+    # For per-request and per-batch call sites: info records are sampled and
+    # every level is rate limited. The filters run before the record is
+    # queued, so suppressed records cost a counter update.
+    logger=logging.getLogger(name)
+    if not any(isinstance(log_filter,(SamplingFilter,RateLimitFilter)) for log_filter in logger.filters):
+        logger.addFilter(SamplingFilter(sample_rate))
+        logger.addFilter(RateLimitFilter(max_per_second))
+    return logger
+
+
+def _restart_after_fork():
+
+    # A forked worker inherits the queue but not the listener thread, and the
+    # queue's lock may have been held at fork time. The child gets its own
+    # queue and listener and appends to the same file; only the parent
+    # rotates, and the child reopens the path once it has.
+    handler,file_handler=_backend["handler"],_backend["file_handler"]
+    if handler is None:
+        return
+    if isinstance(file_handler,logging.handlers.RotatingFileHandler):
+        file_handler.maxBytes=0
+    if isinstance(file_handler,LazyRotatingFileHandler):
+        file_handler.follow_path=True
+    handler.queue=queue.Queue(maxsize=handler.queue.maxsize)
+    listener=logging.handlers.QueueListener(handler.queue,file_handler,respect_handler_level=True)
+    listener.start()
+    _backend["listener"]=listener
+    # Pool workers leave through os._exit, which skips atexit.
+    multiprocessing_util=sys.modules.get("multiprocessing.util")
+    if multiprocessing_util is not None:
+        multiprocessing_util.Finalize(None,shutdown_logging,exitpriority=0)
+
+
+configure_logging()
+atexit.register(shutdown_logging)
+if hasattr(os,"register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
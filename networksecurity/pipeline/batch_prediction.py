@@ -0,0 +1,205 @@
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.entity.config_entity import BatchPredictionConfig
+from networksecurity.entity.artifact_entity import BatchPredictionArtifact
+from networksecurity.pipeline.inference import get_feature_columns,load_model
+from networksecurity.utils.main_utils.model_artifact import is_model_artifact,verify_model_artifact
+from networksecurity.utils.ml_utils.models.prediction_cache import PredictionCache
+
+# Each worker process loads the model once in its initializer and keeps it
+# here for every chunk it scores.
+_worker_model=None
+
+
+def init_worker(model_file_path:str,prediction_cache_size:int=0,verify:bool=True):
+
+    global _worker_model
+    _worker_model=load_model(model_file_path,prediction_cache_size,verify)
+
+
+def predict_chunk(features:pd.DataFrame) -> np.ndarray:
+
+    return _worker_model.predict(features)
+
+
+class BatchPrediction:
+
+    def __init__(self,batch_prediction_config:BatchPredictionConfig,mongo_client=None):
+
+        try:
+            self.batch_prediction_config=batch_prediction_config
+            self.mongo_client=mongo_client
+            self.feature_columns=get_feature_columns()
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def to_features(self,values:np.ndarray) -> pd.DataFrame:
+
+        try:
+            return pd.DataFrame(np.asarray(values,dtype=np.float64),columns=self.feature_columns)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def iter_csv_chunks(self,file_path:str):
+
+        try:
+            chunk_size=self.batch_prediction_config.chunk_size
+            for chunk in pd.read_csv(file_path,usecols=self.feature_columns,chunksize=chunk_size,na_values=["na"]):
+                yield self.to_features(chunk[self.feature_columns].apply(pd.to_numeric,errors="coerce"))
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def iter_npy_chunks(self,file_path:str):
+
+        try:
+            # Memory-mapped, so only the chunk being handed out is resident.
+            # Arrays exported with the target column keep it last; it is dropped.
+            values=np.load(file_path,mmap_mode="r")
+            n_features=len(self.feature_columns)
+            if values.ndim!=2 or values.shape[1] not in (n_features,n_features+1):
+                raise ValueError(f"Expected {n_features} feature columns in {file_path}, got shape {values.shape}")
+            chunk_size=self.batch_prediction_config.chunk_size
+            for start in range(0,len(values),chunk_size):
+                yield self.to_features(values[start:start+chunk_size,:n_features])
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def iter_mongo_chunks(self):
+
+        try:
+            if self.mongo_client is None:
+                # Only Mongo input needs the driver and ingestion settings;
+                # file inputs score without importing them.
+                import pymongo
+                from networksecurity.components.data_ingestion import MONGO_DB_URL
+                self.mongo_client=pymongo.MongoClient(MONGO_DB_URL)
+            config=self.batch_prediction_config
+            collection=self.mongo_client[config.database_name][config.collection_name]
+            projection={"_id":0}
+            projection.update({column:1 for column in self.feature_columns})
+            cursor=collection.find({},projection=projection,batch_size=config.chunk_size)
+
+            records=[]
+            for document in cursor:
+                records.append(document)
+                if len(records)==config.chunk_size:
+                    yield self.records_to_features(records)
+                    records=[]
+            if records:
+                yield self.records_to_features(records)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def records_to_features(self,records:list) -> pd.DataFrame:
+
+        try:
+            from networksecurity.components.data_ingestion import DataIngestion
+            values,missing=DataIngestion.records_to_array(records,self.feature_columns,np.float64)
+            values[missing]=np.nan
+            return self.to_features(values)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def iter_input_chunks(self):
+
+        try:
+            config=self.batch_prediction_config
+            if config.input_source=="csv":
+                return self.iter_csv_chunks(config.input_file_path)
+            if config.input_source=="npy":
+                return self.iter_npy_chunks(config.input_file_path)
+            if config.input_source=="mongo":
+                return self.iter_mongo_chunks()
+            raise ValueError(f"Unsupported batch prediction input: {config.input_source}")
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def write_chunk(self,file_obj,features:pd.DataFrame,predictions:np.ndarray,header:bool):
+
+        try:
+            config=self.batch_prediction_config
+            output=features if config.include_features else pd.DataFrame(index=features.index)
+            output=output.assign(**{config.prediction_column:predictions})
+            output.to_csv(file_obj,header=header,index=False)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def get_n_workers(self) -> int:
+
+        try:
+            n_workers=self.batch_prediction_config.n_workers
+            if n_workers is None or n_workers<0:
+                return os.cpu_count() or 1
+            return max(1,n_workers)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def initiate_batch_prediction(self) -> BatchPredictionArtifact:
+
+        try:
+            config=self.batch_prediction_config
+            n_workers=self.get_n_workers()
+            os.makedirs(os.path.dirname(config.prediction_file_path),exist_ok=True)
+            start=time.perf_counter()
+            n_rows=0
+
+            with open(config.prediction_file_path,"w",newline="") as file_obj:
+                if n_workers==1:
+                    model=load_model(config.model_file_path,config.prediction_cache_size)
+                    for features in self.iter_input_chunks():
+                        self.write_chunk(file_obj,features,model.predict(features),header=n_rows==0)
+                        n_rows+=len(features)
+                    if isinstance(model,PredictionCache):
+                        logging.info(f"Prediction cache: {model.stats()}")
+                else:
+                    # At most two chunks per worker are in flight, which bounds
+                    # memory, and results are written in input order as soon
+                    # as the oldest outstanding chunk is done.
+                    # The artifact is checked once here; workers then only map
+                    # it, sharing its pages instead of each hashing a copy.
+                    if is_model_artifact(config.model_file_path):
+                        verify_model_artifact(config.model_file_path)
+                    pending=deque()
+                    with ProcessPoolExecutor(max_workers=n_workers,initializer=init_worker,
+                                             initargs=(config.model_file_path,config.prediction_cache_size,False)) as executor:
+                        for features in self.iter_input_chunks():
+                            pending.append((features,executor.submit(predict_chunk,features)))
+                            if len(pending)>=2*n_workers:
+                                done_features,future=pending.popleft()
+                                self.write_chunk(file_obj,done_features,future.result(),header=n_rows==0)
+                                n_rows+=len(done_features)
+                        while pending:
+                            done_features,future=pending.popleft()
+                            self.write_chunk(file_obj,done_features,future.result(),header=n_rows==0)
+                            n_rows+=len(done_features)
+
+            elapsed_seconds=time.perf_counter()-start
+            rows_per_sec=n_rows/elapsed_seconds if elapsed_seconds>0 else 0.0
+            batch_prediction_artifact=BatchPredictionArtifact(prediction_file_path=config.prediction_file_path,
+                                                              n_rows=n_rows,
+                                                              elapsed_seconds=elapsed_seconds,
+                                                              rows_per_sec=rows_per_sec)
+            logging.info(f"Scored {n_rows} rows with {n_workers} workers at {rows_per_sec:.0f} rows/sec")
+            logging.info(f"Batch Prediction Artifact: {batch_prediction_artifact}")
+            return batch_prediction_artifact
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
@@ -0,0 +1,198 @@
+import os
+import sys
+import json
+import time
+import threading
+from datetime import datetime
+from dataclasses import dataclass,field
+from typing import Any,Callable,Dict
+from concurrent.futures import ThreadPoolExecutor,FIRST_COMPLETED,wait
+
+from pymongo import errors as mongo_errors
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+# Failures worth another attempt: the database being briefly unreachable or
+# slow, not a bug in the stage.
+TRANSIENT_ERRORS=(mongo_errors.ConnectionFailure,mongo_errors.ExecutionTimeout,mongo_errors.WTimeoutError,
+                  TimeoutError,ConnectionError)
+
+
+def iter_error_chain(error:BaseException):
+
+    # Stages wrap every error in NetworkSecurityException, so the original
+    # one is looked for along the chain of wrapped and chained exceptions.
+    seen=set()
+    while error is not None and id(error) not in seen:
+        yield error
+        seen.add(id(error))
+        wrapped=getattr(error,"error_message",None)
+        error=wrapped if isinstance(wrapped,BaseException) else error.__cause__ or error.__context__
+
+
+def is_transient(error:BaseException) -> bool:
+    return any(isinstance(cause,TRANSIENT_ERRORS) for cause in iter_error_chain(error))
+
+
+def root_error(error:BaseException) -> BaseException:
+
+    for cause in iter_error_chain(error):
+        error=cause
+    return error
+
+
+@dataclass
+class StageNode:
+    name:str
+    fn:Callable
+    # Parameter of fn -> name of the node whose output it receives.
+    inputs:Dict[str,str]=field(default_factory=dict)
+    # Artifact entity the node returns, checked when it finishes.
+    output:Any=None
+    max_retries:int=0
+    retry_backoff_seconds:float=1.
+
+
+class StageDAG:
+
+    def __init__(self,max_workers:int=2,max_retries:int=0,retry_backoff_seconds:float=1.):
+
+        try:
+            # Nodes run on threads once all their inputs exist. Outputs are kept,
+            # so a retried node, or a later run() after a failure, starts from
+            # the finished upstream outputs instead of rerunning those stages.
+            self.max_workers=max_workers
+            self.max_retries=max_retries
+            self.retry_backoff_seconds=retry_backoff_seconds
+            self.nodes={}
+            self.results={}
+            self.timeline=[]
+            self.started=None
+            self.lock=threading.Lock()
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def add_node(self,name:str,fn:Callable,inputs:Dict[str,str]=None,output=None,max_retries:int=None) -> StageNode:
+
+        try:
+            if name in self.nodes:
+                raise ValueError(f"Duplicate node {name}")
+            node=StageNode(name=name,fn=fn,inputs=dict(inputs or {}),output=output,
+                           max_retries=self.max_retries if max_retries is None else max_retries,
+                           retry_backoff_seconds=self.retry_backoff_seconds)
+            self.nodes[name]=node
+            return node
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def topological_order(self) -> list:
+
+        try:
+            for node in self.nodes.values():
+                missing=[upstream for upstream in node.inputs.values() if upstream not in self.nodes]
+                if missing:
+                    raise ValueError(f"Node {node.name} depends on unknown nodes {missing}")
+            order,state=[],{}
+            def visit(name,path):
+                if state.get(name)=="done":
+                    return
+                if state.get(name)=="visiting":
+                    raise ValueError(f"Cycle between nodes {path+[name]}")
+                state[name]="visiting"
+                for upstream in self.nodes[name].inputs.values():
+                    visit(upstream,path+[name])
+                state[name]="done"
+                order.append(name)
+            for name in self.nodes:
+                visit(name,[])
+            return order
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def record(self,node:StageNode,attempt:int,status:str,start:float=None,error:BaseException=None):
+
+        end=time.perf_counter()
+        start=end if start is None else start
+        entry={"node":node.name,"attempt":attempt,"status":status,
+               "start_seconds":round(start-self.started,6),"end_seconds":round(end-self.started,6),
+               "wall_seconds":round(end-start,6),"thread":threading.current_thread().name,
+               "error":None if error is None else repr(root_error(error))}
+        with self.lock:
+            self.timeline.append(entry)
+        if status!="skipped":
+            logging.info(f"DAG node {node.name} attempt {attempt} {status} after {entry['wall_seconds']:.2f}s")
+
+    def run_node(self,node:StageNode,kwargs:dict):
+
+        attempt=0
+        while True:
+            attempt+=1
+            start=time.perf_counter()
+            try:
+                result=node.fn(**kwargs)
+                if node.output is not None and not isinstance(result,node.output):
+                    raise TypeError(f"Node {node.name} returned {type(result).__name__}, expected {node.output.__name__}")
+            except Exception as e:
+                if attempt>node.max_retries or not is_transient(e):
+                    self.record(node,attempt,"failed",start,e)
+                    raise
+                self.record(node,attempt,"retrying",start,e)
+                time.sleep(node.retry_backoff_seconds*2**(attempt-1))
+                continue
+            self.record(node,attempt,"completed",start)
+            return result
+
+    def run(self) -> dict:
+
+        try:
+            self.topological_order()
+            self.started=self.started or time.perf_counter()
+            waiting={name:set(node.inputs.values())-set(self.results) for name,node in self.nodes.items() if name not in self.results}
+            error=None
+            with ThreadPoolExecutor(max_workers=self.max_workers,thread_name_prefix="stage-dag") as executor:
+                running={}
+                while True:
+                    if error is None:
+                        for name in [name for name,upstream in waiting.items() if not upstream]:
+                            del waiting[name]
+                            node=self.nodes[name]
+                            kwargs={parameter:self.results[upstream] for parameter,upstream in node.inputs.items()}
+                            running[executor.submit(self.run_node,node,kwargs)]=name
+                    if not running:
+                        break
+                    done,_=wait(running,return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name=running.pop(future)
+                        try:
+                            self.results[name]=future.result()
+                        except Exception as e:
+                            # Nodes already running finish; nothing new starts.
+                            error=error or e
+                            continue
+                        for upstream in waiting.values():
+                            upstream.discard(name)
+            for name in waiting:
+                self.record(self.nodes[name],0,"skipped")
+            if error is not None:
+                raise error
+            return self.results
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def write_timeline(self,file_path:str) -> str:
+
+        try:
+            os.makedirs(os.path.dirname(file_path),exist_ok=True)
+            with open(file_path,"w") as file_obj:
+                json.dump({"created_at":datetime.now().isoformat(),"max_workers":self.max_workers,"nodes":self.timeline},
+                          file_obj,indent=2)
+            logging.info(f"DAG timeline written to {file_path}")
+            return file_path
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
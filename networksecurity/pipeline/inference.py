@@ -0,0 +1,66 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.constants.training_pipeline import SCHEMA_FILE_PATH,TARGET_COLUMN
+from networksecurity.utils.main_utils.utils import read_yaml_file,get_schema_dtypes,load_obj
+from networksecurity.utils.ml_utils.models.prediction_cache import PredictionCache
+
+# Entry point for scoring processes. Everything here must stay importable
+# without the training, search, tracking and ingestion modules (mlflow,
+# pymongo, dotenv, model selection); benchmarks/check_import_time.py fails
+# when that regresses. Importing heavier modules belongs inside functions.
+
+
+def get_feature_columns() -> list:
+
+    try:
+        schema_dtypes=get_schema_dtypes(read_yaml_file(SCHEMA_FILE_PATH))
+        return [column for column in schema_dtypes if column!=TARGET_COLUMN]
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def load_model(model_file_path:str,prediction_cache_size:int=0,verify:bool=True):
+
+    try:
+        if prediction_cache_size>0:
+            return PredictionCache(model_file_path,max_entries=prediction_cache_size,verify=verify)
+        return load_obj(model_file_path,verify=verify)
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def validate_record(record,feature_columns:list) -> str:
+
+    # Why a record cannot be scored, or None. Missing features are imputed
+    # like missing values; unknown features and non-numeric values are not.
+    if not isinstance(record,dict):
+        return "Expected a JSON object of feature values"
+    unknown=sorted(set(record)-set(feature_columns))
+    if unknown:
+        return f"Unknown features {unknown[:5]}"
+    for name,value in record.items():
+        if value is None:
+            continue
+        if isinstance(value,bool) or not isinstance(value,(int,float,str)):
+            return f"Feature {name} must be a number, got {type(value).__name__}"
+        try:
+            float(value)
+        except ValueError:
+            return f"Feature {name} must be a number, got {value!r}"
+    return None
+
+
+def records_to_features(records:list,feature_columns:list) -> pd.DataFrame:
+
+    try:
+        features=pd.DataFrame.from_records(records,columns=feature_columns)
+        return features.apply(pd.to_numeric,errors="coerce").astype(np.float64)
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
@@ -0,0 +1,186 @@
+import sys
+import json
+import time
+import asyncio
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging,get_hot_path_logger
+from networksecurity.entity.config_entity import ScoringServiceConfig
+from networksecurity.pipeline.inference import get_feature_columns,load_model,records_to_features,validate_record
+from networksecurity.utils.main_utils.micro_batcher import MicroBatcher
+from networksecurity.utils.ml_utils.models.prediction_cache import PredictionCache
+
+# Per-request records are sampled and rate limited.
+request_logger=get_hot_path_logger("networksecurity.scoring_service.request")
+
+HTTP_REASONS={200:"OK",400:"Bad Request",404:"Not Found",405:"Method Not Allowed",413:"Payload Too Large",
+              500:"Internal Server Error"}
+
+
+class ScoringService:
+
+    def __init__(self,scoring_service_config:ScoringServiceConfig):
+
+        try:
+            self.scoring_service_config=scoring_service_config
+            self.feature_columns=get_feature_columns()
+            # Loaded once at startup and shared by every request.
+            self.model=load_model(scoring_service_config.model_file_path,scoring_service_config.prediction_cache_size)
+            self.prediction_cache=self.model if isinstance(self.model,PredictionCache) else None
+            self.batcher=MicroBatcher(self.predict_records,
+                                      max_batch_size=scoring_service_config.max_batch_size,
+                                      max_wait_seconds=scoring_service_config.max_wait_ms/1000)
+            self.server=None
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def predict_records(self,records:list) -> list:
+
+        try:
+            return self.model.predict(records_to_features(records,self.feature_columns)).tolist()
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    async def handle_request(self,method:str,path:str,body:bytes):
+
+        if path=="/health":
+            health={"status":"ok","batches":self.batcher.batches,"records":self.batcher.records}
+            if self.prediction_cache is not None:
+                health["prediction_cache"]=self.prediction_cache.stats()
+            return 200,health
+        if path!="/predict":
+            return 404,{"error":f"Unknown path {path}"}
+        if method!="POST":
+            return 405,{"error":"Use POST"}
+        try:
+            payload=json.loads(body or b"null")
+        except ValueError as e:
+            return 400,{"error":f"Invalid JSON: {e}"}
+        if isinstance(payload,dict) and isinstance(payload.get("records"),list):
+            # Clients that already hold a batch skip the queue.
+            for index,record in enumerate(payload["records"]):
+                error=validate_record(record,self.feature_columns)
+                if error is not None:
+                    return 400,{"error":f"Record {index}: {error}"}
+            predictions=await asyncio.get_running_loop().run_in_executor(None,self.predict_records,payload["records"])
+            return 200,{"predictions":predictions}
+        # Checked before queueing, so a bad record never fails the micro-batch
+        # it would have shared with other clients.
+        error=validate_record(payload,self.feature_columns)
+        if error is not None:
+            return 400,{"error":error}
+        return 200,{"prediction":await self.batcher.submit(payload)}
+
+    @staticmethod
+    async def write_response(writer:asyncio.StreamWriter,status:int,response:dict,keep_alive:bool):
+
+        payload=json.dumps(response).encode()
+        writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(payload)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()+payload)
+        await writer.drain()
+
+    def parse_head(self,head:bytes):
+
+        # Request line, headers and body length, or a (status, error) to
+        # answer with before closing the connection.
+        lines=head.decode("latin-1").split("\r\n")
+        parts=lines[0].split(" ")
+        if len(parts)!=3 or not parts[2].startswith("HTTP/"):
+            return None,(400,{"error":"Malformed request line"})
+        headers={}
+        for line in lines[1:]:
+            if ":" in line:
+                name,value=line.split(":",1)
+                headers[name.strip().lower()]=value.strip()
+        content_length=headers.get("content-length","0")
+        if not content_length.isdigit():
+            return None,(400,{"error":"Invalid Content-Length"})
+        if int(content_length)>self.scoring_service_config.max_body_bytes:
+            return None,(413,{"error":f"Body larger than {self.scoring_service_config.max_body_bytes} bytes"})
+        return (parts[0],parts[1],headers,int(content_length)),None
+
+    async def handle_connection(self,reader:asyncio.StreamReader,writer:asyncio.StreamWriter):
+
+        try:
+            # Minimal HTTP/1.1 with keep-alive: one JSON request per message.
+            while True:
+                try:
+                    head=await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError,ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.write_response(writer,400,{"error":"Request head too large"},keep_alive=False)
+                    break
+                request,rejection=self.parse_head(head)
+                if rejection is not None:
+                    # The body was not read, so the connection cannot be reused.
+                    await self.write_response(writer,*rejection,keep_alive=False)
+                    break
+                method,path,headers,content_length=request
+                body=await reader.readexactly(content_length)
+
+                start=time.perf_counter()
+                try:
+                    status,response=await self.handle_request(method,path,body)
+                except Exception as e:
+                    request_logger.error(f"Scoring request failed: {e}")
+                    status,response=500,{"error":str(e)}
+                request_logger.info("Scored request",extra={"method":method,"path":path,"status":status,
+                                                            "latency_ms":(time.perf_counter()-start)*1000})
+                keep_alive=headers.get("connection","keep-alive").lower()!="close"
+                await self.write_response(writer,status,response,keep_alive)
+                if not keep_alive:
+                    break
+        except Exception as e:
+            request_logger.error(f"Scoring connection failed: {e}")
+        finally:
+            writer.close()
+
+    async def start(self):
+
+        try:
+            await self.batcher.start()
+            config=self.scoring_service_config
+            self.server=await asyncio.start_server(self.handle_connection,config.host,config.port)
+            logging.info(f"Scoring service listening on {config.host}:{config.port}")
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    async def stop(self):
+
+        try:
+            if self.server is not None:
+                self.server.close()
+                await self.server.wait_closed()
+                self.server=None
+            await self.batcher.stop()
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    async def serve_forever(self):
+
+        try:
+            await self.start()
+            try:
+                await self.server.serve_forever()
+            finally:
+                await self.stop()
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def run(self):
+
+        try:
+            asyncio.run(self.serve_forever())
+
+        except KeyboardInterrupt:
+            logging.info("Scoring service stopped")
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
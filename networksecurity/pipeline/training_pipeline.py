@@ -0,0 +1,248 @@
+import sys
+from functools import partial
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.components.data_validation import DataValidation
+from networksecurity.components.data_tranformation import DataTransformation
+from networksecurity.components.model_trainer import ModelTrainer
+
+from networksecurity.entity.config_entity import (
+    TrainingPipelineConfig,
+    DataIngestionConfig,
+    DataValidationConfig,
+    DataTransformationConfig,
+    ModelTrainerConfig,
+)
+from networksecurity.entity.artifact_entity import (
+    DataIngestionArtifact,
+    DataValidationArtifact,
+    DataTransformationArtifact,
+    ModelTrainerArtifact,
+)
+from networksecurity.utils.main_utils.artifact_writer import ArtifactWriter
+from networksecurity.utils.ml_utils.tracking.mlflow_tracker import MlflowTracker
+from networksecurity.utils.main_utils.stage_profiler import StageProfiler
+from networksecurity.utils.main_utils.incremental_state import IncrementalState
+from networksecurity.pipeline.dag import StageDAG
+from networksecurity.constants.training_pipeline import DATA_STORE_FORMAT
+
+
+def count_rows(*handles) -> int:
+
+    # Live handles are gone when a stage came from the stage cache.
+    if any(handle is None for handle in handles):
+        return None
+    return sum(len(handle) for handle in handles)
+
+
+class TrainingPipeline:
+
+    # Benchmarks swap in a trainer with a smaller model grid.
+    model_trainer_class=ModelTrainer
+
+    def __init__(self,training_pipeline_config:TrainingPipelineConfig=None,mongo_client=None):
+
+        try:
+            self.training_pipeline_config=training_pipeline_config or TrainingPipelineConfig()
+            self.mongo_client=mongo_client
+            # Stages hand DataFrames and arrays to each other through the live
+            # handles on their artifacts; files are written off the critical path.
+            self.artifact_writer=ArtifactWriter(enabled=self.training_pipeline_config.persist_artifacts,
+                                                asynchronous=self.training_pipeline_config.async_artifact_persistence)
+            self.tracker=MlflowTracker(tracking_uri=self.training_pipeline_config.tracking_uri,
+                                       experiment_name=self.training_pipeline_config.tracking_experiment_name,
+                                       enabled=self.training_pipeline_config.tracking_enabled)
+            self.profiler=StageProfiler(self.training_pipeline_config.stage_metrics_file_path,
+                                        profile_dir=self.training_pipeline_config.profiling_dir,
+                                        enabled=self.training_pipeline_config.profiling_enabled,
+                                        capture_cprofile=self.training_pipeline_config.profile_with_cprofile,
+                                        capture_tracemalloc=self.training_pipeline_config.profile_with_tracemalloc)
+            self.incremental_state=None
+            if self.training_pipeline_config.ingestion_mode=="incremental":
+                self.incremental_state=IncrementalState(self.training_pipeline_config.incremental_state_dir,data_store_format=DATA_STORE_FORMAT)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def start_data_ingestion(self) -> DataIngestionArtifact:
+
+        try:
+            data_ingestion_config=DataIngestionConfig(self.training_pipeline_config)
+            logging.info("Initiate the data ingestion")
+            with self.profiler.profile("data_ingestion") as record:
+                data_ingestion=DataIngestion(data_ingestion_config,mongo_client=self.mongo_client,artifact_writer=self.artifact_writer,
+                                             incremental_state=self.incremental_state)
+                data_ingestion_artifact=data_ingestion.initiate_data_ingestion()
+                record["rows_out"]=count_rows(data_ingestion_artifact.train_dataframe,data_ingestion_artifact.test_dataframe)
+                if self.incremental_state is not None:
+                    record.update(ingestion_mode=self.incremental_state.mode,full_retrain=self.incremental_state.full_retrain,
+                                  new_train_rows=self.incremental_state.new_train_rows)
+            logging.info(f"Data Ingestion Completed: {data_ingestion_artifact}")
+            return data_ingestion_artifact
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def start_data_validation(self,data_ingestion_artifact:DataIngestionArtifact) -> DataValidationArtifact:
+
+        try:
+            data_validation_config=DataValidationConfig(self.training_pipeline_config)
+            logging.info("Initiate the data validation")
+            with self.profiler.profile("data_validation") as record:
+                data_validation=DataValidation(data_ingestion_artifact,data_validation_config,artifact_writer=self.artifact_writer)
+                data_validation_artifact=data_validation.initiate_data_validation()
+                record["rows_in"]=count_rows(data_ingestion_artifact.train_dataframe,data_ingestion_artifact.test_dataframe)
+                record["rows_out"]=count_rows(data_validation_artifact.valid_train_dataframe,data_validation_artifact.valid_test_dataframe)
+            logging.info(f"Data Validation Completed: {data_validation_artifact}")
+            return data_validation_artifact
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def prepare_data_validation(self,data_ingestion_artifact:DataIngestionArtifact) -> DataValidation:
+
+        try:
+            data_validation_config=DataValidationConfig(self.training_pipeline_config)
+            logging.info("Initiate the data validation")
+            # Each validation node is its own record in the stage metrics; the
+            # train and test records overlap and say so.
+            with self.profiler.profile("data_validation.lookup_cache") as record:
+                data_validation=DataValidation(data_ingestion_artifact,data_validation_config,artifact_writer=self.artifact_writer)
+                record["cache_hit"]=data_validation.lookup_cache() is not None
+            return data_validation
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def validate_split(self,data_validation:DataValidation,split:str):
+
+        try:
+            if data_validation.cached_artifact is not None:
+                return None
+            with self.profiler.profile(f"data_validation.{split}") as record:
+                dataframe=data_validation.validate_split(split)
+                record["rows_out"]=len(dataframe)
+            return dataframe
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def finish_data_validation(self,data_ingestion_artifact:DataIngestionArtifact,data_validation:DataValidation,
+                               train_dataframe=None,test_dataframe=None) -> DataValidationArtifact:
+
+        try:
+            with self.profiler.profile("data_validation") as record:
+                data_validation_artifact=data_validation.cached_artifact
+                if data_validation_artifact is None:
+                    data_validation_artifact=data_validation.build_data_validation_artifact(train_dataframe,test_dataframe)
+                record["rows_in"]=count_rows(data_ingestion_artifact.train_dataframe,data_ingestion_artifact.test_dataframe)
+                record["rows_out"]=count_rows(data_validation_artifact.valid_train_dataframe,data_validation_artifact.valid_test_dataframe)
+            logging.info(f"Data Validation Completed: {data_validation_artifact}")
+            return data_validation_artifact
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def start_data_transformation(self,data_validation_artifact:DataValidationArtifact) -> DataTransformationArtifact:
+
+        try:
+            data_transformation_config=DataTransformationConfig(self.training_pipeline_config)
+            logging.info("Initiate the data transformation")
+            with self.profiler.profile("data_transformation") as record:
+                data_transformation=DataTransformation(data_validation_artifact,data_transformation_config,artifact_writer=self.artifact_writer,
+                                                       incremental_state=self.incremental_state)
+                data_transformation_artifact=data_transformation.initiate_data_tranformation()
+                record["rows_in"]=count_rows(data_validation_artifact.valid_train_dataframe,data_validation_artifact.valid_test_dataframe)
+                record["rows_out"]=count_rows(data_transformation_artifact.transformed_train_array,data_transformation_artifact.transformed_test_array)
+            logging.info(f"Data Transformation Completed: {data_transformation_artifact}")
+            return data_transformation_artifact
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def start_model_trainer(self,data_transformation_artifact:DataTransformationArtifact) -> ModelTrainerArtifact:
+
+        try:
+            model_trainer_config=ModelTrainerConfig(self.training_pipeline_config)
+            logging.info("Initiate Model Training")
+            with self.profiler.profile("model_trainer") as record:
+                model_trainer=self.model_trainer_class(model_trainer_config,data_transformation_artifact,artifact_writer=self.artifact_writer,
+                                           tracker=self.tracker,profiler=self.profiler,incremental_state=self.incremental_state)
+                model_trainer_artifact=model_trainer.initiate_model_trainer()
+                record["rows_in"]=count_rows(data_transformation_artifact.transformed_train_array,data_transformation_artifact.transformed_test_array)
+            logging.info(f"Model Training Completed: {model_trainer_artifact}")
+            return model_trainer_artifact
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def build_stage_dag(self) -> StageDAG:
+
+        try:
+            # The train and test splits are validated side by side; drift needs
+            # both. The model searches already fan out over a process pool
+            # inside model_trainer. Only transient errors are retried, and a
+            # retry reuses the outputs of the nodes upstream of it.
+            config=self.training_pipeline_config
+            dag=StageDAG(max_workers=config.dag_max_workers,max_retries=config.dag_max_retries,
+                         retry_backoff_seconds=config.dag_retry_backoff_seconds)
+            dag.add_node("data_ingestion",self.start_data_ingestion,output=DataIngestionArtifact)
+            dag.add_node("data_validation.setup",self.prepare_data_validation,
+                         inputs={"data_ingestion_artifact":"data_ingestion"},output=DataValidation)
+            for split in ("train","test"):
+                dag.add_node(f"data_validation.{split}",partial(self.validate_split,split=split),
+                             inputs={"data_validation":"data_validation.setup"})
+            dag.add_node("data_validation",self.finish_data_validation,
+                         inputs={"data_ingestion_artifact":"data_ingestion","data_validation":"data_validation.setup",
+                                 "train_dataframe":"data_validation.train","test_dataframe":"data_validation.test"},
+                         output=DataValidationArtifact)
+            dag.add_node("data_transformation",self.start_data_transformation,
+                         inputs={"data_validation_artifact":"data_validation"},output=DataTransformationArtifact)
+            dag.add_node("model_trainer",self.start_model_trainer,
+                         inputs={"data_transformation_artifact":"data_transformation"},output=ModelTrainerArtifact)
+            return dag
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def run_stage_dag(self) -> ModelTrainerArtifact:
+
+        try:
+            dag=self.build_stage_dag()
+            try:
+                return dag.run()["model_trainer"]
+            finally:
+                if self.profiler.enabled:
+                    dag.write_timeline(self.training_pipeline_config.dag_timeline_file_path)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def run_pipeline(self) -> ModelTrainerArtifact:
+
+        try:
+            try:
+                if self.training_pipeline_config.pipeline_executor=="dag":
+                    model_trainer_artifact=self.run_stage_dag()
+                else:
+                    data_ingestion_artifact=self.start_data_ingestion()
+                    data_validation_artifact=self.start_data_validation(data_ingestion_artifact)
+                    data_transformation_artifact=self.start_data_transformation(data_validation_artifact)
+                    model_trainer_artifact=self.start_model_trainer(data_transformation_artifact)
+            finally:
+                # Waiting for background artifact writes is recorded as its own
+                # stage; the writes themselves overlap the stages above.
+                with self.profiler.profile("artifact_flush"):
+                    self.artifact_writer.close()
+                self.tracker.close()
+                self.profiler.write_report()
+            # The watermark only moves once every stage and write succeeded.
+            if self.incremental_state is not None:
+                self.incremental_state.commit()
+            return model_trainer_artifact
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
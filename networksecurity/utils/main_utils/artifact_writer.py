@@ -0,0 +1,77 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+
+class ArtifactWriter:
+
+    def __init__(self,enabled:bool=True,asynchronous:bool=False,max_workers:int=2):
+
+        try:
+            self.enabled=enabled
+            self.asynchronous=asynchronous
+            self.max_workers=max_workers
+            self.executor=None
+            self.futures=[]
+            self.flush_callbacks=[]
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def submit(self,fn,*args,**kwargs):
+
+        try:
+            if not self.enabled:
+                return None
+            if not self.asynchronous:
+                return fn(*args,**kwargs)
+            if self.executor is None:
+                self.executor=ThreadPoolExecutor(max_workers=self.max_workers,thread_name_prefix="artifact-writer")
+            future=self.executor.submit(fn,*args,**kwargs)
+            self.futures.append(future)
+            return future
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def on_flush(self,fn,*args,**kwargs):
+
+        try:
+            # Callbacks such as stage cache entries must only run once every
+            # file they point to has been written.
+            if not self.enabled:
+                return None
+            if not self.asynchronous:
+                return fn(*args,**kwargs)
+            self.flush_callbacks.append((fn,args,kwargs))
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def flush(self):
+
+        try:
+            futures,self.futures=self.futures,[]
+            errors=[future.exception() for future in futures]
+            errors=[error for error in errors if error is not None]
+            callbacks,self.flush_callbacks=self.flush_callbacks,[]
+            if errors:
+                raise errors[0]
+            for fn,args,kwargs in callbacks:
+                fn(*args,**kwargs)
+            if futures:
+                logging.info(f"Flushed {len(futures)} artifact writes")
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def close(self):
+
+        try:
+            self.flush()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(wait=True)
+                self.executor=None
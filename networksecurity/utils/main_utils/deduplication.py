@@ -0,0 +1,95 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+TERNARY_CODES: int = 4
+ROW_KEY_MAX_COLUMNS: int = 32
+_SPLITMIX_INCREMENT=np.uint64(0x9E3779B97F4A7C15)
+_SPLITMIX_MULTIPLIERS=(np.uint64(0xBF58476D1CE4E5B9),np.uint64(0x94D049BB133111EB))
+
+
+def row_keys(dataframe: pd.DataFrame) -> np.ndarray:
+
+    try:
+        # Rows of up to 32 ternary cells pack losslessly into 64 bits, two bits
+        # per cell with the fourth code for a missing value, so equal keys are
+        # equal rows. Anything else falls back to pandas' 64-bit row hash.
+        if dataframe.shape[1]<=ROW_KEY_MAX_COLUMNS:
+            keys=np.zeros(len(dataframe),dtype=np.uint64)
+            for position,column in enumerate(dataframe.columns):
+                values=dataframe[column].to_numpy(dtype=np.float64,na_value=np.nan)
+                missing=np.isnan(values)
+                if not np.isin(values[~missing],(-1,0,1)).all():
+                    break
+                codes=np.where(missing,TERNARY_CODES-1,values+1).astype(np.uint64)
+                keys|=codes<<np.uint64(2*position)
+            else:
+                return keys
+        return pd.util.hash_pandas_object(dataframe,index=False).to_numpy(dtype=np.uint64)
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def mix_keys(keys: np.ndarray) -> np.ndarray:
+
+    # splitmix64 finaliser: packed keys of similar rows differ in a few low
+    # bits, and the split needs them spread uniformly.
+    with np.errstate(over="ignore"):
+        mixed=keys+_SPLITMIX_INCREMENT
+        mixed=(mixed^(mixed>>np.uint64(30)))*_SPLITMIX_MULTIPLIERS[0]
+        mixed=(mixed^(mixed>>np.uint64(27)))*_SPLITMIX_MULTIPLIERS[1]
+        return mixed^(mixed>>np.uint64(31))
+
+
+def deduplicate_rows(dataframe: pd.DataFrame, weight_column: str) -> pd.DataFrame:
+
+    try:
+        # Identical rows (features and label) collapse into their first
+        # occurrence; weight_column holds how many rows each one stands for,
+        # adding up weights that are already there.
+        columns=[column for column in dataframe.columns if column!=weight_column]
+        keys=row_keys(dataframe[columns])
+        _,first_index,inverse=np.unique(keys,return_index=True,return_inverse=True)
+        weights=dataframe[weight_column].to_numpy(dtype=np.float64) if weight_column in dataframe.columns else np.ones(len(dataframe))
+        counts=np.bincount(inverse.ravel(),weights=weights,minlength=len(first_index))
+
+        order=np.argsort(first_index,kind="stable")
+        unique=dataframe[columns].iloc[first_index[order]].reset_index(drop=True)
+        unique[weight_column]=counts[order].astype(np.int64)
+        return unique
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def split_by_row(dataframe: pd.DataFrame, test_size: float, weight_column: str):
+
+    try:
+        # The split is a function of the row itself, so a duplicate lands in
+        # the same split as the row it repeats, within a run and across runs.
+        # Rows are also ordered by their mixed key, which shuffles them the way
+        # train_test_split did.
+        columns=[column for column in dataframe.columns if column!=weight_column]
+        position=mix_keys(row_keys(dataframe[columns]))>>np.uint64(11)
+        dataframe=dataframe.iloc[np.argsort(position,kind="stable")]
+        position=np.sort(position,kind="stable")
+        test=position.astype(np.float64)/float(1<<53)<test_size
+        return dataframe.loc[~test],dataframe.loc[test]
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def get_sample_weight(dataframe: pd.DataFrame, weight_column: str) -> np.ndarray:
+
+    try:
+        if weight_column not in dataframe.columns:
+            return None
+        return dataframe[weight_column].to_numpy(dtype=np.float64)
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
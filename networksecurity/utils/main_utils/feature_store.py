@@ -0,0 +1,127 @@
+import os
+import sys
+import operator
+from typing import List,Optional
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+PARQUET_ROW_GROUP_SIZE: int = 65536
+
+FILTER_OPERATORS = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def get_feature_store_format(file_path: str) -> str:
+
+    try:
+        extension=os.path.splitext(file_path)[1].lstrip(".").lower()
+        if extension not in ("csv","parquet"):
+            raise Exception(f"Unsupported feature store format: {file_path}")
+        return extension
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def cast_to_schema_dtypes(dataframe: pd.DataFrame, schema_dtypes: dict) -> pd.DataFrame:
+
+    try:
+        dtypes={}
+        for column,dtype in schema_dtypes.items():
+            if column not in dataframe.columns:
+                continue
+            # Columns with gaps use the nullable extension dtype so they keep
+            # their integer width instead of being widened to float64.
+            if dataframe[column].isna().any():
+                dtypes[column]=pd.api.types.pandas_dtype(dtype).name.capitalize()
+            else:
+                dtypes[column]=dtype
+        return dataframe.astype(dtypes)
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def write_feature_store(file_path: str, dataframe: pd.DataFrame, schema_dtypes: Optional[dict]=None) -> None:
+
+    try:
+        os.makedirs(os.path.dirname(file_path),exist_ok=True)
+        if schema_dtypes is not None:
+            dataframe=cast_to_schema_dtypes(dataframe,schema_dtypes)
+
+        if get_feature_store_format(file_path)=="parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table=pa.Table.from_pandas(dataframe,preserve_index=False)
+            pq.write_table(table,file_path,row_group_size=PARQUET_ROW_GROUP_SIZE)
+        else:
+            dataframe.to_csv(file_path,index=False,header=True)
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def read_feature_store_columns(file_path: str) -> List[str]:
+
+    try:
+        if get_feature_store_format(file_path)=="parquet":
+            import pyarrow.parquet as pq
+
+            return list(pq.read_schema(file_path).names)
+        return list(pd.read_csv(file_path,nrows=0).columns)
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def read_feature_store(file_path: str, columns: Optional[List[str]]=None, filters: Optional[list]=None,
+                       schema_dtypes: Optional[dict]=None) -> pd.DataFrame:
+
+    try:
+        if get_feature_store_format(file_path)=="parquet":
+            import pyarrow.parquet as pq
+
+            # Projection and filters are pushed down to the reader, so only the
+            # requested columns and matching row groups are decoded.
+            table=pq.read_table(file_path,columns=columns,filters=filters)
+            dataframe=table.to_pandas()
+        else:
+            dtype=None
+            if schema_dtypes is not None:
+                dtype={column:schema_dtypes[column] for column in schema_dtypes if columns is None or column in columns}
+            usecols=list(columns) if columns is not None else None
+            if filters:
+                usecols=None if usecols is None else list(dict.fromkeys(usecols+[column for column,_,_ in filters]))
+            try:
+                dataframe=pd.read_csv(file_path,usecols=usecols,dtype=dtype)
+            except (ValueError,TypeError):
+                # Missing values cannot be parsed into plain integer dtypes.
+                dataframe=pd.read_csv(file_path,usecols=usecols)
+            if filters:
+                mask=np.ones(len(dataframe),dtype=bool)
+                for column,op,value in filters:
+                    if op=="in":
+                        mask&=dataframe[column].isin(value).to_numpy()
+                    else:
+                        mask&=FILTER_OPERATORS[op](dataframe[column],value).to_numpy(dtype=bool,na_value=False)
+                dataframe=dataframe.loc[mask].reset_index(drop=True)
+            if columns is not None:
+                dataframe=dataframe[list(columns)]
+
+        if schema_dtypes is not None:
+            dataframe=cast_to_schema_dtypes(dataframe,schema_dtypes)
+        return dataframe
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
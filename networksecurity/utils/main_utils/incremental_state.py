@@ -0,0 +1,264 @@
+import os
+import re
+import sys
+import uuid
+from datetime import datetime,timedelta
+
+import pandas as pd
+from bson import ObjectId
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import read_yaml_file,write_yaml_file,save_obj,load_obj
+from networksecurity.utils.main_utils.feature_store import read_feature_store,write_feature_store
+from networksecurity.utils.ml_utils.drift.discrete_drift import DriftBaseline
+
+INCREMENTAL_STATE_FILE_NAME: str = "state.yaml"
+# Objects staged through stage_object and read back with load_object.
+STAGED_OBJECT_KEYS=("preprocessor","model")
+# Every file the state writes: data parts, the drift baseline, staged objects
+# and the temporary state file, each tagged with the writing run's token.
+STATE_FILE_PATTERN=re.compile(r"^(?:(?:train|test|baseline|preprocessor|model)-[0-9a-f]{12}\.\w+|state\.yaml\.[0-9a-f]{12})$")
+
+
+def encode_watermark(value) -> dict:
+
+    try:
+        if value is None:
+            return None
+        if isinstance(value,ObjectId):
+            return {"type":"objectid","value":str(value)}
+        if isinstance(value,datetime):
+            return {"type":"datetime","value":value.isoformat()}
+        return {"type":"value","value":value}
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def overlap_start(value,overlap_seconds:float):
+
+    try:
+        # The watermark moved back by the overlap, for watermark types that
+        # carry a time; other values have no overlap.
+        if isinstance(value,ObjectId):
+            return ObjectId.from_datetime(value.generation_time-timedelta(seconds=overlap_seconds))
+        if isinstance(value,datetime):
+            return value-timedelta(seconds=overlap_seconds)
+        return value
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def decode_watermark(content:dict):
+
+    try:
+        if content is None:
+            return None
+        if content["type"]=="objectid":
+            return ObjectId(content["value"])
+        if content["type"]=="datetime":
+            return datetime.fromisoformat(content["value"])
+        return content["value"]
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+class IncrementalState:
+
+    def __init__(self,state_dir:str,data_store_format:str="parquet"):
+
+        try:
+            # Everything an incremental run builds on: the watermark of the last
+            # ingested document, the train/test rows ingested so far as part
+            # files, and the preprocessor, model and drift baseline to warm
+            # start from. state.yaml names the committed files; a run stages
+            # new files next to them and only commits once the whole pipeline
+            # has succeeded, so a failed run leaves the previous state intact.
+            self.state_dir=state_dir
+            self.state_file_path=os.path.join(state_dir,INCREMENTAL_STATE_FILE_NAME)
+            self.data_store_format=data_store_format
+            self.content=read_yaml_file(self.state_file_path) if os.path.exists(self.state_file_path) else {}
+            self.pending={}
+            self.run_token=uuid.uuid4().hex[:12]
+            # Set by data ingestion for the stages after it.
+            self.mode=None
+            self.full_retrain=True
+            self.new_train_rows=0
+            self.new_train_set=None
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    @property
+    def watermark(self):
+        return decode_watermark(self.content.get("watermark"))
+
+    @property
+    def recent_ids(self) -> list:
+        # _id of every document ingested from the overlap window below the
+        # watermark, so the next run can re-read that window without them.
+        # None when the window was not kept, e.g. by states written before it.
+        recent_ids=self.content.get("recent_ids")
+        return None if recent_ids is None else [decode_watermark(content) for content in recent_ids]
+
+    @property
+    def generation(self) -> str:
+        # Identifies the committed state, for the stage cache fingerprints of
+        # warm-started stages.
+        return self.content.get("run_token")
+
+    @property
+    def warm_start(self) -> bool:
+        return self.mode=="incremental" and not self.full_retrain
+
+    def file_path(self,file_name:str) -> str:
+        return os.path.join(self.state_dir,file_name)
+
+    def needs_full_refresh(self,full_refresh_days:float,now:datetime=None) -> bool:
+
+        try:
+            # A periodic full export also picks up documents that were updated
+            # or deleted, which the watermark cannot see.
+            if not self.content.get("watermark") or not self.content.get("train_parts"):
+                return True
+            last_full_refresh=datetime.fromisoformat(self.content["last_full_refresh"])
+            return (now or datetime.now())-last_full_refresh>=timedelta(days=full_refresh_days)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def reset_new_rows(self):
+
+        # A retried ingestion starts over, so rows from a failed attempt are
+        # not counted twice.
+        self.new_train_rows=0
+        self.new_train_set=None
+
+    def start_full_refresh(self):
+
+        try:
+            self.mode="full"
+            self.full_retrain=True
+            self.reset_new_rows()
+            self.pending.update({"train_parts":[],"test_parts":[],"last_full_refresh":datetime.now().isoformat()})
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def start_incremental(self):
+
+        try:
+            self.mode="incremental"
+            self.reset_new_rows()
+            self.pending.update({"train_parts":list(self.content.get("train_parts",[])),
+                                 "test_parts":list(self.content.get("test_parts",[]))})
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def add_parts(self,train_set:pd.DataFrame,test_set:pd.DataFrame,schema_dtypes:dict=None):
+
+        try:
+            for split,dataframe in (("train",train_set),("test",test_set)):
+                if len(dataframe)==0:
+                    continue
+                file_name=f"{split}-{self.run_token}.{self.data_store_format}"
+                write_feature_store(self.file_path(file_name),dataframe,schema_dtypes=schema_dtypes)
+                self.pending[f"{split}_parts"].append(file_name)
+            self.new_train_rows+=len(train_set)
+            self.new_train_set=train_set if self.new_train_set is None else pd.concat([self.new_train_set,train_set],ignore_index=True)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def read_parts(self,split:str,columns:list) -> pd.DataFrame:
+
+        try:
+            # columns only shapes the empty frame; parts keep all their columns,
+            # including sample weights.
+            frames=[read_feature_store(self.file_path(file_name)) for file_name in self.pending.get(f"{split}_parts",[])]
+            if not frames:
+                return pd.DataFrame(columns=columns)
+            return pd.concat(frames,ignore_index=True)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def set_watermark(self,value,recent_ids:list=None):
+
+        try:
+            if value is not None:
+                self.pending["watermark"]=encode_watermark(value)
+                self.pending["recent_ids"]=None if recent_ids is None else [encode_watermark(document_id) for document_id in recent_ids]
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def load_baseline(self) -> DriftBaseline:
+
+        try:
+            file_name=self.content.get("baseline")
+            return DriftBaseline.load(self.file_path(file_name)) if file_name else None
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def stage_baseline(self,baseline:DriftBaseline):
+
+        try:
+            file_name=f"baseline-{self.run_token}.yaml"
+            baseline.save(self.file_path(file_name))
+            self.pending["baseline"]=file_name
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def load_object(self,key:str):
+
+        try:
+            file_name=self.content.get(key)
+            if not file_name or not os.path.exists(self.file_path(file_name)):
+                return None
+            return load_obj(self.file_path(file_name))
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def stage_object(self,key:str,obj,**metadata):
+
+        try:
+            file_name=f"{key}-{self.run_token}.pkl"
+            save_obj(self.file_path(file_name),obj)
+            self.pending[key]=file_name
+            self.pending.update(metadata)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def commit(self):
+
+        try:
+            if not self.pending:
+                return
+            content={**self.content,**self.pending,"run_token":self.run_token,"committed_at":datetime.now().isoformat(),
+                     "last_mode":self.mode}
+            temporary_file_path=f"{self.state_file_path}.{self.run_token}"
+            write_yaml_file(temporary_file_path,content)
+            os.replace(temporary_file_path,self.state_file_path)
+            self.content,self.pending=content,{}
+
+            # Files of earlier generations and of runs that failed before
+            # committing are no longer referenced. Only files the state wrote
+            # itself are removed; anything else in the directory is left alone.
+            referenced={*content.get("train_parts",[]),*content.get("test_parts",[])}
+            referenced.update(value for key,value in content.items() if key in ("baseline",*STAGED_OBJECT_KEYS))
+            for file_name in os.listdir(self.state_dir):
+                if STATE_FILE_PATTERN.match(file_name) and file_name not in referenced:
+                    os.remove(self.file_path(file_name))
+            logging.info(f"Committed incremental state {self.run_token} ({self.mode})")
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
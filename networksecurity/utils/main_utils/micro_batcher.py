@@ -0,0 +1,134 @@
+import sys
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import get_hot_path_logger
+
+# Per-batch records are sampled and rate limited.
+batch_logger=get_hot_path_logger("networksecurity.micro_batcher.batch")
+
+
+class MicroBatcher:
+
+    def __init__(self,predict_fn,max_batch_size:int=64,max_wait_seconds:float=.002,smoothing:float=.2):
+
+        try:
+            # predict_fn takes a list of records and returns one prediction per
+            # record. It runs on a single worker thread so the event loop keeps
+            # accepting requests while a batch is being scored.
+            self.predict_fn=predict_fn
+            self.max_batch_size=max_batch_size
+            self.max_wait_seconds=max_wait_seconds
+            self.smoothing=smoothing
+            self.average_batch_size=1.0
+            self.batches=0
+            self.records=0
+            self.queue=None
+            self.task=None
+            self.executor=None
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    async def start(self):
+
+        try:
+            self.queue=asyncio.Queue()
+            self.executor=ThreadPoolExecutor(max_workers=1,thread_name_prefix="micro-batcher")
+            self.task=asyncio.get_running_loop().create_task(self.run())
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    async def stop(self):
+
+        try:
+            if self.task is not None:
+                self.task.cancel()
+                try:
+                    await self.task
+                except asyncio.CancelledError:
+                    pass
+                self.task=None
+            if self.executor is not None:
+                self.executor.shutdown(wait=True)
+                self.executor=None
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    async def submit(self,record):
+
+        try:
+            future=asyncio.get_running_loop().create_future()
+            await self.queue.put((record,future))
+            return await future
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    async def collect_batch(self) -> list:
+
+        try:
+            batch=[await self.queue.get()]
+            while len(batch)<self.max_batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            # Only wait for stragglers when recent traffic actually formed
+            # batches; a lone request at low load is scored immediately.
+            if self.average_batch_size>1.5 and self.max_wait_seconds>0:
+                deadline=time.monotonic()+self.max_wait_seconds
+                while len(batch)<self.max_batch_size:
+                    remaining=deadline-time.monotonic()
+                    if remaining<=0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(),remaining))
+                    except asyncio.TimeoutError:
+                        break
+            self.average_batch_size+=self.smoothing*(len(batch)-self.average_batch_size)
+            return batch
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    async def score_one_by_one(self,batch:list):
+
+        loop=asyncio.get_running_loop()
+        for record,future in batch:
+            try:
+                prediction=(await loop.run_in_executor(self.executor,self.predict_fn,[record]))[0]
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            if not future.done():
+                future.set_result(prediction)
+
+    async def run(self):
+
+        loop=asyncio.get_running_loop()
+        while True:
+            batch=await self.collect_batch()
+            records=[record for record,_ in batch]
+            start=time.perf_counter()
+            try:
+                predictions=await loop.run_in_executor(self.executor,self.predict_fn,records)
+                for (_,future),prediction in zip(batch,predictions):
+                    if not future.done():
+                        future.set_result(prediction)
+                batch_logger.info("Scored micro-batch",extra={"batch_size":len(batch),
+                                                              "predict_ms":(time.perf_counter()-start)*1000})
+            except Exception as e:
+                batch_logger.error(f"Micro-batch of {len(batch)} records failed: {e}")
+                if len(batch)==1:
+                    if not batch[0][1].done():
+                        batch[0][1].set_exception(e)
+                else:
+                    # Record by record, so only the request that broke the
+                    # batch gets the error.
+                    await self.score_one_by_one(batch)
+            self.batches+=1
+            self.records+=len(batch)
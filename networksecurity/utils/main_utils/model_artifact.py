@@ -0,0 +1,155 @@
+import os
+import sys
+import json
+import mmap
+import pickle
+import struct
+import hashlib
+from datetime import datetime
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+# Layout: magic, metadata length, JSON metadata, then a 64-byte aligned data
+# section holding the pickle stream and every out-of-band buffer. Offsets in
+# the metadata are relative to the start of the data section.
+ARTIFACT_MAGIC: bytes = b"NSMODEL\x00"
+ARTIFACT_FORMAT_VERSION: int = 1
+ARTIFACT_ALIGNMENT: int = 64
+# Smaller buffers stay inside the pickle stream; mapping them is not worth
+# the padding.
+MIN_OUT_OF_BAND_BYTES: int = 1<<12
+HEADER=struct.Struct("<8sQ")
+
+
+def align(offset:int) -> int:
+    return -(-offset//ARTIFACT_ALIGNMENT)*ARTIFACT_ALIGNMENT
+
+
+def is_model_artifact(file_path:str) -> bool:
+
+    try:
+        with open(file_path,"rb") as file_obj:
+            return file_obj.read(len(ARTIFACT_MAGIC))==ARTIFACT_MAGIC
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def save_model_artifact(file_path:str,obj:object) -> dict:
+
+    try:
+        buffers=[]
+
+        def keep_in_band(buffer) -> bool:
+            if buffer.raw().nbytes<MIN_OUT_OF_BAND_BYTES:
+                return True
+            buffers.append(buffer)
+            return False
+
+        stream=pickle.dumps(obj,protocol=5,buffer_callback=keep_in_band)
+        raw_buffers=[buffer.raw() for buffer in buffers]
+
+        sections,offset=[],0
+        for section in [memoryview(stream)]+raw_buffers:
+            offset=align(offset)
+            sections.append((offset,section))
+            offset+=section.nbytes
+        digest=hashlib.sha256()
+        position=0
+        for section_offset,section in sections:
+            digest.update(bytes(section_offset-position))
+            digest.update(section)
+            position=section_offset+section.nbytes
+
+        metadata={"format_version":ARTIFACT_FORMAT_VERSION,
+                  "object_type":f"{type(obj).__module__}.{type(obj).__qualname__}",
+                  "created_at":datetime.now().isoformat(),
+                  "pickle_protocol":5,
+                  "pickle":[sections[0][0],sections[0][1].nbytes],
+                  "buffers":[[section_offset,section.nbytes] for section_offset,section in sections[1:]],
+                  "data_bytes":position,
+                  "sha256":digest.hexdigest()}
+        encoded=json.dumps(metadata).encode("utf-8")
+        data_start=align(HEADER.size+len(encoded))
+
+        # Written next to the target and renamed into place, so readers (and
+        # mapped workers) never see a half-written file and a replaced model
+        # gets a new inode.
+        os.makedirs(os.path.dirname(file_path) or ".",exist_ok=True)
+        temp_path=f"{file_path}.{os.getpid()}.tmp"
+        with open(temp_path,"wb") as file_obj:
+            file_obj.write(HEADER.pack(ARTIFACT_MAGIC,len(encoded)))
+            file_obj.write(encoded)
+            file_obj.write(bytes(data_start-HEADER.size-len(encoded)))
+            position=0
+            for section_offset,section in sections:
+                file_obj.write(bytes(section_offset-position))
+                file_obj.write(section)
+                position=section_offset+section.nbytes
+        os.replace(temp_path,file_path)
+        return metadata
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def read_model_artifact_metadata(file_path:str) -> dict:
+
+    try:
+        with open(file_path,"rb") as file_obj:
+            magic,length=HEADER.unpack(file_obj.read(HEADER.size))
+            if magic!=ARTIFACT_MAGIC:
+                raise Exception(f"{file_path} is not a model artifact")
+            return json.loads(file_obj.read(length))
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def map_model_artifact(file_path:str):
+
+    try:
+        with open(file_path,"rb") as file_obj:
+            magic,length=HEADER.unpack(file_obj.read(HEADER.size))
+            if magic!=ARTIFACT_MAGIC:
+                raise Exception(f"{file_path} is not a model artifact")
+            metadata=json.loads(file_obj.read(length))
+            if metadata["format_version"]>ARTIFACT_FORMAT_VERSION:
+                raise Exception(f"{file_path} uses artifact format {metadata['format_version']}, "
+                                f"this version reads up to {ARTIFACT_FORMAT_VERSION}")
+            mapped=mmap.mmap(file_obj.fileno(),0,access=mmap.ACCESS_READ)
+        data_start=align(HEADER.size+length)
+        data=memoryview(mapped)[data_start:data_start+metadata["data_bytes"]]
+        if len(data)!=metadata["data_bytes"]:
+            raise Exception(f"{file_path} is truncated")
+        return metadata,data
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def verify_model_artifact(file_path:str) -> None:
+
+    try:
+        metadata,data=map_model_artifact(file_path)
+        if hashlib.sha256(data).hexdigest()!=metadata["sha256"]:
+            raise Exception(f"{file_path} failed its integrity check")
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def load_model_artifact(file_path:str,verify:bool=True) -> object:
+
+    try:
+        if verify:
+            verify_model_artifact(file_path)
+        # Arrays are rebuilt as read-only views onto the mapping, so nothing
+        # is copied and processes loading the same file share its pages.
+        metadata,data=map_model_artifact(file_path)
+        offset,size=metadata["pickle"]
+        buffers=[data[buffer_offset:buffer_offset+buffer_size] for buffer_offset,buffer_size in metadata["buffers"]]
+        return pickle.loads(data[offset:offset+size],buffers=buffers)
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
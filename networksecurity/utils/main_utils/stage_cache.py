@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import hashlib
+import dataclasses
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import save_obj,load_obj
+
+
+def config_fingerprint(config) -> dict:
+
+    try:
+        # Output locations change with every run timestamp, and worker counts
+        # and tracking do not change results, so only the settings that
+        # influence the result are part of the fingerprint.
+        return {key:value for key,value in vars(config).items()
+                if not key.endswith(("_dir","_path","n_jobs")) and not key.startswith(("stage_cache","track"))}
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+class StageCache:
+
+    def __init__(self,cache_dir:str,enabled:bool=True):
+
+        try:
+            self.cache_dir=cache_dir
+            self.enabled=enabled
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    @staticmethod
+    def fingerprint(**inputs) -> str:
+
+        try:
+            payload=json.dumps(inputs,sort_keys=True,default=repr)
+            return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def entry_path(self,stage_name:str,fingerprint:str) -> str:
+        return os.path.join(self.cache_dir,stage_name,f"{fingerprint}.pkl")
+
+    @staticmethod
+    def artifact_paths(artifact) -> list:
+
+        paths=[]
+        for field in dataclasses.fields(artifact):
+            value=getattr(artifact,field.name)
+            if dataclasses.is_dataclass(value):
+                paths.extend(StageCache.artifact_paths(value))
+            elif field.name.endswith("_path") and isinstance(value,str):
+                paths.append(value)
+        return paths
+
+    def get(self,stage_name:str,fingerprint:str):
+
+        try:
+            entry_path=self.entry_path(stage_name,fingerprint)
+            if not self.enabled or not os.path.exists(entry_path):
+                return None
+
+            artifact=load_obj(entry_path)
+            missing_paths=[path for path in StageCache.artifact_paths(artifact) if not os.path.exists(path)]
+            if missing_paths:
+                logging.info(f"Stage cache entry {entry_path} is stale, missing {missing_paths}")
+                return None
+
+            logging.info(f"Stage cache hit for {stage_name} ({fingerprint[:12]})")
+            return artifact
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def put(self,stage_name:str,fingerprint:str,artifact) -> None:
+
+        try:
+            if self.enabled:
+                live_handles={field.name:None for field in dataclasses.fields(artifact) if field.metadata.get("live_handle")}
+                save_obj(self.entry_path(stage_name,fingerprint),dataclasses.replace(artifact,**live_handles))
+                logging.info(f"Stored stage cache entry for {stage_name} ({fingerprint[:12]})")
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
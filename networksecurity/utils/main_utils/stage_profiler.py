@@ -0,0 +1,206 @@
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from datetime import datetime
+from contextlib import contextmanager
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+TRACEMALLOC_TOP_ALLOCATIONS: int = 25
+
+
+def read_process_io() -> dict:
+
+    # Bytes passed through read/write syscalls (files, sockets, pipes); only
+    # Linux exposes them, elsewhere they are reported as None.
+    try:
+        with open("/proc/self/io") as file_obj:
+            counters=dict(line.split(":") for line in file_obj.read().splitlines())
+        return {"read_bytes":int(counters["rchar"]),"write_bytes":int(counters["wchar"])}
+    except (OSError,KeyError,ValueError):
+        return {"read_bytes":None,"write_bytes":None}
+
+
+def reset_peak_rss() -> bool:
+
+    # Linux can reset the high-water mark so the peak is measured per stage;
+    # elsewhere the process-lifetime peak is reported.
+    try:
+        with open("/proc/self/clear_refs","w") as file_obj:
+            file_obj.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def read_peak_rss_bytes() -> int:
+
+    try:
+        with open("/proc/self/status") as file_obj:
+            for line in file_obj:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])*1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform=="darwin" else peak*1024
+
+
+def resource_snapshot(reset_peak:bool=True) -> dict:
+
+    peak_reset=reset_peak and reset_peak_rss()
+    return {"wall":time.perf_counter(),"cpu":time.process_time(),
+            "children_cpu":sum(os.times()[2:4]),"peak_reset":peak_reset,**read_process_io()}
+
+
+def resource_usage(start:dict) -> dict:
+
+    # Children CPU only counts worker processes that have exited and been
+    # waited for, e.g. a pool that shut down inside the stage.
+    end_io=read_process_io()
+    return {"wall_seconds":time.perf_counter()-start["wall"],
+            "cpu_seconds":time.process_time()-start["cpu"],
+            "children_cpu_seconds":sum(os.times()[2:4])-start["children_cpu"],
+            "peak_rss_bytes":read_peak_rss_bytes(),
+            "peak_rss_scope":"stage" if start["peak_reset"] else "process",
+            **{key:None if end_io[key] is None or start[key] is None else end_io[key]-start[key]
+               for key in ("read_bytes","write_bytes")}}
+
+
+class StageProfiler:
+
+    def __init__(self,report_file_path:str,profile_dir:str=None,enabled:bool=True,
+                 capture_cprofile:bool=False,capture_tracemalloc:bool=False):
+
+        try:
+            self.report_file_path=report_file_path
+            self.profile_dir=profile_dir or os.path.dirname(report_file_path)
+            self.enabled=enabled
+            self.capture_cprofile=capture_cprofile
+            self.capture_tracemalloc=capture_tracemalloc
+            self.records=[]
+            # Stages currently inside profile(). The peak RSS high-water mark
+            # and tracemalloc's peak are process-wide, so they are only reset
+            # by a stage that starts while no other stage is running.
+            self.active={}
+            self.started_tracemalloc=False
+            self.lock=threading.Lock()
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    @contextmanager
+    def profile(self,stage_name:str):
+
+        # Yields the stage's record so the caller can add rows_in, rows_out
+        # or anything else it knows about the stage.
+        record={"stage":stage_name,"started_at":datetime.now().isoformat()}
+        if not self.enabled:
+            yield record
+            return
+        profiler=cProfile.Profile() if self.capture_cprofile else None
+        key=object()
+        with self.lock:
+            exclusive=not self.active
+            record["concurrent_with"]=[other["stage"] for other in self.active.values()]
+            for other in self.active.values():
+                other["concurrent_with"].append(stage_name)
+            self.active[key]=record
+            if self.capture_tracemalloc and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started_tracemalloc=True
+            elif self.capture_tracemalloc and exclusive:
+                tracemalloc.reset_peak()
+            start=resource_snapshot(reset_peak=exclusive)
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+            record["status"]="completed"
+        except BaseException:
+            record["status"]="failed"
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            with self.lock:
+                del self.active[key]
+                record.update(resource_usage(start))
+                # A stage that overlapped others shares their window: its peaks
+                # cover all of them, and CPU and I/O counters are process-wide.
+                if record["concurrent_with"]:
+                    record["peak_rss_scope"]="concurrent"
+                if self.capture_tracemalloc and tracemalloc.is_tracing():
+                    record["tracemalloc_peak_bytes"]=tracemalloc.get_traced_memory()[1]
+                    snapshot=tracemalloc.take_snapshot()
+                    if self.started_tracemalloc and not self.active:
+                        tracemalloc.stop()
+                        self.started_tracemalloc=False
+                else:
+                    snapshot=None
+            if snapshot is not None:
+                record["tracemalloc_file_path"]=self.write_tracemalloc(stage_name,snapshot)
+            if profiler is not None:
+                record["cprofile_file_path"]=self.write_cprofile(stage_name,profiler)
+            self.records.append(record)
+            logging.info(f"Stage {stage_name}: {record['wall_seconds']:.2f}s wall, {record['cpu_seconds']:.2f}s CPU, "
+                         f"peak RSS {record['peak_rss_bytes']} bytes ({record['peak_rss_scope']})")
+
+    def add_record(self,stage_name:str,**metrics):
+
+        try:
+            # For work measured elsewhere, such as search candidates fitted in
+            # worker processes.
+            if self.enabled:
+                self.records.append({"stage":stage_name,**metrics})
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def write_cprofile(self,stage_name:str,profiler:cProfile.Profile) -> str:
+
+        try:
+            os.makedirs(self.profile_dir,exist_ok=True)
+            file_path=os.path.join(self.profile_dir,f"{stage_name}.prof")
+            pstats.Stats(profiler).dump_stats(file_path)
+            return file_path
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def write_tracemalloc(self,stage_name:str,snapshot) -> str:
+
+        try:
+            os.makedirs(self.profile_dir,exist_ok=True)
+            file_path=os.path.join(self.profile_dir,f"{stage_name}_tracemalloc.txt")
+            with open(file_path,"w") as file_obj:
+                for statistic in snapshot.statistics("lineno")[:TRACEMALLOC_TOP_ALLOCATIONS]:
+                    file_obj.write(f"{statistic}\n")
+            return file_path
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def write_report(self) -> str:
+
+        try:
+            if not self.enabled:
+                return None
+            os.makedirs(os.path.dirname(self.report_file_path),exist_ok=True)
+            with open(self.report_file_path,"w") as file_obj:
+                json.dump({"created_at":datetime.now().isoformat(),"pid":os.getpid(),"stages":self.records},file_obj,indent=2,default=str)
+            logging.info(f"Stage metrics written to {self.report_file_path}")
+            return self.report_file_path
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
@@ -1,12 +1,12 @@
 import yaml
 from networksecurity.entity.config_entity import DataValidationConfig
 from networksecurity.exception.exception import NetworkSecurityException
-from sklearn.metrics import r2_score
-from sklearn.model_selection import GridSearchCV
+from networksecurity.utils.main_utils.model_artifact import save_model_artifact,load_model_artifact,is_model_artifact
 import os,sys
 import numpy as np
-import dill
 import pickle
+import hashlib
+import pandas as pd
 
 def read_yaml_file(file_path: str) -> dict:
     try:
@@ -17,6 +17,18 @@ def read_yaml_file(file_path: str) -> dict:
         raise NetworkSecurityException(e,sys)
     
 
+def get_schema_dtypes(schema_config: dict) -> dict:
+
+    try:
+        schema_dtypes={}
+        for column in schema_config["columns"]:
+            schema_dtypes.update({str(name).strip():str(dtype).strip() for name,dtype in column.items()})
+        return schema_dtypes
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+    
+
 def write_yaml_file(file_path: str,content:object,replace: bool =False) -> None:
     
     try:
@@ -44,29 +56,74 @@ def save_numpy_array(file_path:str ,array: np.array):
 def save_obj(file_path:str , obj:object):
 
     try:
-        dir_path = os.path.dirname(file_path)
-        os.makedirs(dir_path,exist_ok=True)
-        with open(file_path,"wb") as file_obj:
-            pickle.dump(obj,file_obj)
+        save_model_artifact(file_path,obj)
             
     except Exception as e:
         raise NetworkSecurityException(e,sys)
     
-def load_obj(file_path: str, ) -> object:
+def load_obj(file_path: str, verify: bool=True) -> object:
 
     try:
         if not os.path.exists(file_path):
             raise Exception(f"The file: {file_path} is not exists")
+        if is_model_artifact(file_path):
+            return load_model_artifact(file_path,verify=verify)
+        # Plain pickles written before the artifact format still load.
         with open(file_path, "rb") as file_obj:
-            print(file_obj)
             return pickle.load(file_obj)
         
     except Exception as e:
         raise NetworkSecurityException(e, sys) 
     
-def load_numpy_array(file_path: str) -> np.array:
+def hash_file(file_path: str, chunk_size: int=1<<20) -> str:
 
     try:
+        digest=hashlib.sha256()
+        with open(file_path,"rb") as file_obj:
+            for block in iter(lambda: file_obj.read(chunk_size),b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+    
+def hash_dataframe(dataframe: pd.DataFrame) -> str:
+
+    try:
+        digest=hashlib.sha256()
+        digest.update(repr(list(zip(dataframe.columns,map(str,dataframe.dtypes)))).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(dataframe,index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+    
+def hash_array(array: np.ndarray) -> str:
+
+    try:
+        array=np.ascontiguousarray(array)
+        digest=hashlib.sha256()
+        digest.update(f"{array.dtype.str}{array.shape}".encode("utf-8"))
+        digest.update(memoryview(array).cast("B"))
+        return digest.hexdigest()
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+    
+def hash_obj(obj: object) -> str:
+
+    try:
+        return hashlib.sha256(pickle.dumps(obj)).hexdigest()
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+    
+def load_numpy_array(file_path: str, mmap_mode: str=None) -> np.array:
+
+    try:
+        # With mmap_mode the array stays on disk and pages are read on access.
+        if mmap_mode is not None:
+            return np.load(file_path,mmap_mode=mmap_mode)
         with open(file_path, "rb") as file_obj:
             return np.load(file_obj)
         
@@ -74,30 +131,37 @@ def load_numpy_array(file_path: str) -> np.array:
         raise NetworkSecurityException(e, sys) 
     
 
-def evaluate_models(X_train, y_train,X_test,y_test,models,param):
+def evaluate_models(X_train, y_train,X_test,y_test,models,param,n_jobs: int=1,cv: int=3,on_result=None,executor=None,
+                    sample_weight=None,test_sample_weight=None):
     
     try:
-        report = {}
+        # Imported here so that scoring processes, which only need the
+        # loaders above, never pull in the search and metric modules.
+        from sklearn.metrics import r2_score
+        from networksecurity.utils.ml_utils.search.parallel_search import ParallelSearchExecutor
 
-        for i in range(len(list(models))):
-            model = list(models.values())[i]
-            para=param[list(models.keys())[i]]
+        report = {}
 
-            gs = GridSearchCV(model,para,cv=3)
-            gs.fit(X_train,y_train)
+        # Candidates from every model are searched in one process pool and the
+        # search's own refit replaces models[name], so callers get fitted models.
+        if executor is None:
+            executor=ParallelSearchExecutor(n_jobs=n_jobs,cv=cv,on_result=on_result)
+        # Sample weights of deduplicated rows weigh both the search and the
+        # scores, so results match training on the raw rows.
+        best_models=executor.search(models,param,X_train,y_train,sample_weight=sample_weight)
 
-            model.set_params(**gs.best_params_)
-            model.fit(X_train,y_train)
+        for name,model in best_models.items():
+            models[name]=model
 
             y_train_pred = model.predict(X_train)
             y_test_pred = model.predict(X_test)
 
-            train_model_score = r2_score(y_train, y_train_pred)
-            test_model_score = r2_score(y_test, y_test_pred)
+            train_model_score = r2_score(y_train, y_train_pred, sample_weight=sample_weight)
+            test_model_score = r2_score(y_test, y_test_pred, sample_weight=test_sample_weight)
 
-            report[list(models.keys())[i]] = test_model_score
+            report[name] = test_model_score
 
         return report
 
     except Exception as e:
-        raise NetworkSecurityException(e, sys)
\ No newline at end of file
+        raise NetworkSecurityException(e, sys)
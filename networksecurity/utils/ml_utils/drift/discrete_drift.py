@@ -0,0 +1,201 @@
+import sys
+from typing import List
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.main_utils.utils import read_yaml_file,write_yaml_file
+
+DRIFT_CATEGORIES: List[int] = [-1,0,1]
+DRIFT_CHUNK_SIZE: int = 1<<20
+DRIFT_EPSILON: float = 1e-6
+
+
+def value_counts(values: np.ndarray, categories=DRIFT_CATEGORIES, chunk_size: int=DRIFT_CHUNK_SIZE, weights: np.ndarray=None):
+
+    try:
+        categories=np.asarray(categories)
+        n_categories=len(categories)
+        n_columns=values.shape[1]
+        # Every column gets n_categories+1 bins, the last one collecting missing
+        # or unexpected values, so one bincount covers all columns at once.
+        offsets=np.arange(n_columns)*(n_categories+1)
+        counts=np.zeros(n_columns*(n_categories+1),dtype=np.int64)
+
+        # int8 features (the schema dtype) are mapped to bins through a
+        # 256-entry lookup table instead of a search.
+        byte_lookup=None
+        if values.dtype==np.int8 and np.all((categories>=-128) & (categories<=127)):
+            byte_lookup=np.full(256,n_categories,dtype=np.intp)
+            byte_lookup[categories.astype(np.int8).view(np.uint8)]=np.arange(n_categories)
+
+        for start in range(0,values.shape[0],chunk_size):
+            chunk=np.asarray(values[start:start+chunk_size])
+            if byte_lookup is not None:
+                codes=byte_lookup[chunk.view(np.uint8)]
+            else:
+                codes=np.searchsorted(categories,chunk)
+                clipped=np.minimum(codes,n_categories-1)
+                codes[(codes>=n_categories) | (categories[clipped]!=chunk)]=n_categories
+            codes+=offsets
+            if weights is None:
+                counts+=np.bincount(codes.ravel(),minlength=len(counts))
+            else:
+                # Deduplicated rows count as many times as the rows they stand for.
+                chunk_weights=np.repeat(np.asarray(weights[start:start+chunk_size],dtype=np.float64),n_columns)
+                counts+=np.rint(np.bincount(codes.ravel(),weights=chunk_weights,minlength=len(counts))).astype(np.int64)
+
+        counts=counts.reshape(n_columns,n_categories+1)
+        return counts[:,:n_categories],counts[:,n_categories]
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def dataframe_value_counts(dataframe: pd.DataFrame, categories=DRIFT_CATEGORIES, chunk_size: int=DRIFT_CHUNK_SIZE, weights: np.ndarray=None):
+
+    try:
+        n_columns=dataframe.shape[1]
+        counts=np.zeros((n_columns,len(categories)),dtype=np.int64)
+        missing=np.zeros(n_columns,dtype=np.int64)
+        # Row chunks keep the float conversion of nullable columns bounded.
+        plain_int8=all(dtype==np.int8 for dtype in dataframe.dtypes)
+        for start in range(0,len(dataframe),chunk_size):
+            if plain_int8:
+                chunk=dataframe.iloc[start:start+chunk_size].to_numpy(dtype=np.int8)
+            else:
+                chunk=dataframe.iloc[start:start+chunk_size].to_numpy(dtype=np.float64,na_value=np.nan)
+            chunk_weights=None if weights is None else weights[start:start+chunk_size]
+            chunk_counts,chunk_missing=value_counts(chunk,categories=categories,chunk_size=chunk_size,weights=chunk_weights)
+            counts+=chunk_counts
+            missing+=chunk_missing
+        return counts,missing
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def drift_statistics(base_counts: np.ndarray, current_counts: np.ndarray, epsilon: float=DRIFT_EPSILON) -> dict:
+
+    try:
+        base_counts=np.asarray(base_counts,dtype=np.float64)
+        current_counts=np.asarray(current_counts,dtype=np.float64)
+
+        # Chi-square test of homogeneity on the 2 x k table of every column.
+        table=np.stack([base_counts,current_counts],axis=1)
+        row_totals=table.sum(axis=2,keepdims=True)
+        column_totals=table.sum(axis=1,keepdims=True)
+        grand_totals=np.maximum(row_totals.sum(axis=1,keepdims=True),1)
+        expected=row_totals*column_totals/grand_totals
+        with np.errstate(divide="ignore",invalid="ignore"):
+            cells=np.where(expected>0,(table-expected)**2/expected,0.0)
+        chi_square=cells.sum(axis=(1,2))
+        degrees_of_freedom=np.maximum((column_totals[:,0,:]>0).sum(axis=1)-1,0)
+        p_value=np.where(degrees_of_freedom>0,chi2.sf(chi_square,np.maximum(degrees_of_freedom,1)),1.0)
+
+        base_share=(base_counts+epsilon)/(base_counts+epsilon).sum(axis=1,keepdims=True)
+        current_share=(current_counts+epsilon)/(current_counts+epsilon).sum(axis=1,keepdims=True)
+        psi=((current_share-base_share)*np.log(current_share/base_share)).sum(axis=1)
+
+        mixture=(base_share+current_share)/2
+        js_divergence=0.5*(base_share*np.log2(base_share/mixture)).sum(axis=1)+0.5*(current_share*np.log2(current_share/mixture)).sum(axis=1)
+
+        return {"chi_square":chi_square,"p_value":p_value,"psi":psi,"js_divergence":js_divergence}
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def build_drift_report(columns: List[str], statistics: dict, threshold: float=.05):
+
+    try:
+        status=True
+        report={}
+        for index,column in enumerate(columns):
+            is_found=bool(statistics["p_value"][index]<threshold)
+            if is_found:
+                status=False
+            report.update({column:{
+                "p_value":float(statistics["p_value"][index]),
+                "drift_status":is_found,
+                "chi_square":float(statistics["chi_square"][index]),
+                "psi":float(statistics["psi"][index]),
+                "js_divergence":float(statistics["js_divergence"][index]),
+            }})
+        return status,report
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+class DriftBaseline:
+
+    def __init__(self,columns:List[str],counts:np.ndarray,missing:np.ndarray=None,categories=DRIFT_CATEGORIES):
+
+        try:
+            self.columns=list(columns)
+            self.categories=list(categories)
+            self.counts=np.asarray(counts,dtype=np.int64)
+            self.missing=np.zeros(len(self.columns),dtype=np.int64) if missing is None else np.asarray(missing,dtype=np.int64)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    @classmethod
+    def from_dataframe(cls,dataframe:pd.DataFrame,categories=DRIFT_CATEGORIES,weights:np.ndarray=None):
+
+        try:
+            counts,missing=dataframe_value_counts(dataframe,categories=categories,weights=weights)
+            return cls(dataframe.columns,counts,missing,categories=categories)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def select(self,columns:List[str]):
+
+        try:
+            index=[self.columns.index(column) for column in columns]
+            return DriftBaseline(columns,self.counts[index],self.missing[index],categories=self.categories)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def compare(self,dataframe:pd.DataFrame,threshold:float=.05,weights:np.ndarray=None):
+
+        try:
+            current_counts,_=dataframe_value_counts(dataframe[self.columns],categories=self.categories,weights=weights)
+            statistics=drift_statistics(self.counts,current_counts)
+            return build_drift_report(self.columns,statistics,threshold=threshold)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def to_dict(self) -> dict:
+        return {
+            "categories":[int(category) for category in self.categories],
+            "columns":{column:{"counts":self.counts[index].tolist(),"missing":int(self.missing[index])}
+                       for index,column in enumerate(self.columns)},
+        }
+
+    def save(self,file_path:str) -> None:
+
+        try:
+            write_yaml_file(file_path=file_path,content=self.to_dict(),replace=True)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    @classmethod
+    def load(cls,file_path:str):
+
+        try:
+            content=read_yaml_file(file_path)
+            columns=list(content["columns"].keys())
+            counts=[content["columns"][column]["counts"] for column in columns]
+            missing=[content["columns"][column]["missing"] for column in columns]
+            return cls(columns,counts,missing,categories=content["categories"])
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
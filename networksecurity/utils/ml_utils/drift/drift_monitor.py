@@ -0,0 +1,151 @@
+import sys
+import math
+import threading
+
+import numpy as np
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.main_utils.utils import write_yaml_file
+from networksecurity.utils.ml_utils.drift.discrete_drift import DriftBaseline,drift_statistics,build_drift_report
+
+# Decayed weights grow geometrically; they are rescaled before they overflow.
+MAX_DECAY_WEIGHT: float = 1e100
+
+
+class DriftMonitor:
+
+    def __init__(self,baseline:DriftBaseline,window_size:int=None,half_life:float=None,threshold:float=.05,columns=None):
+
+        try:
+            if (window_size is None)==(half_life is None):
+                raise ValueError("Exactly one of window_size or half_life must be set")
+            if columns is not None:
+                baseline=baseline.select(columns)
+            self.baseline=baseline
+            self.threshold=threshold
+            self.window_size=window_size
+            self.half_life=half_life
+            self.n_columns=len(baseline.columns)
+            self.n_categories=len(baseline.categories)
+            self.column_index=np.arange(self.n_columns)
+            self.lock=threading.Lock()
+
+            # Records are stored as category codes; code n_categories marks a
+            # missing or unexpected value and is kept out of the histogram.
+            self.counts=np.zeros((self.n_columns,self.n_categories+1),dtype=np.float64)
+            self.records_seen=0
+            if window_size is not None:
+                self.window=np.full((window_size,self.n_columns),self.n_categories,dtype=np.int8)
+                self.window_position=0
+            else:
+                # Exponential decay without touching every bin per record: new
+                # records get a growing weight instead of old ones shrinking.
+                self.growth=math.pow(2.0,1.0/half_life)
+                self.weight=1.0
+
+            categories=np.asarray(baseline.categories)
+            self.byte_lookup=None
+            if np.all((categories>=-128) & (categories<=127)):
+                self.byte_lookup=np.full(256,self.n_categories,dtype=np.int8)
+                self.byte_lookup[categories.astype(np.int8).view(np.uint8)]=np.arange(self.n_categories)
+            self.categories=categories
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    @classmethod
+    def from_baseline_file(cls,baseline_file_path:str,**kwargs):
+
+        try:
+            return cls(DriftBaseline.load(baseline_file_path),**kwargs)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def encode(self,records:np.ndarray) -> np.ndarray:
+
+        try:
+            records=np.asarray(records)
+            if records.dtype==np.int8 and self.byte_lookup is not None:
+                return self.byte_lookup[records.view(np.uint8)]
+            codes=np.searchsorted(self.categories,records)
+            clipped=np.minimum(codes,self.n_categories-1)
+            codes[(codes>=self.n_categories) | (self.categories[clipped]!=records)]=self.n_categories
+            return codes.astype(np.int8)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def update(self,record) -> None:
+
+        try:
+            codes=self.encode(np.asarray(record).reshape(1,-1))[0]
+            with self.lock:
+                self._add(codes)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def update_batch(self,records) -> None:
+
+        try:
+            codes=self.encode(np.atleast_2d(records))
+            with self.lock:
+                for row in codes:
+                    self._add(row)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def _add(self,codes:np.ndarray) -> None:
+
+        # O(n_columns) per record, independent of how much traffic was seen.
+        self.records_seen+=1
+        if self.window_size is not None:
+            if self.records_seen>self.window_size:
+                self.counts[self.column_index,self.window[self.window_position]]-=1
+            self.counts[self.column_index,codes]+=1
+            self.window[self.window_position]=codes
+            self.window_position=(self.window_position+1)%self.window_size
+        else:
+            self.counts[self.column_index,codes]+=self.weight
+            self.weight*=self.growth
+            if self.weight>MAX_DECAY_WEIGHT:
+                self.counts/=self.weight
+                self.weight=1.0
+
+    def current_counts(self) -> np.ndarray:
+
+        try:
+            with self.lock:
+                counts=self.counts[:,:self.n_categories].copy()
+                weight=None if self.window_size is not None else self.weight
+            if weight is not None:
+                # Rescale the decayed counts back to an effective sample size.
+                decay=1/self.growth
+                effective_size=(1-math.exp(self.records_seen*math.log(decay)))/(1-decay)
+                totals=counts.sum(axis=1,keepdims=True)
+                counts=np.divide(counts*effective_size,totals,out=np.zeros_like(counts),where=totals>0)
+            return counts
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def report(self):
+
+        try:
+            statistics=drift_statistics(self.baseline.counts,self.current_counts())
+            return build_drift_report(self.baseline.columns,statistics,threshold=self.threshold)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def write_report(self,file_path:str) -> bool:
+
+        try:
+            status,report=self.report()
+            write_yaml_file(file_path=file_path,content=report,replace=True)
+            return status
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
@@ -3,12 +3,12 @@ from networksecurity.entity.artifact_entity import ClassificationMetricArtifact
 from networksecurity.exception.exception import NetworkSecurityException
 from sklearn.metrics import f1_score,precision_score,recall_score
 
-def get_classification_score(y_true,y_pred) -> ClassificationMetricArtifact:
+def get_classification_score(y_true,y_pred,sample_weight=None) -> ClassificationMetricArtifact:
 
     try:
-        model_f1_score=f1_score(y_true,y_pred)
-        model_recall_score=recall_score(y_true,y_pred)
-        model_precsion_score=precision_score(y_true,y_pred)
+        model_f1_score=f1_score(y_true,y_pred,sample_weight=sample_weight)
+        model_recall_score=recall_score(y_true,y_pred,sample_weight=sample_weight)
+        model_precsion_score=precision_score(y_true,y_pred,sample_weight=sample_weight)
 
         classification_metric = ClassificationMetricArtifact(f1_score=model_f1_score,
                                                             precision_score=model_precsion_score,
@@ -0,0 +1,234 @@
+import sys
+import itertools
+
+import numpy as np
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+TREE_LEAF: int = -1
+# Upper bound on row x tree x output cells materialised per evaluation chunk.
+EVALUATION_BLOCK_CELLS: int = 1<<21
+
+
+class CompiledTreeModel:
+
+    # All trees of the ensemble share flat node arrays with global child
+    # indices; traversal only follows (row, tree) pairs not yet at a leaf.
+    def __init__(self,kind:str,classes,trees:list,payloads:list,n_features:int,
+                 initial=None,normalizer:float=None,use_missing:bool=True,ternary_lut_max_features:int=0):
+
+        try:
+            self.kind=kind
+            self.classes_=classes
+            self.n_features_in_=n_features
+            self.n_trees=len(trees)
+            self.initial=initial
+            self.normalizer=normalizer
+            self.use_missing=use_missing
+
+            sizes=np.array([tree.node_count for tree in trees],dtype=np.int64)
+            offsets=np.concatenate([[0],np.cumsum(sizes)[:-1]])
+            self.roots=offsets.astype(np.int32)
+            self.feature=np.concatenate([np.maximum(tree.feature,0) for tree in trees]).astype(np.int32)
+            self.threshold=np.concatenate([tree.threshold for tree in trees]).astype(np.float64)
+            self.is_leaf=np.concatenate([tree.children_left==TREE_LEAF for tree in trees])
+            own_index=np.arange(sizes.sum(),dtype=np.int32)
+            left=np.concatenate([tree.children_left+offset for tree,offset in zip(trees,offsets)]).astype(np.int32)
+            right=np.concatenate([tree.children_right+offset for tree,offset in zip(trees,offsets)]).astype(np.int32)
+            # children[2*node+go_left] picks the next node with one gather.
+            self.children=np.empty(2*len(own_index),dtype=np.int64)
+            self.children[0::2]=np.where(self.is_leaf,own_index,right)
+            self.children[1::2]=np.where(self.is_leaf,own_index,left)
+            self.missing_go_to_left=np.concatenate([np.asarray(tree.missing_go_to_left,dtype=bool) if hasattr(tree,"missing_go_to_left")
+                                                    else np.zeros(tree.node_count,dtype=bool) for tree in trees])
+            self.payload=np.concatenate(payloads).astype(np.float64)
+            self.build_ternary_lookup(trees,ternary_lut_max_features)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def build_ternary_lookup(self,trees:list,max_features:int):
+
+        try:
+            # A tree that splits on at most max_features features has at most
+            # 3**max_features distinct ternary inputs; its leaf for each one is
+            # precomputed so ternary rows skip the traversal entirely.
+            self.lut_trees=np.zeros(0,dtype=np.int64)
+            if not max_features:
+                return
+            lut_trees,lut_features,lut_powers,lut_offsets,luts=[],[],[],[],[]
+            offset=0
+            for index,tree in enumerate(trees):
+                used=np.unique(tree.feature[tree.children_left!=TREE_LEAF])
+                if len(used)>max_features:
+                    continue
+                grid=np.array(list(itertools.product((-1.0,0.0,1.0),repeat=len(used))),dtype=np.float32).reshape(-1,len(used))
+                X=np.zeros((len(grid),self.n_features_in_),dtype=np.float32)
+                X[:,used]=grid
+                leaves=self.traverse(X,np.array([index]))[:,0]
+                # itertools.product varies the last feature fastest, so the
+                # first used feature carries the largest power of three.
+                lut_trees.append(index)
+                lut_features.append(np.pad(used,(0,max_features-len(used))))
+                lut_powers.append(np.pad(3**np.arange(len(used)-1,-1,-1),(0,max_features-len(used))))
+                lut_offsets.append(offset)
+                luts.append(leaves)
+                offset+=len(leaves)
+            if not lut_trees:
+                return
+            self.lut_trees=np.array(lut_trees,dtype=np.int64)
+            self.lut_features=np.array(lut_features,dtype=np.int64).reshape(len(lut_trees),max_features)
+            self.lut_powers=np.array(lut_powers,dtype=np.int64).reshape(len(lut_trees),max_features)
+            self.lut_offsets=np.array(lut_offsets,dtype=np.int64)
+            self.lut=np.concatenate(luts).astype(np.int32)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def traverse(self,X:np.ndarray,trees:np.ndarray) -> np.ndarray:
+
+        try:
+            # One vectorized step per tree level over every (row, tree) pair
+            # still inside the trees; pairs drop out once they reach a leaf.
+            n_samples=len(X)
+            leaves=np.tile(self.roots[trees],n_samples)
+            flat_X=X.reshape(-1)
+            use_missing=self.use_missing and np.isnan(flat_X).any()
+            pairs=np.flatnonzero(~self.is_leaf[leaves])
+            node=leaves[pairs]
+            row_offsets=(pairs//len(trees))*X.shape[1]
+            while pairs.size:
+                values=flat_X[row_offsets+self.feature[node]]
+                go_left=values<=self.threshold[node]
+                if use_missing:
+                    go_left|=np.isnan(values) & self.missing_go_to_left[node]
+                node=self.children[2*node+go_left]
+                done=self.is_leaf[node]
+                leaves[pairs[done]]=node[done]
+                inside=~done
+                pairs,node,row_offsets=pairs[inside],node[inside],row_offsets[inside]
+            return leaves.reshape(n_samples,len(trees))
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def apply(self,X:np.ndarray) -> np.ndarray:
+
+        try:
+            if len(self.lut_trees)==0:
+                return self.traverse(X,np.arange(self.n_trees))
+            leaves=np.empty((len(X),self.n_trees),dtype=np.int32)
+            ternary=np.isin(X,(-1,0,1)).all(axis=1)
+            ternary_rows=np.flatnonzero(ternary)
+            other_trees=np.setdiff1d(np.arange(self.n_trees),self.lut_trees)
+            if len(ternary_rows):
+                codes=(X[ternary_rows]+1).astype(np.int64)
+                index=(codes[:,self.lut_features]*self.lut_powers).sum(axis=2)
+                leaves[np.ix_(ternary_rows,self.lut_trees)]=self.lut[self.lut_offsets+index]
+                if len(other_trees):
+                    leaves[np.ix_(ternary_rows,other_trees)]=self.traverse(X[ternary_rows],other_trees)
+            other_rows=np.flatnonzero(~ternary)
+            if len(other_rows):
+                leaves[other_rows]=self.traverse(X[other_rows],np.arange(self.n_trees))
+            return leaves
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def decision_values(self,X) -> np.ndarray:
+
+        try:
+            X=np.ascontiguousarray(X,dtype=np.float32)
+            if X.ndim!=2 or X.shape[1]!=self.n_features_in_:
+                raise ValueError(f"X has shape {X.shape}, the compiled model expects {self.n_features_in_} features")
+            n_outputs=self.payload.shape[1]
+            values=np.empty((len(X),n_outputs),dtype=np.float64)
+            chunk_size=max(1,EVALUATION_BLOCK_CELLS//(self.n_trees*n_outputs))
+            for start in range(0,len(X),chunk_size):
+                contributions=self.payload[self.apply(X[start:start+chunk_size])]
+                if self.initial is not None:
+                    initial=np.broadcast_to(self.initial,(len(contributions),1,n_outputs))
+                    contributions=np.concatenate([initial,contributions],axis=1)
+                # cumsum adds the trees strictly in order, the same float
+                # operations sklearn performs, so results are bit-identical.
+                values[start:start+chunk_size]=np.cumsum(contributions,axis=1)[:,-1]
+            if self.normalizer is not None:
+                values/=self.normalizer
+            return values
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def predict(self,X) -> np.ndarray:
+
+        try:
+            values=self.decision_values(X)
+            if self.kind=="gradient_boosting" and values.shape[1]==1:
+                return self.classes_[(values[:,0]>=0).astype(int)]
+            if self.kind=="adaboost" and len(self.classes_)==2:
+                values[:,0]*=-1
+                return self.classes_.take(values.sum(axis=1)>0,axis=0)
+            return self.classes_.take(np.argmax(values,axis=1),axis=0)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+
+def compile_tree_model(estimator,ternary_lut_max_features:int=0):
+
+    try:
+        # sklearn is only needed to compile; evaluating an unpickled compiled
+        # model runs on numpy alone.
+        from sklearn.tree import DecisionTreeClassifier
+        from sklearn.dummy import DummyClassifier
+        from sklearn.ensemble import RandomForestClassifier,GradientBoostingClassifier,AdaBoostClassifier
+
+        # Returns None for models the evaluator does not cover, so callers can
+        # keep using the estimator as is.
+        if getattr(estimator,"n_outputs_",1)!=1:
+            return None
+        common=dict(classes=estimator.classes_,n_features=estimator.n_features_in_,ternary_lut_max_features=ternary_lut_max_features)
+
+        if isinstance(estimator,DecisionTreeClassifier):
+            tree=estimator.tree_
+            return CompiledTreeModel("tree",trees=[tree],payloads=[tree.value[:,0,:]],**common)
+
+        if isinstance(estimator,RandomForestClassifier):
+            trees=[member.tree_ for member in estimator.estimators_]
+            return CompiledTreeModel("forest",trees=trees,payloads=[tree.value[:,0,:] for tree in trees],
+                                     normalizer=float(len(trees)),**common)
+
+        if isinstance(estimator,GradientBoostingClassifier):
+            if not (isinstance(estimator.init_,str) and estimator.init_=="zero") and not isinstance(estimator.init_,DummyClassifier):
+                return None
+            n_columns=estimator.estimators_.shape[1]
+            trees,payloads=[],[]
+            for stage in estimator.estimators_:
+                for column,member in enumerate(stage):
+                    payload=np.zeros((member.tree_.node_count,n_columns))
+                    payload[:,column]=estimator.learning_rate*member.tree_.value[:,0,0]
+                    trees.append(member.tree_)
+                    payloads.append(payload)
+            # The init estimator predicts a constant, so its raw score is
+            # computed once here.
+            initial=estimator._raw_predict_init(np.zeros((1,estimator.n_features_in_),dtype=np.float32))[0]
+            return CompiledTreeModel("gradient_boosting",trees=trees,payloads=payloads,initial=initial,use_missing=False,**common)
+
+        if isinstance(estimator,AdaBoostClassifier):
+            members=list(zip(estimator.estimators_,estimator.estimator_weights_))
+            if estimator.n_classes_<2 or not members or not all(isinstance(member,DecisionTreeClassifier) for member,_ in members):
+                return None
+            n_classes=estimator.n_classes_
+            trees,payloads=[],[]
+            for member,weight in members:
+                leaf_class=member.classes_.take(np.argmax(member.tree_.value[:,0,:],axis=1),axis=0)
+                matches=leaf_class[:,None]==estimator.classes_[None,:]
+                payloads.append(np.where(matches,weight,-1/(n_classes-1)*weight))
+                trees.append(member.tree_)
+            return CompiledTreeModel("adaboost",trees=trees,payloads=payloads,
+                                     normalizer=estimator.estimator_weights_.sum(),**common)
+
+        return None
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
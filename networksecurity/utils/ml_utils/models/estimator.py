@@ -5,11 +5,13 @@ from networksecurity.logging.logger import logging
 
 class NetworkModel:
 
-    def __init__(self,preprocessor,model):
+    def __init__(self,preprocessor,model,compiled_model=None,compiled_max_batch_rows:int=256):
 
         try:
             self.preprocessor=preprocessor
             self.model=model
+            self.compiled_model=compiled_model
+            self.compiled_max_batch_rows=compiled_max_batch_rows
         except Exception as e:
             raise NetworkSecurityException(e,sys)
         
@@ -17,7 +19,13 @@ class NetworkModel:
 
         try:
             x_transform = self.preprocessor.transform(x)
-            y_hat=self.model.predict(x_transform)
+            # The compiled evaluator wins on small batches; large ones go to
+            # sklearn, as do models pickled before compiled_model existed.
+            model=self.model
+            compiled_model=getattr(self,"compiled_model",None)
+            if compiled_model is not None and len(x_transform)<=getattr(self,"compiled_max_batch_rows",0):
+                model=compiled_model
+            y_hat=model.predict(x_transform)
             return y_hat
         except Exception as e:
             raise NetworkSecurityException(e,sys)
\ No newline at end of file
@@ -0,0 +1,274 @@
+import os
+import sys
+import shutil
+import tempfile
+
+import numpy as np
+from sklearn.base import BaseEstimator,ClassifierMixin
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+OUT_OF_CORE_CHUNK_ROWS: int = 1<<16
+# Rows sampled to place the bin edges; the edges only need the distribution.
+BIN_SAMPLE_ROWS: int = 200_000
+
+
+def iter_array_chunks(array,chunk_rows:int=OUT_OF_CORE_CHUNK_ROWS,start:int=0,stop:int=None,order=None):
+
+    try:
+        # Only one chunk is materialised at a time, so a memory-mapped array is
+        # read from disk in bounded pieces.
+        stop=len(array) if stop is None else stop
+        starts=np.arange(start,stop,chunk_rows)
+        if order is not None:
+            starts=starts[order(len(starts))]
+        for chunk_start in starts:
+            yield int(chunk_start),np.asarray(array[chunk_start:min(chunk_start+chunk_rows,stop)])
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def predict_in_chunks(model,X,chunk_rows:int=OUT_OF_CORE_CHUNK_ROWS,start:int=0,stop:int=None) -> np.ndarray:
+
+    try:
+        predictions=[model.predict(chunk) for _,chunk in iter_array_chunks(X,chunk_rows,start,stop)]
+        return np.concatenate(predictions) if predictions else np.empty(0)
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def fit_incremental(model,X,y,chunk_rows:int=OUT_OF_CORE_CHUNK_ROWS,epochs:int=1,classes=None,stop:int=None,random_state=None,
+                    sample_weight=None):
+
+    try:
+        # partial_fit learners see every chunk once per epoch; chunk order and
+        # rows within a chunk are shuffled so no epoch replays the same sequence.
+        if classes is None:
+            classes=np.unique(np.concatenate([np.unique(chunk) for _,chunk in iter_array_chunks(y,chunk_rows,stop=stop)]))
+        rng=np.random.default_rng(random_state)
+        for _ in range(epochs):
+            for chunk_start,X_chunk in iter_array_chunks(X,chunk_rows,stop=stop,order=rng.permutation):
+                y_chunk=np.asarray(y[chunk_start:chunk_start+len(X_chunk)])
+                shuffle=rng.permutation(len(X_chunk))
+                if sample_weight is None:
+                    model.partial_fit(X_chunk[shuffle],y_chunk[shuffle],classes=classes)
+                else:
+                    weight_chunk=np.asarray(sample_weight[chunk_start:chunk_start+len(X_chunk)])
+                    model.partial_fit(X_chunk[shuffle],y_chunk[shuffle],classes=classes,sample_weight=weight_chunk[shuffle])
+        return model
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+class ChunkedHistGradientBoostingClassifier(ClassifierMixin,BaseEstimator):
+
+    def __init__(self,n_estimators:int=100,learning_rate:float=.1,max_depth:int=3,max_bins:int=32,
+                 l2_regularization:float=1.0,min_samples_leaf:int=20,chunk_rows:int=OUT_OF_CORE_CHUNK_ROWS,
+                 scratch_dir:str=None):
+        self.n_estimators=n_estimators
+        self.learning_rate=learning_rate
+        self.max_depth=max_depth
+        self.max_bins=max_bins
+        self.l2_regularization=l2_regularization
+        self.min_samples_leaf=min_samples_leaf
+        self.chunk_rows=chunk_rows
+        self.scratch_dir=scratch_dir
+
+    def bin_chunk(self,X_chunk:np.ndarray) -> np.ndarray:
+
+        binned=np.empty(X_chunk.shape,dtype=np.uint8)
+        for index,edges in enumerate(self.bin_edges_):
+            binned[:,index]=np.searchsorted(edges,X_chunk[:,index],side="right")
+        return binned
+
+    def fit_bin_edges(self,X) -> list:
+
+        # Features with few distinct values get a bin each; the rest are cut at
+        # quantiles of an evenly strided row sample.
+        sample=np.asarray(X[::max(1,len(X)//BIN_SAMPLE_ROWS)],dtype=np.float64)
+        edges=[]
+        for column in sample.T:
+            values=np.unique(column[~np.isnan(column)])
+            if len(values)>self.max_bins-1:
+                values=np.unique(np.quantile(column[~np.isnan(column)],np.linspace(0,1,self.max_bins-1)))
+            edges.append((values[:-1]+values[1:])/2)
+        return edges
+
+    @staticmethod
+    def apply_tree(tree:tuple,binned:np.ndarray) -> np.ndarray:
+
+        # Nodes are walked level by level for the whole chunk at once; leaves
+        # point to themselves, so the walk ends once no row moves. Trees can
+        # be lopsided, so their depth is not bounded by the node count's log.
+        feature,threshold,left,right,_=tree
+        nodes=np.zeros(len(binned),dtype=np.intp)
+        for _ in range(len(feature)):
+            go_left=binned[np.arange(len(binned)),np.maximum(feature[nodes],0)]<=threshold[nodes]
+            next_nodes=np.where(go_left,left[nodes],right[nodes])
+            if np.array_equal(next_nodes,nodes):
+                break
+            nodes=next_nodes
+        return nodes
+
+    def grow_tree(self,binned,targets,raw_predictions,node_ids,previous_values,weights=None):
+
+        n_features=binned.shape[1]
+        n_bins=self.max_bins
+        l2=self.l2_regularization
+        feature=[-1]; threshold=[0]; left=[0]; right=[0]; value=[0.0]
+        level,computed,siblings,histograms=[0],[0],{},{}
+        for depth in range(self.max_depth+1):
+            # One pass over the chunks moves every row one level down and
+            # gathers gradient, hessian and count histograms. Only the smaller
+            # child of each split is counted; its sibling is the parent's
+            # histogram minus it.
+            slot=np.full(len(feature),-1,dtype=np.intp)
+            slot[computed]=np.arange(len(computed))
+            size=len(computed)*n_features*n_bins
+            stats=np.zeros((3,size))
+            feature_array,threshold_array,left_array,right_array=(np.array(values,dtype=np.intp) for values in (feature,threshold,left,right))
+            for chunk_start,binned_chunk in iter_array_chunks(binned,self.chunk_rows):
+                rows=slice(chunk_start,chunk_start+len(binned_chunk))
+                if depth==0:
+                    if previous_values is not None:
+                        raw_predictions[rows]+=previous_values[node_ids[rows]]
+                    nodes=np.zeros(len(binned_chunk),dtype=np.intp)
+                else:
+                    nodes=np.asarray(node_ids[rows],dtype=np.intp)
+                    go_left=binned_chunk[np.arange(len(nodes)),np.maximum(feature_array[nodes],0)]<=threshold_array[nodes]
+                    nodes=np.where(go_left,left_array[nodes],right_array[nodes])
+                node_ids[rows]=nodes
+                node_slot=slot[nodes]
+                active=node_slot>=0
+                probabilities=1/(1+np.exp(-raw_predictions[rows][active]))
+                gradient=probabilities-targets[rows][active]
+                hessian=probabilities*(1-probabilities)
+                index=((node_slot[active][:,None]*n_features+np.arange(n_features))*n_bins+binned_chunk[active]).ravel()
+                if weights is None:
+                    stats[2]+=np.bincount(index,minlength=size)
+                else:
+                    # A weighted row adds its weight to every statistic,
+                    # counts included, as that many identical rows would.
+                    row_weights=np.asarray(weights[rows])[active]
+                    gradient,hessian=gradient*row_weights,hessian*row_weights
+                    stats[2]+=np.bincount(index,weights=np.repeat(row_weights,n_features),minlength=size)
+                stats[0]+=np.bincount(index,weights=np.repeat(gradient,n_features),minlength=size)
+                stats[1]+=np.bincount(index,weights=np.repeat(hessian,n_features),minlength=size)
+
+            stats=stats.reshape(3,len(computed),n_features,n_bins)
+            histograms={node:stats[:,position] for position,node in enumerate(computed)}|{
+                node:histograms[parent]-stats[:,slot[sibling]] for node,(parent,sibling) in siblings.items()}
+            if depth==self.max_depth:
+                for node in level:
+                    gradient_sum,hessian_sum=histograms[node][0,0].sum(),histograms[node][1,0].sum()
+                    value[node]=-self.learning_rate*gradient_sum/(hessian_sum+l2)
+                break
+
+            next_level,computed,siblings=[],[],{}
+            for node in level:
+                gradients,hessians,counts=histograms[node]
+                total_gradient,total_hessian,total_count=gradients[0].sum(),hessians[0].sum(),counts[0].sum()
+                value[node]=-self.learning_rate*total_gradient/(total_hessian+l2)
+                left_gradient=np.cumsum(gradients,axis=1)[:,:-1]
+                left_hessian=np.cumsum(hessians,axis=1)[:,:-1]
+                left_count=np.cumsum(counts,axis=1)[:,:-1]
+                gain=(left_gradient**2/(left_hessian+l2)+(total_gradient-left_gradient)**2/(total_hessian-left_hessian+l2)
+                      -total_gradient**2/(total_hessian+l2))
+                gain[(left_count<self.min_samples_leaf) | (total_count-left_count<self.min_samples_leaf)]=-np.inf
+                best=np.unravel_index(np.argmax(gain),gain.shape)
+                if not gain[best]>0:
+                    continue
+                feature[node],threshold[node]=int(best[0]),int(best[1])
+                children=[]
+                for _ in range(2):
+                    children.append(len(feature))
+                    feature.append(-1); threshold.append(0); left.append(len(feature)-1); right.append(len(feature)-1); value.append(0.0)
+                left[node],right[node]=children
+                smaller,larger=children if left_count[best]<=total_count-left_count[best] else children[::-1]
+                computed.append(smaller)
+                siblings[larger]=(node,smaller)
+                next_level.extend(children)
+            if not next_level:
+                break
+            level=next_level
+
+        return (np.array(feature,dtype=np.intp),np.array(threshold,dtype=np.intp),
+                np.array(left,dtype=np.intp),np.array(right,dtype=np.intp),np.array(value))
+
+    def fit(self,X,y,sample_weight=None):
+
+        try:
+            # X and y may be memory-mapped. The binned features (one byte per
+            # cell) and the running raw predictions live in scratch files, so
+            # memory use depends on chunk_rows rather than on the row count.
+            self.classes_=np.unique(np.concatenate([np.unique(chunk) for _,chunk in iter_array_chunks(y,self.chunk_rows)]))
+            if len(self.classes_)!=2:
+                raise ValueError(f"{type(self).__name__} supports binary targets, got classes {self.classes_}")
+            self.n_features_in_=X.shape[1]
+            self.bin_edges_=self.fit_bin_edges(X)
+            if self.max_bins>256 or max(len(edges) for edges in self.bin_edges_)>=self.max_bins:
+                raise ValueError("max_bins must be at most 256")
+
+            scratch_dir=tempfile.mkdtemp(prefix="hist_boosting_",dir=self.scratch_dir)
+            try:
+                binned=np.lib.format.open_memmap(os.path.join(scratch_dir,"binned.npy"),mode="w+",dtype=np.uint8,shape=X.shape)
+                targets=np.lib.format.open_memmap(os.path.join(scratch_dir,"targets.npy"),mode="w+",dtype=np.float64,shape=(len(X),))
+                positives,total=0,0
+                for chunk_start,X_chunk in iter_array_chunks(X,self.chunk_rows):
+                    rows=slice(chunk_start,chunk_start+len(X_chunk))
+                    binned[rows]=self.bin_chunk(X_chunk)
+                    targets[rows]=np.asarray(y[rows])==self.classes_[1]
+                    row_weights=np.ones(len(X_chunk)) if sample_weight is None else np.asarray(sample_weight[rows])
+                    positives+=row_weights@targets[rows]
+                    total+=row_weights.sum()
+                rate=np.clip(positives/total,1e-6,1-1e-6)
+                self.baseline_prediction_=float(np.log(rate/(1-rate)))
+                raw_predictions=np.lib.format.open_memmap(os.path.join(scratch_dir,"raw.npy"),mode="w+",dtype=np.float64,shape=(len(X),))
+                raw_predictions[:]=self.baseline_prediction_
+                # Leaf each row reached in the latest tree, which is how that
+                # tree's values are added before the next one is grown.
+                node_ids=np.lib.format.open_memmap(os.path.join(scratch_dir,"nodes.npy"),mode="w+",dtype=np.int32,shape=(len(X),))
+
+                self.trees_=[]
+                for _ in range(self.n_estimators):
+                    self.trees_.append(self.grow_tree(binned,targets,raw_predictions,node_ids,self.trees_[-1][4] if self.trees_ else None,
+                                                      weights=sample_weight))
+                del binned,targets,raw_predictions,node_ids
+            finally:
+                shutil.rmtree(scratch_dir,ignore_errors=True)
+            return self
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def decision_function(self,X) -> np.ndarray:
+
+        try:
+            binned=self.bin_chunk(np.asarray(X,dtype=np.float64))
+            raw_predictions=np.full(len(binned),self.baseline_prediction_)
+            for tree in self.trees_:
+                raw_predictions+=tree[4][self.apply_tree(tree,binned)]
+            return raw_predictions
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def predict_proba(self,X) -> np.ndarray:
+
+        try:
+            positive=1/(1+np.exp(-self.decision_function(X)))
+            return np.column_stack([1-positive,positive])
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def predict(self,X) -> np.ndarray:
+
+        try:
+            return self.classes_[(self.decision_function(X)>0).astype(np.intp)]
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
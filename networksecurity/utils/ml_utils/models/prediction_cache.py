@@ -0,0 +1,151 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import load_obj
+
+# Two bits per feature: 0, 1 and -1 get their own code and 3 marks a missing
+# value, so up to 32 ternary features pack losslessly into one uint64 key.
+MISSING_CODE: int = 3
+MAX_PACKED_FEATURES: int = 32
+
+
+def pack_ternary_rows(x):
+
+    values=x.to_numpy(dtype=np.float64,na_value=np.nan) if isinstance(x,pd.DataFrame) else np.asarray(x,dtype=np.float64)
+    if values.shape[1]>MAX_PACKED_FEATURES:
+        return np.zeros(len(values),dtype=np.uint64),np.zeros(len(values),dtype=bool)
+    codes=np.full(values.shape,MISSING_CODE+1,dtype=np.uint64)
+    codes[values==0]=0
+    codes[values==1]=1
+    codes[values==-1]=2
+    codes[np.isnan(values)]=MISSING_CODE
+    # Rows holding anything outside {-1,0,1,NaN} cannot be keyed and always
+    # go to the model.
+    packable=(codes<=MISSING_CODE).all(axis=1)
+    shifts=np.arange(values.shape[1],dtype=np.uint64)*np.uint64(2)
+    keys=np.bitwise_or.reduce(codes<<shifts,axis=1,initial=np.uint64(0))
+    return keys,packable
+
+
+class PredictionCache:
+
+    def __init__(self,model_file_path:str,max_entries:int=100000,verify:bool=True):
+
+        try:
+            self.model_file_path=model_file_path
+            self.max_entries=max_entries
+            self.verify=verify
+            self.entries=OrderedDict()
+            self.lock=threading.Lock()
+            self.hits=0
+            self.misses=0
+            self.evictions=0
+            self.invalidations=0
+            self.model=None
+            self.model_signature=None
+            self.refresh_model()
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def get_model_signature(self):
+
+        try:
+            stat=os.stat(self.model_file_path)
+            return stat.st_ino,stat.st_size,stat.st_mtime_ns
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def refresh_model(self) -> bool:
+
+        try:
+            # A changed model artifact (new inode, size or mtime) reloads the
+            # model and drops every cached prediction made by the old one.
+            signature=self.get_model_signature()
+            if signature==self.model_signature:
+                return False
+            model=load_obj(self.model_file_path,verify=self.verify)
+            with self.lock:
+                if self.model_signature is not None:
+                    self.invalidations+=1
+                    logging.info(f"Model artifact {self.model_file_path} changed, cleared {len(self.entries)} cached predictions")
+                self.entries.clear()
+                self.model=model
+                self.model_signature=signature
+            return True
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def predict(self,x:pd.DataFrame) -> np.ndarray:
+
+        try:
+            self.refresh_model()
+            keys,packable=pack_ternary_rows(x)
+            packable_rows=np.flatnonzero(packable)
+            unpackable_rows=np.flatnonzero(~packable)
+
+            # Duplicate rows within the batch are looked up and scored once.
+            unique_keys,first,inverse=np.unique(keys[packable_rows],return_index=True,return_inverse=True)
+            unique_predictions=[None]*len(unique_keys)
+            missed=[]
+            with self.lock:
+                model=self.model
+                for index,key in enumerate(unique_keys.tolist()):
+                    prediction=self.entries.get(key)
+                    if prediction is None:
+                        missed.append(index)
+                    else:
+                        self.entries.move_to_end(key)
+                        unique_predictions[index]=prediction
+                self.hits+=len(packable_rows)-len(missed)
+                self.misses+=len(missed)
+            missed=np.asarray(missed,dtype=np.int64)
+
+            scored=[]
+            to_score=np.concatenate([packable_rows[first[missed]],unpackable_rows])
+            if len(to_score):
+                scored=model.predict(x.iloc[to_score] if isinstance(x,pd.DataFrame) else np.asarray(x)[to_score])
+                for index,prediction in zip(missed.tolist(),scored):
+                    unique_predictions[index]=prediction
+                with self.lock:
+                    # Predictions from a model that was swapped out meanwhile
+                    # are returned but not cached.
+                    if model is self.model:
+                        for key,prediction in zip(unique_keys[missed].tolist(),scored):
+                            self.entries[key]=prediction
+                        while len(self.entries)>self.max_entries:
+                            self.entries.popitem(last=False)
+                            self.evictions+=1
+
+            values=np.array(unique_predictions+list(scored[len(missed):]))
+            positions=np.empty(len(keys),dtype=np.int64)
+            positions[packable_rows]=inverse.reshape(-1)
+            positions[unpackable_rows]=len(unique_keys)+np.arange(len(unpackable_rows))
+            return values[positions]
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def stats(self) -> dict:
+
+        try:
+            with self.lock:
+                lookups=self.hits+self.misses
+                return {"entries":len(self.entries),
+                        "hits":self.hits,
+                        "misses":self.misses,
+                        "hit_rate":self.hits/lookups if lookups else 0.0,
+                        "evictions":self.evictions,
+                        "invalidations":self.invalidations}
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
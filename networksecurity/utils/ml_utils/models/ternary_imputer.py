@@ -0,0 +1,265 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from sklearn.base import BaseEstimator,TransformerMixin
+from sklearn.utils.validation import check_array,check_is_fitted
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+TERNARY_VALUES = (-1,0,1)
+# Upper bound on query x donor x word cells materialised per distance block.
+DISTANCE_BLOCK_CELLS: int = 1<<22
+# A missing-value pattern needs this many distinct queries before sorting the
+# donors into a lookup table pays off over the distance scan.
+LOOKUP_MIN_QUERIES: int = 16
+
+_BYTE_POPCOUNT=np.array([bin(value).count("1") for value in range(256)],dtype=np.uint8)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+
+    if hasattr(np,"bitwise_count"):
+        return np.bitwise_count(words)
+    counts=_BYTE_POPCOUNT[words.view(np.uint8)]
+    return counts.reshape(words.shape+(8,)).sum(axis=-1,dtype=np.uint8)
+
+
+def pack_bits(mask: np.ndarray) -> np.ndarray:
+
+    packed=np.packbits(mask,axis=1,bitorder="little")
+    n_words=max(1,(packed.shape[1]+7)//8)
+    words=np.zeros((mask.shape[0],n_words*8),dtype=np.uint8)
+    words[:,:packed.shape[1]]=packed
+    return words.view(np.uint64)
+
+
+class TernaryKNNImputer(TransformerMixin,BaseEstimator):
+
+    def __init__(self,n_neighbors:int=3,missing_values=np.nan,n_jobs:int=1):
+        self.n_neighbors=n_neighbors
+        self.missing_values=missing_values
+        self.n_jobs=n_jobs
+
+    def _validate(self,X,fitted:bool):
+
+        X=check_array(X,dtype=np.float64,ensure_all_finite="allow-nan",copy=True)
+        if self.missing_values is not np.nan and not (isinstance(self.missing_values,float) and np.isnan(self.missing_values)):
+            X[X==self.missing_values]=np.nan
+        missing=np.isnan(X)
+        observed=X[~missing]
+        if not np.isin(observed,TERNARY_VALUES).all():
+            raise ValueError(f"TernaryKNNImputer only supports features with values in {TERNARY_VALUES}")
+        if fitted and X.shape[1]!=self.n_features_in_:
+            raise ValueError(f"X has {X.shape[1]} features, but the imputer was fitted with {self.n_features_in_}")
+        return X,missing
+
+    def fit(self,X,y=None,sample_weight=None):
+
+        try:
+            X,missing=self._validate(X,fitted=False)
+            weights=np.ones(len(X)) if sample_weight is None else np.asarray(sample_weight,dtype=np.float64)
+            self.n_features_in_=X.shape[1]
+            self.n_observed_=weights@(~missing)
+            with np.errstate(invalid="ignore",divide="ignore"):
+                self.statistics_=np.nan_to_num(weights@np.nan_to_num(X)/self.n_observed_)
+
+            # Duplicate donor rows collapse into one bit-packed pattern with a
+            # count, so distances are computed once per distinct pattern. A
+            # sample weight counts a row that many times.
+            complete_rows=~missing.any(axis=1)
+            donors,inverse=np.unique(X[complete_rows].astype(np.int8),axis=0,return_inverse=True)
+            self._set_donors(donors,np.rint(np.bincount(inverse.ravel(),weights=weights[complete_rows],minlength=len(donors))))
+            return self
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def partial_fit(self,X,y=None,sample_weight=None):
+
+        try:
+            if not hasattr(self,"donors_"):
+                return self.fit(X,sample_weight=sample_weight)
+            if not hasattr(self,"n_observed_"):
+                # Imputers pickled before the observed counts were kept are
+                # refitted on their retained donors, so the new rows are added
+                # to them instead of replacing them. Column means then come
+                # from the complete rows only.
+                donors,donor_counts=self.donors_,self.donor_counts_
+                self.n_observed_=np.full(self.n_features_in_,float(donor_counts.sum()))
+                with np.errstate(invalid="ignore",divide="ignore"):
+                    self.statistics_=np.nan_to_num(donor_counts@donors.astype(np.float64)/self.n_observed_)
+            X,missing=self._validate(X,fitted=True)
+            weights=np.ones(len(X)) if sample_weight is None else np.asarray(sample_weight,dtype=np.float64)
+            # Donors are merged by pattern and the column means updated from
+            # their observed counts, which gives the same imputer as fitting
+            # on all rows seen so far.
+            total=self.n_observed_+weights@(~missing)
+            sums=self.statistics_*self.n_observed_+weights@np.nan_to_num(X)
+            self.statistics_=np.where(total>0,sums/np.maximum(total,1e-12),0.0)
+            self.n_observed_=total
+
+            complete_rows=~missing.any(axis=1)
+            donors=np.concatenate([self.donors_,X[complete_rows].astype(np.int8)])
+            counts=np.concatenate([self.donor_counts_,weights[complete_rows]])
+            donors,inverse=np.unique(donors,axis=0,return_inverse=True)
+            self._set_donors(donors,np.rint(np.bincount(inverse.ravel(),weights=counts,minlength=len(donors))))
+            return self
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def _set_donors(self,donors,donor_counts):
+
+        self.donors_=donors
+        self.donor_counts_=np.asarray(donor_counts).astype(np.int64)
+        self.donor_positive_=pack_bits(donors==1)
+        self.donor_negative_=pack_bits(donors==-1)
+
+    def _neighbour_mean(self,candidates,valid):
+
+        counts=np.where(valid,self.donor_counts_[candidates],0)
+        taken_before=np.cumsum(counts,axis=1)-counts
+        weights=np.clip(self.n_neighbors-taken_before,0,counts).astype(np.float64)
+        weights/=weights.sum(axis=1,keepdims=True)
+        return np.einsum("qk,qkd->qd",weights,self.donors_[candidates].astype(np.float64))
+
+    def _impute_lookup(self,positive,negative,observed):
+
+        # For up to 32 features a row's bit planes fit in one uint64 key, so
+        # donors can be sorted per missing-value pattern and probed directly.
+        # Each query probes its own key (distance 0) and every key one 0<->+-1
+        # step away on a single observed feature (distance 1). When those hold
+        # at least k donor rows they are exactly the k nearest, no scan needed.
+        n_queries=len(positive)
+        resolved=np.zeros(n_queries,dtype=bool)
+        imputed=np.zeros((n_queries,self.n_features_in_),dtype=np.float64)
+        if self.n_features_in_>32:
+            return resolved,imputed
+
+        n_donors=len(self.donors_)
+        k=self.n_neighbors
+        donor_positive=self.donor_positive_[:,0]
+        donor_negative=self.donor_negative_[:,0]
+        masks,mask_inverse=np.unique(observed[:,0],return_inverse=True)
+        for mask_index,mask in enumerate(masks):
+            selected=np.flatnonzero(mask_inverse.reshape(-1)==mask_index)
+            if len(selected)<LOOKUP_MIN_QUERIES:
+                continue
+            donor_keys=(donor_positive&mask)|((donor_negative&mask)<<np.uint64(32))
+            order=np.argsort(donor_keys,kind="stable")
+            sorted_keys=donor_keys[order]
+            cumulative=np.concatenate([[0],np.cumsum(self.donor_counts_[order])])
+
+            bits=np.flatnonzero((mask>>np.arange(32,dtype=np.uint64))&np.uint64(1)).astype(np.uint64)
+            positive_bits=np.uint64(1)<<bits
+            negative_bits=np.uint64(1)<<(bits+np.uint64(32))
+            n_probes=1+2*len(bits)
+            chunk_size=max(1,DISTANCE_BLOCK_CELLS//(n_probes*k))
+            for chunk in range(0,len(selected),chunk_size):
+                queries=selected[chunk:chunk+chunk_size]
+                keys=(positive[queries,0]|(negative[queries,0]<<np.uint64(32)))[:,None]
+                is_negative=(keys&negative_bits)!=0
+                is_zero=((keys&positive_bits)==0)&~is_negative
+                step=keys^np.where(is_negative,negative_bits,positive_bits)
+                probes=np.hstack([keys,step,keys|negative_bits])
+                low=np.searchsorted(sorted_keys,probes,side="left")
+                high=np.searchsorted(sorted_keys,probes,side="right")
+                high[:,1+len(bits):]=np.where(is_zero,high[:,1+len(bits):],low[:,1+len(bits):])
+
+                enough=(cumulative[high]-cumulative[low]).sum(axis=1)>=k
+                if not enough.any():
+                    continue
+                queries,low,high=queries[enough],low[enough],high[enough]
+
+                # Within one probe, patterns are in pattern order, so the first
+                # k of each probe are enough to rank ties like the scan does.
+                positions=low[:,:,None]+np.arange(k)
+                valid=positions<high[:,:,None]
+                candidates=order[np.minimum(positions,len(order)-1)]
+                distance=np.ones(n_probes,dtype=np.int64)
+                distance[0]=0
+                ranking=np.where(valid,distance[None,:,None]*n_donors+candidates,2*n_donors)
+                ranking=ranking.reshape(len(queries),-1)
+                nearest=np.argsort(ranking,axis=1,kind="stable")[:,:k]
+                candidates=np.take_along_axis(candidates.reshape(len(queries),-1),nearest,axis=1)
+                valid=np.take_along_axis(valid.reshape(len(queries),-1),nearest,axis=1)
+                imputed[queries]=self._neighbour_mean(candidates,valid)
+                resolved[queries]=True
+        return resolved,imputed
+
+    def _impute_block(self,positive,negative,observed):
+
+        # Squared euclidean distance between ternary rows from bit planes:
+        # a sign mismatch on one plane costs 1, opposite signs cost 4.
+        query_positive=positive[:,None,:]
+        query_negative=negative[:,None,:]
+        query_observed=observed[:,None,:]
+        donor_positive=self.donor_positive_[None,:,:]
+        donor_negative=self.donor_negative_[None,:,:]
+
+        distance=popcount((query_positive^donor_positive)&query_observed).sum(axis=2,dtype=np.int32)
+        distance+=popcount((query_negative^donor_negative)&query_observed).sum(axis=2,dtype=np.int32)
+        opposite=((query_positive&donor_negative)|(query_negative&donor_positive))&query_observed
+        distance+=2*popcount(opposite).sum(axis=2,dtype=np.int32)
+
+        # Every pattern stands for at least one donor row, so the k nearest
+        # rows always come from the k nearest patterns. Ties are broken by
+        # pattern order, the same order the lookup tier uses.
+        n_donors=distance.shape[1]
+        ranking=distance.astype(np.int64)*n_donors+np.arange(n_donors)
+        n_candidates=min(self.n_neighbors,n_donors)
+        candidates=np.argpartition(ranking,n_candidates-1,axis=1)[:,:n_candidates]
+        order=np.argsort(np.take_along_axis(ranking,candidates,axis=1),axis=1)
+        candidates=np.take_along_axis(candidates,order,axis=1)
+
+        return self._neighbour_mean(candidates,np.ones(candidates.shape,dtype=bool))
+
+    def transform(self,X):
+
+        try:
+            check_is_fitted(self,"donors_")
+            X,missing=self._validate(X,fitted=True)
+            rows=np.flatnonzero(missing.any(axis=1))
+            if len(rows)==0:
+                return X
+            if len(self.donors_)==0:
+                X[missing]=np.take(self.statistics_,np.nonzero(missing)[1])
+                return X
+
+            queries=np.nan_to_num(X[rows]).astype(np.int8)
+            query_missing=missing[rows]
+            positive=pack_bits(queries==1)
+            negative=pack_bits(queries==-1)
+            observed=pack_bits(~query_missing)
+
+            # Rows that share observed values and missing positions get the
+            # same answer, so each distinct query pattern is resolved once.
+            keys=np.hstack([positive,negative,observed])
+            _,first,inverse=np.unique(keys,axis=0,return_index=True,return_inverse=True)
+            inverse=inverse.reshape(-1)
+            positive,negative,observed=positive[first],negative[first],observed[first]
+
+            resolved,imputed=self._impute_lookup(positive,negative,observed)
+            pending=np.flatnonzero(~resolved)
+
+            n_words=positive.shape[1]
+            block_size=max(1,DISTANCE_BLOCK_CELLS//max(1,len(self.donors_)*n_words))
+            blocks=[pending[start:start+block_size] for start in range(0,len(pending),block_size)]
+            impute=lambda block: self._impute_block(positive[block],negative[block],observed[block])
+            if self.n_jobs is not None and self.n_jobs!=1 and len(blocks)>1:
+                max_workers=None if self.n_jobs<0 else self.n_jobs
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    results=list(executor.map(impute,blocks))
+            else:
+                results=[impute(block) for block in blocks]
+            for block,result in zip(blocks,results):
+                imputed[block]=result
+
+            filled=X[rows]
+            filled[query_missing]=imputed[inverse][query_missing]
+            X[rows]=filled
+            return X
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
@@ -0,0 +1,198 @@
+import sys
+import math
+import time
+
+import numpy as np
+from joblib import Parallel,delayed
+from sklearn.model_selection import ParameterGrid,check_cv
+from sklearn.base import is_classifier
+from sklearn.utils import resample
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.ml_utils.search.parallel_search import ParallelSearchExecutor,encode_folds,fit_and_score,refit
+
+
+class BudgetedSearchExecutor(ParallelSearchExecutor):
+
+    def __init__(self,n_jobs:int=-1,cv:int=3,on_result=None,factor:int=3,min_samples:int=1000,
+                 time_budget:float=None,dominance_margin:float=.02,random_state:int=42):
+
+        try:
+            super().__init__(n_jobs=n_jobs,cv=cv,on_result=on_result)
+            self.factor=factor
+            self.min_samples=min_samples
+            self.time_budget=time_budget
+            self.dominance_margin=dominance_margin
+            self.random_state=random_state
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def get_schedule(self,n_candidates:int) -> list:
+
+        try:
+            # Enough rungs to cut the candidates down by `factor` each time,
+            # the last rung running at full resources.
+            n_rungs=max(1,math.ceil(math.log(n_candidates)/math.log(self.factor))) if n_candidates>1 else 0
+            return [float(self.factor)**-(n_rungs-1-rung) for rung in range(n_rungs)]
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def scale_params(self,estimator,params:dict,scale:float) -> dict:
+
+        try:
+            # Ensembles are also cut down in size on early rungs; a candidate
+            # never gets more estimators than it asked for.
+            n_estimators=params.get("n_estimators",estimator.get_params().get("n_estimators"))
+            if n_estimators is None or scale>=1:
+                return params
+            return {**params,"n_estimators":max(1,math.ceil(n_estimators*scale))}
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def get_sample(self,estimator,y,scale:float) -> np.ndarray:
+
+        try:
+            n_samples=min(len(y),max(self.min_samples,math.ceil(len(y)*scale)))
+            if n_samples>=len(y):
+                return np.arange(len(y))
+            stratify=y if is_classifier(estimator) else None
+            return resample(np.arange(len(y)),n_samples=n_samples,replace=False,stratify=stratify,random_state=self.random_state)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def get_rung_folds(self,estimator,y,scale:float):
+
+        try:
+            # Folds over the rung's sample are mapped back to rows of the full
+            # dataset, so workers index the shared arrays and no sample is
+            # copied out for them. Rows outside the sample get fold -1; the
+            # vector lives only as long as the rung's tasks.
+            indices=self.get_sample(estimator,y,scale)
+            folds=check_cv(self.cv,y[indices],classifier=is_classifier(estimator)).split(np.empty((len(indices),0)),y[indices])
+            return encode_folds([(indices[train],indices[test]) for train,test in folds],len(y)),len(indices)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def run_rung(self,parallel,name,estimator,candidates:list,X,y,sample_weight,scale:float,keep:int,deadline:float) -> tuple:
+
+        try:
+            fold_ids,n_samples=self.get_rung_folds(estimator,y,scale)
+            n_folds=int(fold_ids.max())+1
+            score_sums=np.zeros(len(candidates))
+            fold_counts=np.zeros(len(candidates),dtype=int)
+            scores=np.full((len(candidates),n_folds),np.nan)
+            fit_times=np.zeros((len(candidates),n_folds))
+            usages=[[None]*n_folds for _ in candidates]
+            dropped=np.zeros(len(candidates),dtype=bool)
+
+            # Fold-major order gives every candidate a first score early, which
+            # is what the dominance check below works from.
+            def tasks():
+                for fold in range(n_folds):
+                    for index,params in enumerate(candidates):
+                        if dropped[index]:
+                            continue
+                        if deadline is not None and time.monotonic()>deadline:
+                            return
+                        yield delayed(fit_and_score)((index,fold),estimator,self.scale_params(estimator,params,scale),
+                                                     X,y,sample_weight,fold_ids,fold)
+
+            for (index,fold),score,fit_time,error,usage in parallel(tasks()):
+                scores[index,fold]=score
+                fit_times[index,fold]=fit_time
+                usages[index][fold]=usage
+                if dropped[index]:
+                    continue
+                if np.isnan(score):
+                    dropped[index]=True
+                    continue
+                score_sums[index]+=score
+                fold_counts[index]+=1
+                if fold_counts[index]==n_folds:
+                    self.report_candidate((name,candidates[index]),scores[index],fit_times[index],
+                                          n_samples=n_samples,resource_scale=scale,**self.summarize_usage(usages[index]))
+
+                # A candidate whose partial mean trails the last promoted slot
+                # by more than the margin is dominated and gets no more folds.
+                started=np.flatnonzero((fold_counts>0) & ~dropped)
+                if len(started)>keep:
+                    partial=score_sums[started]/fold_counts[started]
+                    threshold=np.partition(partial,len(partial)-keep)[len(partial)-keep]
+                    dropped[started[partial<threshold-self.dominance_margin]]=True
+
+            # Mean scores of the candidates that finished every fold, and the
+            # partial means of those the deadline cut short.
+            complete=(fold_counts==n_folds) & ~dropped
+            partial=(fold_counts>0) & ~complete & ~dropped
+            return ({int(index):score_sums[index]/n_folds for index in np.flatnonzero(complete)},
+                    {int(index):score_sums[index]/fold_counts[index] for index in np.flatnonzero(partial)})
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def search_family(self,parallel,name,estimator,params:dict,X,y,sample_weight) -> dict:
+
+        try:
+            candidates=list(ParameterGrid(params))
+            schedule=self.get_schedule(len(candidates))
+            deadline=None if self.time_budget is None else time.monotonic()+self.time_budget
+            survivors=list(range(len(candidates)))
+            leader=0 if len(candidates)==1 else None
+
+            for rung,scale in enumerate(schedule):
+                keep=1 if rung==len(schedule)-1 else max(1,math.ceil(len(survivors)/self.factor))
+                rung_scores,partial_scores=self.run_rung(parallel,name,estimator,[candidates[index] for index in survivors],
+                                                         X,y,sample_weight,scale,keep,deadline)
+                out_of_time=deadline is not None and time.monotonic()>deadline
+                if not rung_scores and not out_of_time:
+                    raise ValueError(f"All candidate fits failed for {name} at rung {rung}")
+                if rung_scores:
+                    ranked=sorted(rung_scores,key=lambda index: -rung_scores[index])
+                    leader=survivors[ranked[0]]
+                    survivors=[survivors[index] for index in ranked[:keep]]
+                logging.info(f"{name} rung {rung}: scale {scale:.4f}, {len(rung_scores)} complete, {len(survivors)} promoted")
+                if out_of_time:
+                    logging.info(f"{name} search stopped at rung {rung}: time budget of {self.time_budget}s exhausted")
+                    if leader is None and partial_scores:
+                        best=max(partial_scores,key=partial_scores.get)
+                        leader=survivors[best]
+                        logging.warning(f"{name}: no candidate finished all folds within the time budget, "
+                                        f"picking {candidates[leader]} on a partial mean of {partial_scores[best]:.4f}")
+                    break
+
+            if leader is None:
+                raise ValueError(f"No candidate for {name} was scored within the time budget of {self.time_budget}s")
+            return candidates[leader]
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def search(self,models:dict,params:dict,X,y,sample_weight=None) -> dict:
+
+        try:
+            X=np.asarray(X)
+            y=np.asarray(y)
+            sample_weight=None if sample_weight is None else np.asarray(sample_weight,dtype=np.float64)
+            self.results=[]
+            best_params={}
+
+            # Families run one after another so each gets its own wall-clock
+            # budget; the worker pool, and joblib's memory map of the data, are
+            # kept alive across all of them.
+            with Parallel(n_jobs=self.n_jobs,return_as="generator_unordered") as parallel:
+                for name,estimator in models.items():
+                    best_params[name]=self.search_family(parallel,name,estimator,params.get(name,{}),X,y,sample_weight)
+                    logging.info(f"Best params for {name}: {best_params[name]}")
+
+            fitted=Parallel(n_jobs=self.n_jobs)(delayed(refit)(models[name],best_params[name],X,y,sample_weight) for name in models)
+            return dict(zip(models,fitted))
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
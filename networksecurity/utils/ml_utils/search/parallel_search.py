@@ -0,0 +1,213 @@
+import sys
+import warnings
+
+import numpy as np
+from joblib import Parallel,delayed
+from sklearn.base import clone,is_classifier
+from sklearn.model_selection import ParameterGrid,check_cv
+from sklearn.utils.validation import has_fit_parameter
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.stage_profiler import resource_snapshot,resource_usage
+
+
+def encode_folds(folds:list,n_rows:int) -> np.ndarray:
+
+    try:
+        # One small integer per row: the fold whose test set holds it, or -1
+        # for rows left out of the search. Every task gets this vector and a
+        # fold number instead of its own train and test index arrays.
+        fold_ids=np.full(n_rows,-1,dtype=np.min_scalar_type(-len(folds)))
+        for fold,(train,test) in enumerate(folds):
+            if (fold_ids[test]!=-1).any():
+                raise ValueError("Test folds overlap; the search needs a cv that partitions the rows")
+            fold_ids[test]=fold
+        n_searched=np.count_nonzero(fold_ids>=0)
+        if any(len(train)+len(test)!=n_searched for train,test in folds):
+            raise ValueError("A fold leaves searched rows out; the search needs a cv that partitions the rows")
+        return fold_ids
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def fit_and_score(task,estimator,params:dict,X,y,sample_weight,fold_ids:np.ndarray,fold:int):
+
+    # Runs inside a worker process. Invalid parameter combinations score NaN
+    # instead of failing the whole search, like GridSearchCV's error_score.
+    # One task runs at a time per worker, so the CPU and I/O measured here
+    # belong to this fit alone. The peak RSS is not reset: with one job the
+    # fit runs in the main process, inside the model_trainer stage's window.
+    # X, y and the weights arrive as joblib memory maps shared by all workers.
+    start=resource_snapshot(reset_peak=False)
+    score,error=np.nan,None
+    train=np.flatnonzero((fold_ids>=0) & (fold_ids!=fold))
+    test=np.flatnonzero(fold_ids==fold)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model=fit_weighted(clone(estimator).set_params(**params),X,y,sample_weight,rows=train)
+            # Weights of deduplicated rows apply to the score of every candidate.
+            if sample_weight is None:
+                score=model.score(X[test],y[test])
+            else:
+                score=model.score(X[test],y[test],sample_weight=sample_weight[test])
+    except Exception as e:
+        error=repr(e)
+    usage=resource_usage(start)
+    usage.update(rows_in=len(train),rows_out=len(test))
+    return task,score,usage["wall_seconds"],error,usage
+
+
+def fit_weighted(model,X,y,sample_weight=None,rows=None):
+
+    # Fits on rows (all when None) of deduplicated data. Estimators without
+    # sample_weight support get each row repeated as often as it was seen, so
+    # they learn from the same raw rows their weighted scores describe.
+    if sample_weight is not None and not has_fit_parameter(model,"sample_weight"):
+        rows=np.arange(len(y)) if rows is None else rows
+        rows=np.repeat(rows,np.rint(sample_weight[rows]).astype(np.int64))
+        sample_weight=None
+    if rows is not None:
+        X,y=X[rows],y[rows]
+        sample_weight=None if sample_weight is None else sample_weight[rows]
+    return model.fit(X,y) if sample_weight is None else model.fit(X,y,sample_weight=sample_weight)
+
+
+def refit(estimator,params:dict,X,y,sample_weight=None):
+    return fit_weighted(clone(estimator).set_params(**params),X,y,sample_weight)
+
+
+class ParallelSearchExecutor:
+
+    def __init__(self,n_jobs:int=-1,cv:int=3,on_result=None):
+
+        try:
+            self.n_jobs=n_jobs
+            self.cv=cv
+            self.on_result=on_result
+            self.results=[]
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def get_candidates(self,models:dict,params:dict):
+
+        try:
+            return [(name,candidate) for name in models for candidate in ParameterGrid(params.get(name,{}))]
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def get_folds(self,models:dict,X,y):
+
+        try:
+            classifier=all(is_classifier(model) for model in models.values())
+            return encode_folds(list(check_cv(self.cv,y,classifier=classifier).split(X,y)),len(y))
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def search(self,models:dict,params:dict,X,y,sample_weight=None) -> dict:
+
+        try:
+            X=np.asarray(X)
+            y=np.asarray(y)
+            sample_weight=None if sample_weight is None else np.asarray(sample_weight,dtype=np.float64)
+            candidates=self.get_candidates(models,params)
+            fold_ids=self.get_folds(models,X,y)
+            return self.run_search(models,candidates,X,y,sample_weight,fold_ids)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def run_search(self,models:dict,candidates:list,X,y,sample_weight,fold_ids:np.ndarray) -> dict:
+
+        try:
+            n_folds=int(fold_ids.max())+1
+            logging.info(f"Searching {len(candidates)} candidates x {n_folds} folds across {len(models)} models")
+
+            # One flat task list over every (model, params, fold) so a single
+            # pool stays busy instead of searching one model family at a time.
+            # Bigger ensembles are dispatched first so the pool does not end on
+            # a long tail of 256-tree fits running on a single worker.
+            tasks=[(index,fold) for index in range(len(candidates)) for fold in range(n_folds)]
+            tasks.sort(key=lambda task: -candidates[task[0]][1].get("n_estimators",1))
+            scores=np.full((len(candidates),n_folds),np.nan)
+            fit_times=np.zeros((len(candidates),n_folds))
+            usages=[[None]*n_folds for _ in candidates]
+            remaining=np.full(len(candidates),n_folds)
+            self.results=[]
+
+            # joblib writes X, y and the weights once to a memory-mapped file
+            # that every worker maps, and removes it when the search is done.
+            parallel=Parallel(n_jobs=self.n_jobs,return_as="generator_unordered")
+            outputs=parallel(delayed(fit_and_score)((index,fold),models[candidates[index][0]],candidates[index][1],
+                                                    X,y,sample_weight,fold_ids,fold)
+                             for index,fold in tasks)
+            for (index,fold),score,fit_time,error,usage in outputs:
+                if error is not None:
+                    logging.warning(f"Candidate {candidates[index]} failed on fold {fold}: {error}")
+                scores[index,fold]=score
+                fit_times[index,fold]=fit_time
+                usages[index][fold]=usage
+                remaining[index]-=1
+                if remaining[index]==0:
+                    self.report_candidate(candidates[index],scores[index],fit_times[index],**self.summarize_usage(usages[index]))
+
+            # Candidates with a failed fold rank last, as in GridSearchCV.
+            mean_scores=scores.mean(axis=1)
+            mean_scores[np.isnan(mean_scores)]=-np.inf
+            best_params={}
+            for name in models:
+                indices=[index for index,(model_name,_) in enumerate(candidates) if model_name==name]
+                best=indices[int(np.argmax(mean_scores[indices]))]
+                if np.isinf(mean_scores[best]):
+                    raise ValueError(f"All candidate fits failed for {name}")
+                best_params[name]=candidates[best][1]
+
+            # A single refit per family on the full training set, also run in
+            # parallel; it replaces the set_params + fit the caller used to do.
+            fitted=Parallel(n_jobs=self.n_jobs)(delayed(refit)(models[name],best_params[name],X,y,sample_weight) for name in models)
+            best_models=dict(zip(models,fitted))
+
+            for name in models:
+                logging.info(f"Best params for {name}: {best_params[name]}")
+            return best_models
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    @staticmethod
+    def summarize_usage(usages:list) -> dict:
+
+        try:
+            # Totals over the candidate's folds; peak RSS is the largest worker
+            # peak seen while fitting it.
+            summary={key:sum(usage[key] for usage in usages)
+                     for key in ("cpu_seconds","rows_in","rows_out")}
+            for key in ("read_bytes","write_bytes","peak_rss_bytes"):
+                values=[usage[key] for usage in usages if usage[key] is not None]
+                summary[key]=(max(values) if key=="peak_rss_bytes" else sum(values)) if values else None
+            return summary
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def report_candidate(self,candidate,scores,fit_times,**extra):
+
+        try:
+            name,params=candidate
+            result={"model":name,
+                    "params":params,
+                    "mean_test_score":float(np.mean(scores)),
+                    "std_test_score":float(np.std(scores)),
+                    "mean_fit_time":float(np.mean(fit_times)),
+                    **extra}
+            self.results.append(result)
+            if self.on_result is not None:
+                self.on_result(result)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
@@ -0,0 +1,186 @@
+import sys
+from typing import List
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtri
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+SYNTHETIC_CHUNK_ROWS: int = 1<<18
+CALIBRATION_ROUNDS: int = 6
+CALIBRATION_ROWS: int = 200_000
+MAX_LATENT_CORRELATION: float = .999
+
+
+def correlation_matrix(values: np.ndarray) -> np.ndarray:
+
+    try:
+        # Constant columns have no correlation with anything; they get 0
+        # instead of NaN so the matrices can be compared and corrected.
+        values=np.asarray(values,dtype=np.float64)
+        centered=values-np.nanmean(values,axis=0)
+        centered=np.nan_to_num(centered)
+        scale=np.sqrt((centered**2).sum(axis=0))
+        scale[scale==0]=np.inf
+        correlation=(centered.T@centered)/np.outer(scale,scale)
+        np.fill_diagonal(correlation,1.0)
+        return correlation
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+def nearest_correlation(matrix: np.ndarray) -> np.ndarray:
+
+    try:
+        # Clips negative eigenvalues and rescales to a unit diagonal, which is
+        # enough to keep the Cholesky factor defined after each correction.
+        matrix=(matrix+matrix.T)/2
+        eigenvalues,eigenvectors=np.linalg.eigh(matrix)
+        matrix=(eigenvectors*np.maximum(eigenvalues,1e-6))@eigenvectors.T
+        scale=np.sqrt(np.diag(matrix))
+        return matrix/np.outer(scale,scale)
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+
+class GaussianCopulaGenerator:
+
+    def __init__(self,columns:List[str],levels:List[np.ndarray],thresholds:List[np.ndarray],
+                 missing_rates:np.ndarray,latent_correlation:np.ndarray,dtypes:dict):
+
+        try:
+            # Every column is discrete: a row draws one correlated standard
+            # normal per column and each normal is cut into the column's levels
+            # at the quantiles of its observed distribution. The cuts keep the
+            # marginals exact, the latent correlation carries the dependence.
+            self.columns=columns
+            self.levels=levels
+            self.thresholds=thresholds
+            self.missing_rates=np.asarray(missing_rates,dtype=np.float64)
+            self.latent_correlation=latent_correlation
+            self.cholesky=np.linalg.cholesky(latent_correlation)
+            self.dtypes=dtypes
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    @classmethod
+    def from_dataframe(cls,dataframe:pd.DataFrame,calibration_rounds:int=CALIBRATION_ROUNDS,
+                       calibration_rows:int=CALIBRATION_ROWS,seed:int=0) -> "GaussianCopulaGenerator":
+
+        try:
+            columns=list(dataframe.columns)
+            levels,thresholds,scores,missing_rates=[],[],[],[]
+            for column in columns:
+                series=dataframe[column]
+                counts=series.dropna().value_counts().sort_index()
+                probabilities=counts.to_numpy(dtype=np.float64)/counts.sum()
+                cumulative=np.cumsum(probabilities)
+                levels.append(counts.index.to_numpy())
+                thresholds.append(ndtri(np.clip(cumulative[:-1],1e-12,1-1e-12)))
+                # Normal scores at the middle of each level's quantile band.
+                midpoints=ndtri(np.clip(cumulative-probabilities/2,1e-12,1-1e-12))
+                codes=np.searchsorted(levels[-1],series.to_numpy(dtype=np.float64,na_value=np.nan))
+                scores.append(np.where(series.isna().to_numpy(),np.nan,midpoints[np.minimum(codes,len(midpoints)-1)]))
+                missing_rates.append(series.isna().mean())
+            dtypes={column:dataframe[column].dtype for column in columns}
+
+            target=correlation_matrix(dataframe.to_numpy(dtype=np.float64,na_value=np.nan))
+            latent=nearest_correlation(correlation_matrix(np.column_stack(scores)))
+            generator=cls(columns,levels,thresholds,missing_rates,latent,dtypes)
+
+            # Cutting normals into a few levels shrinks their correlation, so the
+            # latent matrix is corrected until the sampled levels match the
+            # observed pairwise correlations.
+            rng=np.random.default_rng(seed)
+            for _ in range(calibration_rounds):
+                achieved=correlation_matrix(generator.sample_values(calibration_rows,rng,with_missing=False))
+                latent=np.clip(latent+target-achieved,-MAX_LATENT_CORRELATION,MAX_LATENT_CORRELATION)
+                np.fill_diagonal(latent,1.0)
+                generator=cls(columns,levels,thresholds,missing_rates,nearest_correlation(latent),dtypes)
+            return generator
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def sample_values(self,n_rows:int,rng:np.random.Generator,with_missing:bool=True) -> np.ndarray:
+
+        try:
+            latent=rng.standard_normal((n_rows,len(self.columns)))@self.cholesky.T
+            values=np.empty(latent.shape,dtype=np.float64)
+            for index,(levels,thresholds) in enumerate(zip(self.levels,self.thresholds)):
+                values[:,index]=levels[np.searchsorted(thresholds,latent[:,index])]
+            if with_missing and self.missing_rates.any():
+                values[rng.random(values.shape)<self.missing_rates]=np.nan
+            return values
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def to_dataframe(self,values:np.ndarray) -> pd.DataFrame:
+
+        try:
+            data={}
+            for index,column in enumerate(self.columns):
+                dtype=self.dtypes[column]
+                column_values=values[:,index]
+                missing=np.isnan(column_values)
+                if not missing.any():
+                    data[column]=column_values.astype(dtype.numpy_dtype if hasattr(dtype,"numpy_dtype") else dtype)
+                elif pd.api.types.is_integer_dtype(dtype):
+                    numpy_dtype=getattr(dtype,"numpy_dtype",dtype)
+                    data[column]=pd.arrays.IntegerArray(np.where(missing,0,column_values).astype(numpy_dtype),missing)
+                else:
+                    data[column]=column_values
+            return pd.DataFrame(data,columns=self.columns)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def iter_chunks(self,n_rows:int,chunk_rows:int=SYNTHETIC_CHUNK_ROWS,seed:int=None):
+
+        try:
+            # Rows are drawn chunk by chunk, so any size can be generated in
+            # bounded memory; the same seed and chunk size give the same rows.
+            if n_rows<0:
+                raise ValueError(f"n_rows must be non-negative, got {n_rows}")
+            rng=np.random.default_rng(seed)
+            for start in range(0,n_rows,chunk_rows):
+                yield self.to_dataframe(self.sample_values(min(chunk_rows,n_rows-start),rng))
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def sample(self,n_rows:int,seed:int=None) -> pd.DataFrame:
+
+        try:
+            chunks=list(self.iter_chunks(n_rows,seed=seed))
+            if not chunks:
+                return pd.DataFrame({column:pd.Series(dtype=self.dtypes[column]) for column in self.columns},columns=self.columns)
+            return pd.concat(chunks,ignore_index=True) if len(chunks)!=1 else chunks[0]
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+
+def fidelity_report(source:pd.DataFrame,synthetic:pd.DataFrame) -> dict:
+
+    try:
+        # Largest absolute gap in any level's frequency and in any pairwise
+        # correlation between the source and the generated rows.
+        marginal_errors=[]
+        for column in source.columns:
+            expected=source[column].value_counts(normalize=True,dropna=False)
+            observed=synthetic[column].value_counts(normalize=True,dropna=False).reindex(expected.index,fill_value=0)
+            marginal_errors.append(float(np.abs(expected-observed).max()))
+        correlation_errors=np.abs(correlation_matrix(source.to_numpy(dtype=np.float64,na_value=np.nan))
+                                  -correlation_matrix(synthetic.to_numpy(dtype=np.float64,na_value=np.nan)))
+        return {"max_marginal_error":max(marginal_errors),
+                "max_correlation_error":float(correlation_errors.max()),
+                "mean_correlation_error":float(correlation_errors[np.triu_indices_from(correlation_errors,1)].mean())}
+
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
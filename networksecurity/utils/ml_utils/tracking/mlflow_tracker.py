@@ -0,0 +1,229 @@
+import os
+import sys
+import time
+import queue
+import atexit
+import tempfile
+import itertools
+import threading
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+# MLflow's log_batch limits per request.
+MAX_BATCH_METRICS: int = 1000
+MAX_BATCH_PARAMS: int = 100
+MAX_PARAM_LENGTH: int = 6000
+# How long interpreter exit waits for queued events to reach the tracking
+# store; whatever is left after that is dropped.
+EXIT_TIMEOUT_SECONDS: float = 10.
+
+
+class MlflowTracker:
+
+    def __init__(self,tracking_uri:str=None,experiment_name:str=None,enabled:bool=True):
+
+        try:
+            # Callers only enqueue events; one background thread owns the MLflow
+            # client, so neither the search nor training ever waits on the
+            # tracking store. Runs are referred to by handles handed out here
+            # and mapped to MLflow run ids once the thread has created them.
+            self.tracking_uri=tracking_uri
+            self.experiment_name=experiment_name
+            self.enabled=enabled
+            self.events=queue.Queue()
+            self.handles=itertools.count()
+            self.run_ids={}
+            self.thread=None
+            self.lock=threading.Lock()
+            self.errors=0
+            # Child runs whose parent was never created; their events are skipped.
+            self.orphaned=set()
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def put(self,event:tuple):
+
+        try:
+            if not self.enabled:
+                return
+            with self.lock:
+                if self.thread is None:
+                    self.thread=threading.Thread(target=self.run,name="mlflow-tracker",daemon=True)
+                    self.thread.start()
+                    atexit.register(self.close,timeout=EXIT_TIMEOUT_SECONDS)
+            self.events.put(event)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def start_run(self,run_name:str=None,parent:int=None,tags:dict=None) -> int:
+
+        try:
+            handle=next(self.handles)
+            self.put(("start_run",handle,run_name,parent,tags or {}))
+            return handle
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def log_params(self,run:int,params:dict):
+
+        try:
+            self.put(("params",run,{str(key):str(value)[:MAX_PARAM_LENGTH] for key,value in params.items()}))
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def log_metrics(self,run:int,metrics:dict,step:int=0):
+
+        try:
+            timestamp=int(time.time()*1000)
+            self.put(("metrics",run,{str(key):float(value) for key,value in metrics.items()},timestamp,step))
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def log_model(self,run:int,model,artifact_path:str="model"):
+
+        try:
+            # The model is serialized on the tracker thread, so it must not be
+            # modified after this call.
+            self.put(("model",run,model,artifact_path))
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def end_run(self,run:int,status:str="FINISHED"):
+
+        try:
+            self.put(("end_run",run,status))
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def close(self,timeout:float=None):
+
+        try:
+            # Waits for everything queued so far to reach the tracking store,
+            # or at most timeout seconds; a slow or unreachable store must not
+            # hang interpreter exit.
+            with self.lock:
+                thread,self.thread=self.thread,None
+            if thread is not None:
+                self.events.put(None)
+                thread.join(timeout)
+                if thread.is_alive():
+                    logging.warning(f"MLflow tracking did not finish within {timeout}s, "
+                                    f"dropping {max(0,self.events.qsize()-1)} queued events")
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def get_client(self):
+
+        # mlflow is imported here, on the tracker thread, which keeps its
+        # import cost off the training thread and out of scoring processes.
+        import mlflow
+        from mlflow.tracking import MlflowClient
+
+        client=MlflowClient(tracking_uri=self.tracking_uri)
+        experiment_id="0"
+        if self.experiment_name:
+            experiment=client.get_experiment_by_name(self.experiment_name)
+            experiment_id=experiment.experiment_id if experiment is not None else client.create_experiment(self.experiment_name)
+        return mlflow,client,experiment_id
+
+    def flush_batches(self,client,batches:dict):
+
+        from mlflow.entities import Metric,Param
+
+        while batches:
+            handle,(metrics,params)=batches.popitem()
+            run_id=self.run_ids.get(handle)
+            if run_id is None:
+                if handle not in self.orphaned:
+                    logging.warning(f"MLflow metrics and params skipped, run {handle} was never created")
+                continue
+            metrics=[Metric(key,value,timestamp,step) for key,value,timestamp,step in metrics]
+            params=[Param(key,value) for key,value in params.items()]
+            while metrics or params:
+                client.log_batch(run_id,metrics=metrics[:MAX_BATCH_METRICS],params=params[:MAX_BATCH_PARAMS])
+                metrics,params=metrics[MAX_BATCH_METRICS:],params[MAX_BATCH_PARAMS:]
+
+    def handle_event(self,mlflow,client,experiment_id,event:tuple):
+
+        kind,handle=event[0],event[1]
+        if kind=="start_run":
+            _,_,run_name,parent,tags=event
+            tags=dict(tags)
+            if run_name:
+                tags["mlflow.runName"]=run_name
+            if parent is not None:
+                if parent not in self.run_ids:
+                    self.orphaned.add(handle)
+                    logging.warning(f"MLflow run {run_name} skipped, its parent run was never created")
+                    return
+                tags["mlflow.parentRunId"]=self.run_ids[parent]
+            self.run_ids[handle]=client.create_run(experiment_id,tags=tags).info.run_id
+            return
+        run_id=self.run_ids.get(handle)
+        if run_id is None:
+            if handle not in self.orphaned:
+                logging.warning(f"MLflow tracking event {kind} skipped, run {handle} was never created")
+            return
+        if kind=="model":
+            _,_,model,artifact_path=event
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                model_dir=os.path.join(tmp_dir,artifact_path)
+                mlflow.sklearn.save_model(model,model_dir,serialization_format="cloudpickle")
+                client.log_artifacts(run_id,model_dir,artifact_path)
+        elif kind=="end_run":
+            client.set_terminated(run_id,event[2])
+            del self.run_ids[handle]
+
+    def run(self):
+
+        try:
+            mlflow,client,experiment_id=self.get_client()
+        except Exception as e:
+            logging.error(f"MLflow tracking disabled, could not reach the tracking store: {e}")
+            self.enabled=False
+            mlflow=None
+
+        stopped=False
+        while not stopped:
+            # Everything already queued is handled in one pass; consecutive
+            # metrics and params of a run go out as a single log_batch call.
+            events=[self.events.get()]
+            while True:
+                try:
+                    events.append(self.events.get_nowait())
+                except queue.Empty:
+                    break
+            if mlflow is None:
+                stopped=None in events
+                continue
+            batches={}
+            for event in events:
+                if event is None:
+                    stopped=True
+                    continue
+                try:
+                    if event[0]=="metrics":
+                        _,handle,metrics,timestamp,step=event
+                        batches.setdefault(handle,([],{}))[0].extend((key,value,timestamp,step) for key,value in metrics.items())
+                    elif event[0]=="params":
+                        batches.setdefault(event[1],([],{}))[1].update(event[2])
+                    else:
+                        self.flush_batches(client,batches)
+                        self.handle_event(mlflow,client,experiment_id,event)
+                except Exception as e:
+                    self.errors+=1
+                    logging.error(f"MLflow tracking event {event[0]} failed: {e}")
+            try:
+                self.flush_batches(client,batches)
+            except Exception as e:
+                self.errors+=1
+                logging.error(f"MLflow tracking batch failed: {e}")
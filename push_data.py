@@ -1,6 +1,8 @@
 import os
 import sys
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor,wait,FIRST_COMPLETED
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -12,8 +14,13 @@ ca=certifi.where()
 import pandas as pd
 import numpy as np
 import pymongo 
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import read_yaml_file,write_yaml_file
+
+DUPLICATE_KEY_ERROR_CODE=11000
 
 class NetworkDataExtract():
 
@@ -52,13 +59,153 @@ class NetworkDataExtract():
         except Exception as e:
             raise NetworkSecurityException(e,sys)
         
+class NetworkDataBulkLoader():
+
+    def __init__(self,database,collection,mongo_client=None,chunk_size=5000,max_workers=4,checkpoint_file_path=None):
+
+        try:
+            self.chunk_size=chunk_size
+            self.max_workers=max_workers
+            self.checkpoint_file_path=checkpoint_file_path
+            if mongo_client is None:
+                mongo_client=pymongo.MongoClient(MONGO_DB_URL,maxPoolSize=max_workers)
+            self.mongo_client=mongo_client
+            self.collection=self.mongo_client[database][collection]
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def load_checkpoint(self,file_path):
+
+        try:
+            file_stat=os.stat(file_path)
+            fresh_checkpoint={
+                "file_path":os.path.abspath(file_path),
+                "file_size":file_stat.st_size,
+                "file_mtime":int(file_stat.st_mtime),
+                "chunk_size":self.chunk_size,
+                "load_started_at":int(time.time()),
+                "completed_chunks":[]
+            }
+            if self.checkpoint_file_path is None or not os.path.exists(self.checkpoint_file_path):
+                return fresh_checkpoint
+
+            checkpoint=read_yaml_file(self.checkpoint_file_path)
+            keys=["file_path","file_size","file_mtime","chunk_size"]
+            if any(checkpoint.get(key)!=fresh_checkpoint[key] for key in keys):
+                logging.info(f"Ignoring checkpoint {self.checkpoint_file_path}, it belongs to a different input")
+                return fresh_checkpoint
+
+            logging.info(f"Resuming load of {file_path}: {len(checkpoint['completed_chunks'])} chunks already loaded")
+            return checkpoint
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def save_checkpoint(self,checkpoint):
+
+        try:
+            if self.checkpoint_file_path is not None:
+                checkpoint["completed_chunks"]=sorted(checkpoint["completed_chunks"])
+                write_yaml_file(self.checkpoint_file_path,checkpoint,replace=True)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    @staticmethod
+    def chunk_to_documents(chunk:pd.DataFrame,first_row:int,load_started_at:int):
+
+        try:
+            if chunk.isna().any().any():
+                chunk=chunk.astype(object).where(chunk.notna(),None)
+            documents=chunk.to_dict("records")
+
+            # Ids are derived from the load start time and the row number, so
+            # they stay monotonic and a resumed load can safely resend a chunk.
+            id_prefix=load_started_at.to_bytes(4,"big")
+            for offset,document in enumerate(documents):
+                document["_id"]=ObjectId(id_prefix+(first_row+offset).to_bytes(8,"big"))
+            return documents
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def insert_documents(self,documents):
+
+        try:
+            self.collection.insert_many(documents,ordered=False)
+            return len(documents)
+
+        except BulkWriteError as bwe:
+            write_errors=bwe.details.get("writeErrors",[])
+            if all(error.get("code")==DUPLICATE_KEY_ERROR_CODE for error in write_errors):
+                return bwe.details.get("nInserted",0)
+            raise NetworkSecurityException(bwe,sys)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def load_csv(self,file_path):
+
+        try:
+            checkpoint=self.load_checkpoint(file_path)
+            completed_chunks=set(checkpoint["completed_chunks"])
+            inserted_rows=0
+            pending={}
+            start_time=time.perf_counter()
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                reader=pd.read_csv(file_path,chunksize=self.chunk_size)
+                for chunk_index,chunk in enumerate(reader):
+                    if chunk_index in completed_chunks:
+                        continue
+                    documents=NetworkDataBulkLoader.chunk_to_documents(chunk,chunk_index*self.chunk_size,checkpoint["load_started_at"])
+                    pending[executor.submit(self.insert_documents,documents)]=chunk_index
+
+                    # Keep a bounded number of chunks in flight so memory does
+                    # not grow with the size of the file.
+                    while len(pending)>=2*self.max_workers:
+                        done,_=wait(pending,return_when=FIRST_COMPLETED)
+                        inserted_rows+=self._collect(done,pending,checkpoint)
+
+                while pending:
+                    done,_=wait(pending,return_when=FIRST_COMPLETED)
+                    inserted_rows+=self._collect(done,pending,checkpoint)
+
+            elapsed=time.perf_counter()-start_time
+            rows_per_sec=inserted_rows/elapsed if elapsed>0 else 0.0
+            logging.info(f"Loaded {inserted_rows} rows from {file_path} in {elapsed:.2f}s ({rows_per_sec:.0f} rows/sec)")
+            return {"inserted_rows":inserted_rows,"elapsed_seconds":elapsed,"rows_per_sec":rows_per_sec}
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def _collect(self,done,pending,checkpoint):
+
+        # Every chunk that finished is checkpointed, even when another chunk
+        # in the same set failed, so a resumed load does not send it again.
+        inserted_rows=0
+        error=None
+        try:
+            for future in done:
+                chunk_index=pending.pop(future)
+                if future.exception() is not None:
+                    error=error or future.exception()
+                    continue
+                inserted_rows+=future.result()
+                checkpoint["completed_chunks"].append(chunk_index)
+        finally:
+            self.save_checkpoint(checkpoint)
+        if error is not None:
+            raise error
+        return inserted_rows
+        
 if __name__=='__main__':
 
-    FILE_PATH="Network_Data\phisingData.csv"
+    FILE_PATH=os.path.join("Network_Data","phisingData.csv")
     DATABASE="Whyrachit"
     Collection="Network_Data"
-    networkobj=NetworkDataExtract()
-    records=networkobj.cv_to_json_convertor(file_path=FILE_PATH)
-    print(records)
-    no_records=networkobj.insert_data_mongodb(records,DATABASE,Collection)
-    print(no_records)
\ No newline at end of file
+    CHECKPOINT_FILE_PATH=os.path.join("Network_Data","push_data_checkpoint.yaml")
+    loader=NetworkDataBulkLoader(DATABASE,Collection,checkpoint_file_path=CHECKPOINT_FILE_PATH)
+    load_report=loader.load_csv(FILE_PATH)
+    print(load_report)
\ No newline at end of file
@@ -0,0 +1,62 @@
+import time
+
+import numpy as np
+import pytest
+from joblib import Parallel
+from sklearn.base import BaseEstimator,ClassifierMixin
+
+from networksecurity.utils.ml_utils.search.budgeted_search import BudgetedSearchExecutor
+
+
+class SlowClassifier(ClassifierMixin,BaseEstimator):
+
+    # Predicts the right label for a `skill` share of the rows, after
+    # sleeping `fit_seconds` in fit.
+    def __init__(self,skill:float=.5,fit_seconds:float=.1):
+        self.skill=skill
+        self.fit_seconds=fit_seconds
+
+    def fit(self,X,y):
+        time.sleep(self.fit_seconds)
+        self.classes_=np.unique(y)
+        return self
+
+    def predict(self,X):
+        X=np.asarray(X)
+        return np.where(X[:,1]<self.skill,X[:,0],1-X[:,0]).astype(int)
+
+
+def labelled_data(n_rows=3000,seed=0):
+
+    rng=np.random.default_rng(seed)
+    y=rng.integers(0,2,n_rows)
+    return np.column_stack([y,rng.random(n_rows)]),y
+
+
+def search_family(executor,params):
+
+    X,y=labelled_data()
+    with Parallel(n_jobs=1,return_as="generator_unordered") as parallel:
+        return executor.search_family(parallel,"slow",SlowClassifier(),params,X,y,None)
+
+
+def test_picks_best_partial_mean_when_no_candidate_completes():
+
+    # With .1s fits the budget runs out within the first fold, before any
+    # candidate has been scored on all three.
+    executor=BudgetedSearchExecutor(n_jobs=1,cv=3,min_samples=10,time_budget=.25)
+    best=search_family(executor,{"skill":[.9,.2,.5,.6]})
+    assert best=={"skill":.9}
+
+
+def test_raises_when_nothing_was_scored():
+
+    executor=BudgetedSearchExecutor(n_jobs=1,cv=3,min_samples=10,time_budget=0)
+    with pytest.raises(Exception,match="No candidate for slow was scored"):
+        search_family(executor,{"skill":[.2,.9]})
+
+
+def test_completes_without_budget():
+
+    executor=BudgetedSearchExecutor(n_jobs=1,cv=3,min_samples=10)
+    assert search_family(executor,{"skill":[.2,.9,.5,.6],"fit_seconds":[0]})=={"skill":.9,"fit_seconds":0}
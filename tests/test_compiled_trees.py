@@ -0,0 +1,82 @@
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import RandomForestClassifier,GradientBoostingClassifier,AdaBoostClassifier
+
+from networksecurity.utils.ml_utils.models.compiled_trees import compile_tree_model
+
+
+def ternary_data(n_classes:int,n_rows=2000,seed=0,missing:float=0):
+
+    # Features take the values -1, 0 and 1 like the phishing dataset, so the
+    # ternary lookup tables are exercised as well as the traversal.
+    rng=np.random.default_rng(seed)
+    X=rng.choice([-1.0,0.0,1.0],size=(n_rows,12))
+    score=X[:,0]+X[:,1]*X[:,2]+rng.normal(0,.5,n_rows)
+    y=np.digitize(score,np.quantile(score,np.linspace(0,1,n_classes+1)[1:-1]))
+    if missing:
+        X[rng.random(X.shape)<missing]=np.nan
+    return X,y
+
+
+def sklearn_decision_values(estimator,X) -> np.ndarray:
+
+    # What the compiled model's decision_values must reproduce bit for bit.
+    if isinstance(estimator,GradientBoostingClassifier):
+        return estimator.decision_function(X).reshape(len(X),-1)
+    if isinstance(estimator,AdaBoostClassifier):
+        return estimator.decision_function(X)
+    return estimator.predict_proba(X)
+
+
+def compiled_decision_values(estimator,compiled,X) -> np.ndarray:
+
+    values=compiled.decision_values(X)
+    if isinstance(estimator,AdaBoostClassifier) and len(estimator.classes_)==2:
+        values[:,0]*=-1
+        return values.sum(axis=1)
+    return values
+
+
+ESTIMATORS={
+    "tree":lambda: DecisionTreeClassifier(random_state=0),
+    "forest":lambda: RandomForestClassifier(n_estimators=20,random_state=0),
+    "gradient_boosting":lambda: GradientBoostingClassifier(n_estimators=30,random_state=0),
+    "adaboost":lambda: AdaBoostClassifier(n_estimators=20,random_state=0),
+}
+
+
+@pytest.mark.parametrize("n_classes",[2,3])
+@pytest.mark.parametrize("ternary_lut_max_features",[0,3])
+@pytest.mark.parametrize("kind",list(ESTIMATORS))
+def test_bit_identical_to_sklearn(kind,ternary_lut_max_features,n_classes):
+
+    # sklearn's boosting ensembles do not accept missing values.
+    missing=0 if kind in ("gradient_boosting","adaboost") else .05
+    X,y=ternary_data(n_classes,missing=missing)
+    estimator=ESTIMATORS[kind]().fit(X,y)
+    compiled=compile_tree_model(estimator,ternary_lut_max_features=ternary_lut_max_features)
+    assert compiled is not None
+
+    # Some rows off the ternary grid take the traversal path.
+    X_test,_=ternary_data(n_classes,seed=1,missing=missing)
+    X_test=np.vstack([X_test,X_test[:50]+.5])
+    np.testing.assert_array_equal(compiled_decision_values(estimator,compiled,X_test),sklearn_decision_values(estimator,X_test))
+    np.testing.assert_array_equal(compiled.predict(X_test),estimator.predict(X_test))
+
+
+def test_survives_pickling():
+
+    X,y=ternary_data(2)
+    estimator=RandomForestClassifier(n_estimators=10,random_state=0).fit(X,y)
+    compiled=pickle.loads(pickle.dumps(compile_tree_model(estimator,ternary_lut_max_features=3)))
+    np.testing.assert_array_equal(compiled.decision_values(X),estimator.predict_proba(X))
+
+
+def test_unsupported_models_are_not_compiled():
+
+    X,y=ternary_data(2)
+    estimator=GradientBoostingClassifier(n_estimators=5,init=DecisionTreeClassifier(max_depth=1)).fit(X,y)
+    assert compile_tree_model(estimator) is None
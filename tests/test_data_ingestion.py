@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+import mongomock
+
+from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.entity.config_entity import TrainingPipelineConfig,DataIngestionConfig
+from networksecurity.utils.main_utils.feature_store import cast_to_schema_dtypes
+
+
+def make_documents(columns:list,n_rows=257,seed=0):
+
+    # Gaps come in every form the collection holds them: the "na" string,
+    # null, and a missing key.
+    rng=np.random.default_rng(seed)
+    values=rng.choice([-1,0,1],size=(n_rows,len(columns)))
+    documents=[]
+    for row in values:
+        documents.append({column:int(value) for column,value in zip(columns,row)})
+    documents[3][columns[0]]="na"
+    documents[100][columns[0]]=None
+    del documents[200][columns[5]]
+    documents[256][columns[-1]]="na"
+    return documents,values,{(3,0),(100,0),(200,5),(256,len(columns)-1)}
+
+
+@pytest.fixture
+def ingestion(tmp_path):
+
+    config=DataIngestionConfig(TrainingPipelineConfig())
+    config.export_array_file_path=str(tmp_path/"feature_store"/"export.npy")
+    # Several batches, the last one partial.
+    config.export_batch_size=64
+    return DataIngestion(config,mongo_client=mongomock.MongoClient())
+
+
+@pytest.mark.parametrize("export_to_disk",[False,True])
+def test_streaming_export_matches_values_and_gaps(ingestion,export_to_disk):
+
+    ingestion.data_ingestion_config.export_to_disk=export_to_disk
+    columns=list(ingestion.schema_dtypes)
+    documents,values,gaps=make_documents(columns)
+    ingestion.get_collection().insert_many(documents)
+
+    array,missing_rows,missing_columns=ingestion.export_collection_array()
+    assert isinstance(array,np.memmap)==export_to_disk
+    if export_to_disk:
+        np.testing.assert_array_equal(np.load(ingestion.data_ingestion_config.export_array_file_path),array)
+    assert array.dtype==np.int8 and array.shape==values.shape
+    assert set(zip(missing_rows.tolist(),missing_columns.tolist()))==gaps
+
+    dataframe=ingestion.export_collection_dataframe_streaming()
+    assert list(dataframe.columns)==columns
+    gap_columns={columns[column] for _,column in gaps}
+    for column in columns:
+        expected="Int8" if column in gap_columns else "int8"
+        assert str(dataframe[column].dtype)==expected
+    for row,column in gaps:
+        assert pd.isna(dataframe.iat[row,column])
+    known=np.ones(values.shape,dtype=bool)
+    for row,column in gaps:
+        known[row,column]=False
+    np.testing.assert_array_equal(dataframe.to_numpy(dtype=np.float64,na_value=np.nan)[known],values[known])
+
+
+def test_streaming_export_matches_list_export(ingestion):
+
+    columns=list(ingestion.schema_dtypes)
+    documents,_,_=make_documents(columns)
+    ingestion.get_collection().insert_many(documents)
+
+    streamed=cast_to_schema_dtypes(ingestion.export_collection_dataframe_streaming(),ingestion.schema_dtypes)
+    listed=cast_to_schema_dtypes(ingestion.export_collection_dataframe()[columns],ingestion.schema_dtypes)
+    pd.testing.assert_frame_equal(streamed,listed)
+
+
+def test_streaming_export_honours_query(ingestion):
+
+    columns=list(ingestion.schema_dtypes)
+    documents,values,_=make_documents(columns)
+    ingestion.get_collection().insert_many(documents)
+
+    dataframe=ingestion.export_collection_dataframe_streaming(query={columns[1]:1})
+    assert len(dataframe)==(values[:,1]==1).sum()
+    assert (dataframe[columns[1]]==1).all()
+
+
+def test_empty_collection(ingestion):
+
+    dataframe=ingestion.export_collection_dataframe_streaming()
+    assert dataframe.empty
+    assert list(dataframe.columns)==list(ingestion.schema_dtypes)
@@ -0,0 +1,80 @@
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from networksecurity.utils.main_utils.model_artifact import (ARTIFACT_ALIGNMENT,MIN_OUT_OF_BAND_BYTES,is_model_artifact,
+                                                             load_model_artifact,read_model_artifact_metadata,
+                                                             save_model_artifact)
+
+
+def fitted_forest():
+
+    rng=np.random.default_rng(0)
+    X=rng.choice([-1.0,0.0,1.0],size=(1000,10))
+    y=(X[:,0]+X[:,1]>0).astype(int)
+    return RandomForestClassifier(n_estimators=10,random_state=0).fit(X,y),X
+
+
+def test_model_round_trip(tmp_path):
+
+    model,X=fitted_forest()
+    file_path=str(tmp_path/"model.pkl")
+    metadata=save_model_artifact(file_path,model)
+    assert is_model_artifact(file_path)
+    assert read_model_artifact_metadata(file_path)==metadata
+    assert metadata["object_type"]=="sklearn.ensemble._forest.RandomForestClassifier"
+
+    loaded=load_model_artifact(file_path)
+    np.testing.assert_array_equal(loaded.predict_proba(X),model.predict_proba(X))
+
+
+def test_large_arrays_are_read_only_views_of_the_file(tmp_path):
+
+    arrays={"large":np.arange(MIN_OUT_OF_BAND_BYTES,dtype=np.float64),"small":np.arange(4,dtype=np.int32),
+            "strided":np.arange(4*MIN_OUT_OF_BAND_BYTES,dtype=np.int64)[::2]}
+    file_path=str(tmp_path/"arrays.pkl")
+    metadata=save_model_artifact(file_path,arrays)
+    # Only the large contiguous array goes out of band; the small one is
+    # below the threshold and numpy pickles the strided one in band.
+    assert len(metadata["buffers"])==1
+    assert all(offset%ARTIFACT_ALIGNMENT==0 for offset,_ in metadata["buffers"])
+
+    loaded=load_model_artifact(file_path)
+    for name,array in arrays.items():
+        np.testing.assert_array_equal(loaded[name],array)
+        assert loaded[name].dtype==array.dtype
+    assert not loaded["large"].flags.writeable
+    assert loaded["small"].flags.writeable
+
+
+def test_plain_pickle_is_not_an_artifact(tmp_path):
+
+    file_path=tmp_path/"model.pkl"
+    file_path.write_bytes(pickle.dumps({"a":1}))
+    assert not is_model_artifact(str(file_path))
+    with pytest.raises(Exception,match="not a model artifact"):
+        load_model_artifact(str(file_path))
+
+
+def test_corruption_is_detected(tmp_path):
+
+    model,_=fitted_forest()
+    file_path=tmp_path/"model.pkl"
+    save_model_artifact(str(file_path),model)
+    data=bytearray(file_path.read_bytes())
+    data[-1]^=0xFF
+    file_path.write_bytes(bytes(data))
+    with pytest.raises(Exception,match="integrity check"):
+        load_model_artifact(str(file_path))
+
+
+def test_truncation_is_detected(tmp_path):
+
+    model,_=fitted_forest()
+    file_path=tmp_path/"model.pkl"
+    save_model_artifact(str(file_path),model)
+    file_path.write_bytes(file_path.read_bytes()[:-100])
+    with pytest.raises(Exception,match="truncated"):
+        load_model_artifact(str(file_path),verify=False)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from networksecurity.utils.ml_utils.models.out_of_core import ChunkedHistGradientBoostingClassifier
+
+
+class RecordingHistGradientBoosting(ChunkedHistGradientBoostingClassifier):
+
+    # Keeps the raw predictions fit accumulates for the training rows,
+    # including the last tree's leaf values.
+    def grow_tree(self,binned,targets,raw_predictions,node_ids,previous_values,weights=None):
+        tree=super().grow_tree(binned,targets,raw_predictions,node_ids,previous_values,weights=weights)
+        self.training_raw_predictions_=np.asarray(raw_predictions)+tree[4][np.asarray(node_ids)]
+        return tree
+
+
+def nested_threshold_data(n_rows=20_000,seed=0):
+
+    # Each feature only matters once the previous ones are past their
+    # threshold, which grows one long chain instead of a balanced tree.
+    rng=np.random.default_rng(seed)
+    X=rng.integers(0,10,size=(n_rows,6)).astype(np.float64)
+    y=np.zeros(n_rows)
+    inside=np.ones(n_rows,dtype=bool)
+    for column in range(X.shape[1]):
+        y[inside & (X[:,column]<2)]=column%2
+        inside&=X[:,column]>=2
+    y[inside]=1
+    return X,y
+
+
+@pytest.mark.parametrize("max_depth",[3,5,6,8])
+def test_decision_function_matches_training_predictions(max_depth):
+
+    X,y=nested_threshold_data()
+    model=RecordingHistGradientBoosting(n_estimators=3,max_depth=max_depth,min_samples_leaf=5,chunk_rows=4096).fit(X,y)
+    np.testing.assert_allclose(model.decision_function(X),model.training_raw_predictions_,rtol=0,atol=1e-9)
+
+
+def test_rows_end_on_leaves():
+
+    X,y=nested_threshold_data()
+    model=ChunkedHistGradientBoostingClassifier(n_estimators=3,max_depth=8,min_samples_leaf=5).fit(X,y)
+    binned=model.bin_chunk(X)
+    for tree in model.trees_:
+        feature=tree[0]
+        assert (feature[model.apply_tree(tree,binned)]==-1).all()
@@ -0,0 +1,96 @@
+import json
+import asyncio
+
+import numpy as np
+import pytest
+
+from networksecurity.entity.config_entity import ScoringServiceConfig
+from networksecurity.pipeline import scoring_service as scoring_service_module
+from networksecurity.pipeline.scoring_service import ScoringService
+from networksecurity.utils.main_utils.micro_batcher import MicroBatcher
+
+
+class SumModel:
+
+    def predict(self,X):
+        return np.nansum(np.asarray(X,dtype=np.float64),axis=1)
+
+
+@pytest.fixture
+def service(monkeypatch):
+
+    monkeypatch.setattr(scoring_service_module,"load_model",lambda *args,**kwargs:SumModel())
+    return ScoringService(ScoringServiceConfig(model_file_path="unused.pkl",host="127.0.0.1",port=0))
+
+
+async def exchange(service,raw:bytes) -> bytes:
+
+    await service.start()
+    try:
+        port=service.server.sockets[0].getsockname()[1]
+        reader,writer=await asyncio.open_connection("127.0.0.1",port)
+        writer.write(raw)
+        await writer.drain()
+        response=await asyncio.wait_for(reader.read(),5)
+        writer.close()
+        return response
+    finally:
+        await service.stop()
+
+
+def status_of(response:bytes) -> int:
+    return int(response.split(b" ",2)[1])
+
+
+@pytest.mark.parametrize("raw,status",[
+    (b"GARBAGE\r\n\r\n",400),
+    (b"POST /predict HTTP/1.1\r\nContent-Length: ten\r\n\r\n",400),
+    (b"POST /predict HTTP/1.1\r\nContent-Length: -1\r\n\r\n",400),
+    (b"POST /predict HTTP/1.1\r\nContent-Length: 999999999999\r\n\r\n",413),
+])
+def test_malformed_head_gets_a_response(service,raw,status):
+
+    response=asyncio.run(exchange(service,raw))
+    assert status_of(response)==status
+    assert b"Connection: close" in response
+
+
+def test_valid_request_is_scored(service):
+
+    record={service.feature_columns[0]:1,service.feature_columns[1]:-1}
+    body=json.dumps(record).encode()
+    raw=b"POST /predict HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s"%(len(body),body)
+    response=asyncio.run(exchange(service,raw))
+    assert status_of(response)==200
+    assert json.loads(response.split(b"\r\n\r\n",1)[1])=={"prediction":0.0}
+
+
+@pytest.mark.parametrize("payload",[
+    {"not_a_feature":1},
+    "just a string",
+    {"records":[{},{"not_a_feature":1}]},
+])
+def test_invalid_records_are_rejected_before_scoring(service,payload):
+
+    status,_=asyncio.run(service.handle_request("POST","/predict",json.dumps(payload).encode()))
+    assert status==400
+
+
+def test_bad_record_only_fails_its_own_request():
+
+    def predict(records):
+        if any(record=="bad" for record in records):
+            raise ValueError("bad record")
+        return [record*2 for record in records]
+
+    async def submit_all():
+        batcher=MicroBatcher(predict,max_batch_size=8,max_wait_seconds=0)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(record) for record in [1,"bad",3]),return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    results=asyncio.run(submit_all())
+    assert results[0]==2 and results[2]==6
+    assert isinstance(results[1],Exception) and "bad record" in str(results[1])